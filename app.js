@@ -11,6 +11,8 @@ const $$ = (sel, root = document) => Array.from(root.querySelectorAll(sel));
 const OWNERS_KEY = "docpug_owners_v1";
 const PATIENTS_KEY = "docpug_patients_v1";
 const VISITS_KEY = "docpug_visits_v1";
+const CALENDAR_KEY = "docpug_calendar_v1";
+const SYNC_CURSORS_KEY = "docpug_sync_cursors_v1";
 const DISCHARGES_KEY = "docpug_discharges_v1";
 
 const FILES_KEY = "docpug_files_v1";
@@ -1352,6 +1354,76 @@ const LS = {
   },
 };
 
+// ===== Дельта-синхронізація (?since=) =====
+// Регістри (власники, пацієнти, візити, календар) кешуються в localStorage.
+// Сервер віддає лише рядки, змінені після курсора, та id видалених;
+// full: true — прийшов увесь список і кеш замінюється повністю.
+function getSyncCursor(name) {
+  const orgId = state.me?.org_id || null;
+  const entry = (LS.get(SYNC_CURSORS_KEY, {}) || {})[name];
+
+  if (!orgId || !entry || entry.org_id !== orgId) return "0";
+
+  return entry.cursor || "0";
+}
+
+function setSyncCursor(name, cursor) {
+  const cursors = LS.get(SYNC_CURSORS_KEY, {}) || {};
+
+  cursors[name] = {
+    org_id: state.me?.org_id || null,
+    cursor: cursor || "0",
+  };
+
+  LS.set(SYNC_CURSORS_KEY, cursors);
+}
+
+function syncUrl(path, name, cached) {
+  // Порожній кеш — повний знімок (since=0), але вже з курсором.
+  const cursor =
+    Array.isArray(cached) && cached.length
+      ? getSyncCursor(name)
+      : "0";
+
+  return `${path}?since=${encodeURIComponent(cursor)}`;
+}
+
+function mergeSyncDelta(name, cached, data) {
+  // Відповідь без rows — старий формат (повний список).
+  if (!data || !Array.isArray(data.rows)) return null;
+
+  let merged = data.rows;
+
+  if (!data.full) {
+    const byId = new Map(
+      (Array.isArray(cached) ? cached : [])
+        .filter((row) => row && row.id != null)
+        .map((row) => [String(row.id), row])
+    );
+
+    (data.deleted || []).forEach((id) => byId.delete(String(id)));
+    data.rows.forEach((row) => {
+      if (row && row.id != null) byId.set(String(row.id), row);
+    });
+
+    merged = Array.from(byId.values());
+  }
+
+  setSyncCursor(name, data.cursor);
+
+  return merged;
+}
+
+function saveSyncedRegister(key, name, rows) {
+  try {
+    LS.set(key, rows);
+  } catch (e) {
+    // Переповнений localStorage: наступного разу — повний знімок.
+    console.warn(`Cannot cache ${name}:`, e);
+    setSyncCursor(name, "0");
+  }
+}
+
 function getOrgHeaders() {
   /*
    * Организация и пользователь теперь определяются
@@ -2824,6 +2896,291 @@ if (
     );
   }
 }
+// =====================================================
+// SERVER EVENTS (SSE)
+// =====================================================
+// Зміни візитів, задач, стаціонару та календаря сервер надсилає
+// потоком /api/events/stream — замість опитування кожні 30 секунд.
+// Потік короткий: браузер перепідключається з Last-Event-ID, і
+// сервер дочитує пропущені події. Опитування кожні 30 секунд
+// лишається, доки сервер не підтвердить спільну для всіх
+// воркерів шину (ready.shared); тоді — рідка контрольна перевірка.
+// Прихована вкладка потік закриває, щоб не тримати потік сервера;
+// сервер без вільних слотів відповідає 204 — тоді лишається
+// опитування, а потік пробуємо знову на наступній перевірці.
+
+const EVENTS_FALLBACK_POLL_MS =
+  30000;
+
+const EVENTS_SHARED_FALLBACK_POLL_MS =
+  120000;
+
+let serverEventsShared =
+  false;
+
+const SERVER_EVENT_DEBOUNCE_MS =
+  300;
+
+let serverEventStream =
+  null;
+
+let serverEventsWanted =
+  false;
+
+const serverEventHandlers =
+  new Map();
+
+function onServerEvent(
+  type,
+  handler
+) {
+  if (
+    !serverEventHandlers.has(
+      type
+    )
+  ) {
+    serverEventHandlers.set(
+      type,
+      new Set()
+    );
+  }
+
+  serverEventHandlers
+    .get(type)
+    .add(handler);
+}
+
+const serverEventTimers =
+  new Map();
+
+function runServerEventHandler(
+  handler
+) {
+  // Кілька подій поспіль (візит + календар) — одне оновлення.
+  clearTimeout(
+    serverEventTimers.get(
+      handler
+    )
+  );
+
+  serverEventTimers.set(
+    handler,
+    setTimeout(
+      () => {
+        serverEventTimers.delete(
+          handler
+        );
+
+        Promise.resolve()
+          .then(handler)
+          .catch((error) => {
+            console.warn(
+              "server event handler failed:",
+              error
+            );
+          });
+      },
+      SERVER_EVENT_DEBOUNCE_MS
+    )
+  );
+}
+
+function dispatchServerEvent(
+  type
+) {
+  const handlers =
+    type === "resync"
+      ? Array.from(
+          serverEventHandlers.values()
+        ).flatMap(
+          (set) =>
+            Array.from(set)
+        )
+      : Array.from(
+          serverEventHandlers.get(
+            type
+          ) || []
+        );
+
+  new Set(handlers).forEach(
+    runServerEventHandler
+  );
+}
+
+function stopServerEventStream() {
+  if (!serverEventStream) {
+    return;
+  }
+
+  serverEventStream.close();
+
+  serverEventStream =
+    null;
+
+  serverEventsShared =
+    false;
+}
+
+function startServerEventStream() {
+  if (
+    !serverEventsWanted
+  ) {
+    serverEventsWanted =
+      true;
+
+    document.addEventListener(
+      "visibilitychange",
+      () => {
+        if (
+          document.visibilityState ===
+          "hidden"
+        ) {
+          stopServerEventStream();
+          return;
+        }
+
+        if (
+          !serverEventStream
+        ) {
+          startServerEventStream();
+
+          // Поки вкладка була прихована, подій не було.
+          dispatchServerEvent(
+            "resync"
+          );
+        }
+      }
+    );
+  }
+
+  if (
+    serverEventStream ||
+    typeof EventSource ===
+      "undefined" ||
+    document.visibilityState ===
+      "hidden"
+  ) {
+    return serverEventStream;
+  }
+
+  let connectedOnce =
+    false;
+
+  const stream =
+    new EventSource(
+      "/api/events/stream",
+      {
+        withCredentials:
+          true,
+      }
+    );
+
+  serverEventStream =
+    stream;
+
+  // 204 (немає слотів) або фатальна помилка: EventSource
+  // більше не перепідключається — лишається опитування.
+  stream.addEventListener(
+    "error",
+    () => {
+      if (
+        stream.readyState ===
+          EventSource.CLOSED &&
+        serverEventStream ===
+          stream
+      ) {
+        serverEventStream =
+          null;
+
+        serverEventsShared =
+          false;
+      }
+    }
+  );
+
+  stream.addEventListener(
+    "ready",
+    (event) => {
+      let ready = {};
+
+      try {
+        ready =
+          JSON.parse(
+            event.data || "{}"
+          );
+      } catch (error) {
+        ready = {};
+      }
+
+      serverEventsShared =
+        Boolean(ready.shared);
+
+      // Сервер не зміг дочитати пропущене — оновлюємо все.
+      if (
+        connectedOnce &&
+        !ready.resumed
+      ) {
+        dispatchServerEvent(
+          "resync"
+        );
+      }
+
+      connectedOnce =
+        true;
+    }
+  );
+
+  [
+    "calendar",
+    "tasks",
+    "visits",
+    "resync",
+  ].forEach(
+    (type) => {
+      stream.addEventListener(
+        type,
+        () =>
+          dispatchServerEvent(
+            type
+          )
+      );
+    }
+  );
+
+  return serverEventStream;
+}
+
+function startServerEventsFallbackPoll(
+  handler
+) {
+  const tick =
+    async () => {
+      // Потік закрився (204 чи помилка) — пробуємо ще раз.
+      if (
+        serverEventsWanted &&
+        !serverEventStream
+      ) {
+        startServerEventStream();
+      }
+
+      try {
+        await handler();
+      } finally {
+        setTimeout(
+          tick,
+          serverEventsShared
+            ? EVENTS_SHARED_FALLBACK_POLL_MS
+            : EVENTS_FALLBACK_POLL_MS
+        );
+      }
+    };
+
+  setTimeout(
+    tick,
+    EVENTS_FALLBACK_POLL_MS
+  );
+}
+
 let waitingPatientsPollStarted =
   false;
 
@@ -2841,7 +3198,14 @@ function startWaitingPatientsPoll() {
     "[WAITING POLL] started"
   );
 
-  setInterval(
+  onServerEvent(
+    "calendar",
+    checkCurrentVetWaitingPatients
+  );
+
+  startServerEventStream();
+
+  startServerEventsFallbackPoll(
     async () => {
       console.log(
         "[WAITING POLL] tick",
@@ -2850,8 +3214,7 @@ function startWaitingPatientsPoll() {
       );
 
       await checkCurrentVetWaitingPatients();
-    },
-    30000
+    }
   );
 }
 // =====================================================
@@ -3448,11 +3811,16 @@ function startTasksBadgePoll() {
   refreshMyTasksBadge();
 
 
-  setInterval(
-    () => {
-      refreshMyTasksBadge();
-    },
-    30000
+  onServerEvent(
+    "tasks",
+    refreshMyTasksBadge
+  );
+
+  startServerEventStream();
+
+
+  startServerEventsFallbackPoll(
+    refreshMyTasksBadge
   );
 }
 
@@ -3988,7 +4356,11 @@ async function loadOwners(
         try {
           const response =
             await fetch(
-              "/api/owners",
+              syncUrl(
+                "/api/owners",
+                "owners",
+                cachedOwners
+              ),
               {
                 method:
                   "GET",
@@ -3996,8 +4368,9 @@ async function loadOwners(
                 credentials:
                   "include",
 
+                // Перевірка через If-None-Match: 304, якщо дані не змінились.
                 cache:
-                  "no-store",
+                  "no-cache",
 
                 headers: {
                   Accept:
@@ -4045,23 +4418,31 @@ async function loadOwners(
 
 
           const owners =
-            Array.isArray(
+            mergeSyncDelta(
+              "owners",
+              cachedOwners,
               json.data
-            )
-              ? json.data
-              : json.data
-                ? [
-                    json.data
-                  ]
-                : [];
+            ) ||
+            (
+              Array.isArray(
+                json.data
+              )
+                ? json.data
+                : json.data
+                  ? [
+                      json.data
+                    ]
+                  : []
+            );
 
 
           state.owners =
             owners;
 
 
-          LS.set(
+          saveSyncedRegister(
             OWNERS_KEY,
+            "owners",
             owners
           );
 
@@ -4192,12 +4573,15 @@ async function loadPatientsApi() {
 
 async function loadPatientsApiRequest() {
   const cachedPatients =
-    Array.isArray(state.patients)
+    Array.isArray(state.patients) &&
+    state.patients.length
       ? state.patients
-      : [];
+      : Array.isArray(loadPatients())
+        ? loadPatients()
+        : [];
 
   try {
-    const res = await fetch("/api/patients", {
+    const res = await fetch(syncUrl("/api/patients", "patients", cachedPatients), {
       credentials: "include",
       headers: {
         Accept: "application/json",
@@ -4276,15 +4660,17 @@ async function loadPatientsApiRequest() {
       return cachedPatients;
     }
 
-    const arr = Array.isArray(json.data)
-      ? json.data
-      : json.data
-        ? [json.data]
-        : [];
+    const arr =
+      mergeSyncDelta("patients", cachedPatients, json.data) ||
+      (Array.isArray(json.data)
+        ? json.data
+        : json.data
+          ? [json.data]
+          : []);
 
     state.patients = arr;
 
-    savePatients(arr);
+    saveSyncedRegister(PATIENTS_KEY, "patients", arr);
 
     if (state.route === "patients") {
       renderPatientsTab();
@@ -6811,7 +7197,12 @@ function saveVisits(v) { LS.set(VISITS_KEY, v); }
 async function loadVisitsApi(params = {}) {
   try {
     const qs = new URLSearchParams(params).toString();
-    const res = await fetch("/api/visits" + (qs ? `?${qs}` : ""), {
+    // Повний регістр візитів — дельтою від кешу docpug_visits_v1.
+    const cachedVisits = qs ? null : loadVisits();
+    const url = qs
+      ? `/api/visits?${qs}`
+      : syncUrl("/api/visits", "visits", cachedVisits);
+    const res = await fetch(url, {
       credentials: "include",
       headers: { Accept: "application/json", ...getOrgHeaders() },
     });
@@ -6832,7 +7223,10 @@ async function loadVisitsApi(params = {}) {
       return [];
     }
 
-    const arr = Array.isArray(json.data) ? json.data : (json.data ? [json.data] : []);
+    const synced = qs ? null : mergeSyncDelta("visits", cachedVisits, json.data);
+    if (synced) saveSyncedRegister(VISITS_KEY, "visits", synced);
+
+    const arr = synced || (Array.isArray(json.data) ? json.data : (json.data ? [json.data] : []));
     const normArr = arr.map(normalizeVisitFromServer);
     cacheVisits(normArr);
     return normArr;
@@ -6843,6 +7237,36 @@ async function loadVisitsApi(params = {}) {
   }
 }
 
+// Сторінка реєстру візитів: {rows, next_cursor, total}.
+// Без кешу docpug_visits_v1 — у view=summary немає рядків візиту.
+const VISITS_TAB_PAGE_SIZE = 100;
+
+async function loadVisitsPageApi(params = {}) {
+  try {
+    const qs = new URLSearchParams(params).toString();
+    const res = await fetch(`/api/visits?${qs}`, {
+      credentials: "include",
+      headers: { Accept: "application/json", ...getOrgHeaders() },
+    });
+
+    const text = await res.text();
+    let json = null;
+    try { json = text ? JSON.parse(text) : null; } catch {}
+
+    if (!res.ok || !json?.ok || !Array.isArray(json.data?.rows)) {
+      console.error("API /visits page HTTP", res.status, text);
+      alert(json?.error || `Помилка завантаження візитів (HTTP ${res.status})`);
+      return null;
+    }
+
+    return json.data;
+  } catch (e) {
+    console.error("loadVisitsPageApi failed:", e);
+    alert("Помилка зʼєднання з сервером");
+    return null;
+  }
+}
+
 async function createVisitApi(payload) {
   try {
     const res = await fetch("/api/visits", {
@@ -8593,6 +9017,7 @@ async function openVisitPaymentModal(
   };
 
   let finance = null;
+  let clientBalance = null;
   let selectedMethod = "cash";
   let submitting = false;
 
@@ -8797,6 +9222,11 @@ async function openVisitPaymentModal(
           </b>
         </section>
 
+        ${buildVisitPaymentClientDebt(
+          clientBalance,
+          visitId
+        )}
+
         ${
           remaining <= 0
             ? `
@@ -9225,7 +9655,81 @@ async function openVisitPaymentModal(
       error?.message ||
       "Не вдалося відкрити касу візиту."
     );
+
+    return;
+  }
+
+  // Борг клієнта за іншими візитами — не блокує касу.
+  if (finance?.owner_id) {
+    try {
+      clientBalance =
+        await loadFinanceClientBalanceApi(
+          finance.owner_id
+        );
+
+      if (!submitting) {
+        render();
+      }
+    } catch (error) {
+      console.warn(
+        "Client balance for payment modal failed:",
+        error
+      );
+    }
+  }
+}
+
+function buildVisitPaymentClientDebt(
+  clientBalance,
+  visitId
+) {
+  const otherVisits =
+    (clientBalance?.visits || [])
+      .filter(
+        (visit) =>
+          String(visit.visit_id) !==
+          String(visitId)
+      );
+
+  if (!otherVisits.length) {
+    return "";
   }
+
+  return `
+    <section class="visitPaymentClientDebt">
+      <div>
+        <span>
+          Борг клієнта за іншими візитами
+        </span>
+
+        <strong>
+          ${formatVisitFinanceMoney(
+            otherVisits.reduce(
+              (sum, visit) =>
+                sum +
+                Number(
+                  visit.remaining || 0
+                ),
+              0
+            )
+          )}
+        </strong>
+      </div>
+
+      <small>
+        ${escapeHtml(
+          clientBalance.owner_name ||
+          "Власник"
+        )}
+        · ще ${otherVisits.length}
+        ${
+          otherVisits.length === 1
+            ? "неоплачений візит"
+            : "неоплачених візитів"
+        }
+      </small>
+    </section>
+  `;
 }
 
 // =========================
@@ -19228,10 +19732,27 @@ async function loadFinanceOverviewApi(
   return result.data;
 }
 
-async function loadFinanceClientBalancesApi() {
+async function loadFinanceClientBalancesApi(
+  params = {}
+) {
+  // Без params — повний список із вкладеними візитами;
+  // з limit/cursor/status/q — сторінка реєстру без візитів.
+  const query =
+    new URLSearchParams(
+      Object.entries(params)
+        .filter(
+          ([, value]) =>
+            value !== undefined &&
+            value !== null &&
+            value !== ""
+        )
+    ).toString();
+
   const response =
     await fetch(
-      "/api/finance/client-balances",
+      query
+        ? `/api/finance/client-balances?${query}`
+        : "/api/finance/client-balances",
       {
         credentials:
           "include",
@@ -19264,6 +19785,89 @@ async function loadFinanceClientBalancesApi() {
   return result.data;
 }
 
+async function loadFinanceClientBalanceApi(
+  ownerId
+) {
+  const response =
+    await fetch(
+      `/api/finance/client-balances/${encodeURIComponent(
+        ownerId
+      )}`,
+      {
+        credentials:
+          "include",
+
+        headers: {
+          Accept:
+            "application/json",
+
+          ...getOrgHeaders(),
+        },
+      }
+    );
+
+  const result =
+    await response
+      .json()
+      .catch(() => null);
+
+  if (
+    !response.ok ||
+    !result?.ok ||
+    !result?.data
+  ) {
+    throw new Error(
+      result?.error ||
+      `Не вдалося завантажити баланс клієнта (HTTP ${response.status}).`
+    );
+  }
+
+  return result.data;
+}
+
+async function loadFinanceClientVisitsApi(
+  ownerId,
+  status = "open"
+) {
+  const response =
+    await fetch(
+      `/api/finance/client-balances/${encodeURIComponent(
+        ownerId
+      )}/visits?status=${encodeURIComponent(
+        status
+      )}`,
+      {
+        credentials:
+          "include",
+
+        headers: {
+          Accept:
+            "application/json",
+
+          ...getOrgHeaders(),
+        },
+      }
+    );
+
+  const result =
+    await response
+      .json()
+      .catch(() => null);
+
+  if (
+    !response.ok ||
+    !result?.ok ||
+    !result?.data
+  ) {
+    throw new Error(
+      result?.error ||
+      `Не вдалося завантажити візити клієнта (HTTP ${response.status}).`
+    );
+  }
+
+  return result.data;
+}
+
 async function loadFinanceAccountsApi() {
   const response =
     await fetch(
@@ -26941,7 +27545,10 @@ async function renderFinanceTodayTab(
 
     const balancesResult =
       await settleFinanceTodayLoad(
-        () => loadFinanceClientBalancesApi()
+        () => loadFinanceClientBalancesApi({
+          status: "debt",
+          limit: 4,
+        })
       );
 
     const stockResult =
@@ -27031,8 +27638,8 @@ async function renderFinanceTodayTab(
       balances.summary || {};
 
     const clients =
-      Array.isArray(balances.items)
-        ? balances.items
+      Array.isArray(balances.rows)
+        ? balances.rows
         : [];
 
     const transactions =
@@ -27447,14 +28054,7 @@ async function renderFinanceTodayTab(
                       .map(
                         (client) => {
                           const visit =
-                            (client.visits || [])
-                              .find(
-                                (item) =>
-                                  Number(
-                                    item.remaining ||
-                                    0
-                                  ) > 0
-                              );
+                            client.open_visit;
 
                           return `
                             <div class="financeAttentionRow">
@@ -27925,85 +28525,355 @@ async function renderFinanceTodayTab(
   }
 }
 
-function applyFinanceClientFilters(
-  page
+const FINANCE_CLIENTS_PAGE_SIZE = 30;
+
+function loadFinanceClientsPage(
+  cursor = null
 ) {
-  const search =
-    String(
+  return loadFinanceClientBalancesApi({
+    status:
+      financeDashboardState
+        .clientFilter || "debt",
+
+    q: String(
       financeDashboardState
         .clientSearch || ""
-    )
-      .trim()
-      .toLocaleLowerCase(
-        "uk-UA"
-      );
+    ).trim(),
 
-  const filter =
-    financeDashboardState
-      .clientFilter || "debt";
+    limit:
+      FINANCE_CLIENTS_PAGE_SIZE,
 
-  let visible = 0;
+    cursor,
+  });
+}
 
-  page
-    .querySelectorAll(
-      "[data-finance-client-card]"
-    )
-    .forEach((card) => {
-      const matchesSearch =
-        !search ||
-        String(
-          card.dataset
-            .financeClientSearch ||
-          ""
-        ).includes(search);
+function buildFinanceClientVisitRows(
+  visits
+) {
+  if (!visits.length) {
+    return `
+      <div class="financeClientVisitsEmpty">
+        Немає відкритих візитів.
+      </div>
+    `;
+  }
 
-      const matchesFilter =
-        filter === "all" ||
-        card.dataset
-          .financeClientStatus ===
-          filter;
+  return visits
+    .map(
+      (visit) => {
+        const meta =
+          getFinanceSettlementMeta(
+            visit.financial_status
+          );
 
-      const show =
-        matchesSearch &&
-        matchesFilter;
+        return `
+          <div class="financeClientVisit">
+            <div>
+              <strong>
+                ${escapeHtml(
+                  visit.patient_name ||
+                  "Пацієнт"
+                )}
+              </strong>
+
+              <span>
+                ${
+                  visit.date
+                    ? escapeHtml(
+                        formatFinancePurchaseDate(
+                          visit.date
+                        )
+                      )
+                    : "Без дати"
+                }
+                ${
+                  visit.diagnosis
+                    ? `· ${escapeHtml(
+                        visit.diagnosis
+                      )}`
+                    : ""
+                }
+              </span>
+            </div>
+
+            <div class="financeClientVisitAmounts">
+              <span>
+                ${
+                  meta.label
+                }
+              </span>
+
+              <strong>
+                ${formatVisitFinanceMoney(
+                  visit.remaining
+                )}
+              </strong>
+            </div>
 
-      card.hidden = !show;
+            <div class="financeClientVisitActions">
+              <button
+                type="button"
+                class="financeVisitOpenButton"
+                data-finance-open-visit="${escapeHtml(
+                  visit.visit_id
+                )}"
+              >
+                Візит
+              </button>
 
-      if (show) {
-        visible += 1;
+              ${
+                Number(
+                  visit.remaining ||
+                  0
+                ) > 0
+                  ? `
+                    <button
+                      type="button"
+                      class="financeVisitPayButton"
+                      data-finance-pay-visit="${escapeHtml(
+                        visit.visit_id
+                      )}"
+                    >
+                      Прийняти оплату
+                    </button>
+                  `
+                  : ""
+              }
+            </div>
+          </div>
+        `;
       }
-    });
+    )
+    .join("");
+}
 
-  const count =
-    page.querySelector(
-      "#financeClientsVisibleCount"
-    );
+function buildFinanceClientCard(
+  client
+) {
+  const hasDebt =
+    Number(
+      client.remaining || 0
+    ) > 0;
 
-  if (count) {
-    count.textContent =
-      String(visible);
-  }
+  const visitsCount =
+    Number(
+      hasDebt
+        ? client.debt_visits_count
+        : client.visits_count
+    ) || 0;
 
-  const empty =
-    page.querySelector(
-      "#financeClientsFilteredEmpty"
-    );
+  return `
+    <article
+      class="financeClientCard ${
+        hasDebt
+          ? "has-debt"
+          : "is-paid"
+      }"
+      data-finance-client-card
+    >
+      <header>
+        <div class="financeClientIdentity">
+          <div class="financeClientAvatar">
+            ${escapeHtml(
+              String(
+                client.owner_name ||
+                "К"
+              )
+                .trim()
+                .charAt(0)
+                .toUpperCase()
+            )}
+          </div>
 
-  if (empty) {
-    empty.hidden =
-      visible > 0;
-  }
+          <div>
+            <h2>
+              ${escapeHtml(
+                client.owner_name ||
+                "Власник"
+              )}
+            </h2>
 
-  page
+            <p>
+              ${
+                client.phone
+                  ? escapeHtml(
+                      client.phone
+                    )
+                  : "Телефон не вказано"
+              }
+              ·
+              ${Number(
+                client.patients_count ||
+                0
+              )}
+              пацієнтів
+            </p>
+          </div>
+        </div>
+
+        <div class="financeClientBalance">
+          <span>
+            ${
+              hasDebt
+                ? "До сплати"
+                : "Баланс"
+            }
+          </span>
+
+          <strong>
+            ${formatVisitFinanceMoney(
+              client.remaining
+            )}
+          </strong>
+
+          <small class="${
+            hasDebt
+              ? "is-unpaid"
+              : "is-paid"
+          }">
+            ${
+              hasDebt
+                ? "Є відкриті розрахунки"
+                : "Розрахунки закриті"
+            }
+          </small>
+        </div>
+      </header>
+
+      <div
+        class="financeClientVisitList"
+        data-finance-client-visits-list
+      >
+        ${
+          client.owner_id &&
+          visitsCount
+            ? `
+              <button
+                type="button"
+                class="ghost"
+                data-finance-client-visits="${escapeHtml(
+                  client.owner_id
+                )}"
+                data-finance-client-visits-status="${
+                  hasDebt
+                    ? "open"
+                    : "all"
+                }"
+              >
+                ${
+                  hasDebt
+                    ? "Відкриті візити"
+                    : "Візити"
+                }:
+                ${visitsCount}
+              </button>
+            `
+            : `
+              <div class="financeClientVisitsEmpty">
+                Немає відкритих візитів.
+              </div>
+            `
+        }
+      </div>
+
+      <footer>
+        <div>
+          Нараховано
+          <strong>
+            ${formatVisitFinanceMoney(
+              client.billed
+            )}
+          </strong>
+        </div>
+
+        <div>
+          Отримано
+          <strong>
+            ${formatVisitFinanceMoney(
+              client.paid
+            )}
+          </strong>
+        </div>
+
+        ${
+          client.owner_id
+            ? `
+              <button
+                type="button"
+                data-finance-open-owner="${escapeHtml(
+                  client.owner_id
+                )}"
+              >
+                Відкрити картку клієнта →
+              </button>
+            `
+            : ""
+        }
+      </footer>
+    </article>
+  `;
+}
+
+function bindFinanceClientCards(
+  container
+) {
+  bindFinanceWorkspaceActions(
+    container
+  );
+
+  // Візити клієнта вантажаться лише на запит:
+  // сторінка реєстру приходить без них.
+  container
     .querySelectorAll(
-      "[data-finance-client-filter]"
+      "[data-finance-client-visits]"
     )
     .forEach((button) => {
-      button.classList.toggle(
-        "active",
-        button.dataset
-          .financeClientFilter ===
-          filter
+      button.addEventListener(
+        "click",
+        async () => {
+          const list =
+            button.closest(
+              "[data-finance-client-visits-list]"
+            );
+
+          button.disabled = true;
+
+          try {
+            const visits =
+              await loadFinanceClientVisitsApi(
+                button.dataset
+                  .financeClientVisits,
+                button.dataset
+                  .financeClientVisitsStatus ||
+                  "open"
+              );
+
+            list.innerHTML =
+              buildFinanceClientVisitRows(
+                (
+                  Array.isArray(visits)
+                    ? visits
+                    : []
+                ).slice(0, 4)
+              );
+
+            bindFinanceWorkspaceActions(
+              list
+            );
+          } catch (error) {
+            console.error(
+              "Load finance client visits failed:",
+              error
+            );
+
+            alert(
+              error.message ||
+              "Не вдалося завантажити візити клієнта."
+            );
+
+            button.disabled = false;
+          }
+        }
       );
     });
 }
@@ -28023,14 +28893,14 @@ async function renderFinanceClientsTab(
 
   try {
     const balances =
-      await loadFinanceClientBalancesApi();
+      await loadFinanceClientsPage();
 
     const summary =
       balances.summary || {};
 
     const clients =
-      Array.isArray(balances.items)
-        ? balances.items
+      Array.isArray(balances.rows)
+        ? balances.rows
         : [];
 
     page.innerHTML = `
@@ -28182,7 +29052,7 @@ async function renderFinanceClientsTab(
                 financeDashboardState
                   .clientSearch || ""
               )}"
-              placeholder="Власник, телефон або пацієнт"
+              placeholder="Власник або телефон"
             >
           </label>
 
@@ -28191,282 +29061,29 @@ async function renderFinanceClientsTab(
             <strong id="financeClientsVisibleCount">
               ${clients.length}
             </strong>
+            з
+            <strong id="financeClientsTotalCount">
+              ${Number(
+                balances.total ??
+                clients.length
+              )}
+            </strong>
           </span>
         </section>
 
         <section class="financeClientsList">
-          ${
-            clients
-              .map(
-                (client) => {
-                  const hasDebt =
-                    Number(
-                      client.remaining || 0
-                    ) > 0;
-
-                  const searchable =
-                    [
-                      client.owner_name,
-                      client.phone,
-                      ...(client.visits || [])
-                        .map(
-                          (visit) =>
-                            visit.patient_name
-                        ),
-                    ]
-                      .filter(Boolean)
-                      .join(" ")
-                      .toLocaleLowerCase(
-                        "uk-UA"
-                      );
-
-                  const visibleVisits =
-                    (client.visits || [])
-                      .filter(
-                        (visit) =>
-                          hasDebt
-                            ? Number(
-                                visit.remaining ||
-                                0
-                              ) > 0
-                            : true
-                      )
-                      .slice(0, 4);
-
-                  return `
-                    <article
-                      class="financeClientCard ${
-                        hasDebt
-                          ? "has-debt"
-                          : "is-paid"
-                      }"
-                      data-finance-client-card
-                      data-finance-client-status="${
-                        hasDebt
-                          ? "debt"
-                          : "paid"
-                      }"
-                      data-finance-client-search="${escapeHtml(
-                        searchable
-                      )}"
-                    >
-                      <header>
-                        <div class="financeClientIdentity">
-                          <div class="financeClientAvatar">
-                            ${escapeHtml(
-                              String(
-                                client.owner_name ||
-                                "К"
-                              )
-                                .trim()
-                                .charAt(0)
-                                .toUpperCase()
-                            )}
-                          </div>
-
-                          <div>
-                            <h2>
-                              ${escapeHtml(
-                                client.owner_name ||
-                                "Власник"
-                              )}
-                            </h2>
-
-                            <p>
-                              ${
-                                client.phone
-                                  ? escapeHtml(
-                                      client.phone
-                                    )
-                                  : "Телефон не вказано"
-                              }
-                              ·
-                              ${
-                                new Set(
-                                  (client.visits || [])
-                                    .map(
-                                      (visit) =>
-                                        visit.patient_id
-                                    )
-                                ).size
-                              }
-                              пацієнтів
-                            </p>
-                          </div>
-                        </div>
-
-                        <div class="financeClientBalance">
-                          <span>
-                            ${
-                              hasDebt
-                                ? "До сплати"
-                                : "Баланс"
-                            }
-                          </span>
-
-                          <strong>
-                            ${formatVisitFinanceMoney(
-                              client.remaining
-                            )}
-                          </strong>
-
-                          <small class="${
-                            hasDebt
-                              ? "is-unpaid"
-                              : "is-paid"
-                          }">
-                            ${
-                              hasDebt
-                                ? "Є відкриті розрахунки"
-                                : "Розрахунки закриті"
-                            }
-                          </small>
-                        </div>
-                      </header>
-
-                      <div class="financeClientVisitList">
-                        ${
-                          visibleVisits.length
-                            ? visibleVisits
-                                .map(
-                                  (visit) => {
-                                    const meta =
-                                      getFinanceSettlementMeta(
-                                        visit.financial_status
-                                      );
-
-                                    return `
-                                      <div class="financeClientVisit">
-                                        <div>
-                                          <strong>
-                                            ${escapeHtml(
-                                              visit.patient_name ||
-                                              "Пацієнт"
-                                            )}
-                                          </strong>
-
-                                          <span>
-                                            ${
-                                              visit.date
-                                                ? escapeHtml(
-                                                    formatFinancePurchaseDate(
-                                                      visit.date
-                                                    )
-                                                  )
-                                                : "Без дати"
-                                            }
-                                            ${
-                                              visit.diagnosis
-                                                ? `· ${escapeHtml(
-                                                    visit.diagnosis
-                                                  )}`
-                                                : ""
-                                            }
-                                          </span>
-                                        </div>
-
-                                        <div class="financeClientVisitAmounts">
-                                          <span>
-                                            ${
-                                              meta.label
-                                            }
-                                          </span>
-
-                                          <strong>
-                                            ${formatVisitFinanceMoney(
-                                              visit.remaining
-                                            )}
-                                          </strong>
-                                        </div>
-
-                                        <div class="financeClientVisitActions">
-                                          <button
-                                            type="button"
-                                            class="financeVisitOpenButton"
-                                            data-finance-open-visit="${escapeHtml(
-                                              visit.visit_id
-                                            )}"
-                                          >
-                                            Візит
-                                          </button>
-
-                                          ${
-                                            Number(
-                                              visit.remaining ||
-                                              0
-                                            ) > 0
-                                              ? `
-                                                <button
-                                                  type="button"
-                                                  class="financeVisitPayButton"
-                                                  data-finance-pay-visit="${escapeHtml(
-                                                    visit.visit_id
-                                                  )}"
-                                                >
-                                                  Прийняти оплату
-                                                </button>
-                                              `
-                                              : ""
-                                          }
-                                        </div>
-                                      </div>
-                                    `;
-                                  }
-                                )
-                                .join("")
-                            : `
-                              <div class="financeClientVisitsEmpty">
-                                Немає відкритих візитів.
-                              </div>
-                            `
-                        }
-                      </div>
-
-                      <footer>
-                        <div>
-                          Нараховано
-                          <strong>
-                            ${formatVisitFinanceMoney(
-                              client.billed
-                            )}
-                          </strong>
-                        </div>
-
-                        <div>
-                          Отримано
-                          <strong>
-                            ${formatVisitFinanceMoney(
-                              client.paid
-                            )}
-                          </strong>
-                        </div>
-
-                        ${
-                          client.owner_id
-                            ? `
-                              <button
-                                type="button"
-                                data-finance-open-owner="${escapeHtml(
-                                  client.owner_id
-                                )}"
-                              >
-                                Відкрити картку клієнта →
-                              </button>
-                            `
-                            : ""
-                        }
-                      </footer>
-                    </article>
-                  `;
-                }
-              )
-              .join("")
-          }
+          <div id="financeClientsCards">
+            ${
+              clients
+                .map(buildFinanceClientCard)
+                .join("")
+            }
+          </div>
 
           <div
             class="financeClientsFilteredEmpty"
             id="financeClientsFilteredEmpty"
-            hidden
+            ${clients.length ? "hidden" : ""}
           >
             <span>⌕</span>
 
@@ -28478,6 +29095,15 @@ async function renderFinanceClientsTab(
               Змініть фільтр або пошуковий запит.
             </p>
           </div>
+
+          <button
+            id="financeClientsMore"
+            class="ghost"
+            type="button"
+            ${balances.next_cursor ? "" : "hidden"}
+          >
+            Показати ще
+          </button>
         </section>
       </div>
     `;
@@ -28486,6 +29112,135 @@ async function renderFinanceClientsTab(
       page
     );
 
+    const cards =
+      page.querySelector(
+        "#financeClientsCards"
+      );
+
+    const moreButton =
+      page.querySelector(
+        "#financeClientsMore"
+      );
+
+    let nextCursor =
+      balances.next_cursor || null;
+
+    let shown =
+      clients.length;
+
+    // Відповідь на застарілий фільтр/пошук не перетирає новішу.
+    let requestSeq = 0;
+
+    const appendClients = (
+      rows
+    ) => {
+      const batch =
+        document.createElement(
+          "div"
+        );
+
+      batch.innerHTML =
+        rows
+          .map(buildFinanceClientCard)
+          .join("");
+
+      bindFinanceClientCards(
+        batch
+      );
+
+      cards.append(
+        ...batch.children
+      );
+    };
+
+    const showClientsPage = async (
+      cursor = null
+    ) => {
+      const seq =
+        ++requestSeq;
+
+      moreButton.disabled = true;
+
+      try {
+        const result =
+          await loadFinanceClientsPage(
+            cursor
+          );
+
+        if (seq !== requestSeq) {
+          return;
+        }
+
+        const rows =
+          Array.isArray(result.rows)
+            ? result.rows
+            : [];
+
+        if (!cursor) {
+          cards.innerHTML = "";
+          shown = 0;
+
+          page.querySelector(
+            "#financeClientsTotalCount"
+          ).textContent =
+            String(
+              Number(
+                result.total ??
+                rows.length
+              )
+            );
+        }
+
+        appendClients(
+          rows
+        );
+
+        shown += rows.length;
+        nextCursor =
+          result.next_cursor || null;
+
+        page.querySelector(
+          "#financeClientsVisibleCount"
+        ).textContent =
+          String(shown);
+
+        page.querySelector(
+          "#financeClientsFilteredEmpty"
+        ).hidden =
+          shown > 0;
+
+        moreButton.hidden =
+          !nextCursor;
+      } catch (error) {
+        console.error(
+          "Load finance clients page failed:",
+          error
+        );
+
+        alert(
+          error.message ||
+          "Не вдалося завантажити клієнтів."
+        );
+      } finally {
+        moreButton.disabled = false;
+      }
+    };
+
+    bindFinanceClientCards(
+      cards
+    );
+
+    moreButton.addEventListener(
+      "click",
+      () => {
+        if (nextCursor) {
+          showClientsPage(
+            nextCursor
+          );
+        }
+      }
+    );
+
     page
       .querySelectorAll(
         "[data-finance-client-filter]"
@@ -28500,13 +29255,24 @@ async function renderFinanceClientsTab(
                   .financeClientFilter ||
                 "debt";
 
-            applyFinanceClientFilters(
-              page
-            );
+            page
+              .querySelectorAll(
+                "[data-finance-client-filter]"
+              )
+              .forEach((item) => {
+                item.classList.toggle(
+                  "active",
+                  item === button
+                );
+              });
+
+            showClientsPage();
           }
         );
       });
 
+    let searchTimer = null;
+
     page
       .querySelector(
         "#financeClientSearch"
@@ -28519,16 +29285,18 @@ async function renderFinanceClientsTab(
               event.currentTarget
                 .value || "";
 
-          applyFinanceClientFilters(
-            page
+          clearTimeout(
+            searchTimer
           );
+
+          searchTimer =
+            setTimeout(
+              () => showClientsPage(),
+              300
+            );
         }
       );
 
-    applyFinanceClientFilters(
-      page
-    );
-
   } catch (error) {
     console.error(
       "renderFinanceClientsTab failed:",
@@ -35490,53 +36258,74 @@ async function renderVisitsTab() {
         <h2>Візити</h2>
         <input id="visitsSearch" class="inp" placeholder="Пошук…" style="max-width:260px" />
       </div>
-      <div class="hint">Всі візити з сервера. Клік по картці — відкрити.</div>
+      <div class="hint">Візити з сервера, нові зверху. Клік по картці — відкрити.</div>
       <div id="visitsTabList" class="list"></div>
+      <button id="visitsTabMore" class="ghost" type="button" style="display:none">Показати ще</button>
     </div>
   `;
 
   const visitListElement = document.getElementById("visitsTabList");
   const search = document.getElementById("visitsSearch");
+  const moreButton = document.getElementById("visitsTabMore");
   if (!visitListElement) return;
 
-  if (!Array.isArray(state.visits) || !state.visits.length) {
+  // Реєстр читається сторінками у view=summary: без рядків
+  // послуг/складу, лише суми. state.visits (повні візити) не чіпаємо.
+  // Пошук іде на сервер (?q=: діагноз, нотатки, призначення, кличка,
+  // власник і телефон), тож знаходить і візити поза завантаженими.
+  const visitsPage = { rows: [], nextCursor: null, q: "", request: 0 };
+
+  async function loadMore() {
+    const request = ++visitsPage.request;
+    const data = await loadVisitsPageApi({
+      view: "summary",
+      limit: VISITS_TAB_PAGE_SIZE,
+      ...(visitsPage.q ? { q: visitsPage.q } : {}),
+      ...(visitsPage.nextCursor ? { cursor: visitsPage.nextCursor } : {}),
+    });
+    // Відповідь на застарілий запит (пошук уже змінився).
+    if (!data || request !== visitsPage.request) return;
+
+    visitsPage.rows.push(...data.rows);
+    visitsPage.nextCursor = data.next_cursor || null;
+    if (moreButton) moreButton.style.display = visitsPage.nextCursor ? "" : "none";
+  }
+
+  async function reloadForSearch() {
+    visitsPage.q = (search?.value || "").trim();
+    visitsPage.rows = [];
+    visitsPage.nextCursor = null;
     visitListElement.innerHTML = `<div class="hint">Завантаження…</div>`;
-    const arr = await loadVisitsApi();
-    state.visits = Array.isArray(arr) ? arr : [];
+    await loadMore();
+    paint();
   }
 
+  visitListElement.innerHTML = `<div class="hint">Завантаження…</div>`;
+  await loadMore();
+
+  moreButton?.addEventListener("click", async () => {
+    moreButton.disabled = true;
+    await loadMore();
+    moreButton.disabled = false;
+    paint();
+  });
+
   function paint() {
-    const visits = Array.isArray(state.visits) ? state.visits : [];
+    const visits = visitsPage.rows;
     const patients = state.patients?.length ? state.patients : loadPatients();
     const owners = state.owners?.length ? state.owners : LS.get(OWNERS_KEY, []);
 
     const petById = new Map((patients || []).map(p => [String(p.id), p]));
     const ownerById = new Map((owners || []).map(o => [String(o.id), o]));
-    const q = (search?.value || "").trim().toLowerCase();
-
-    const filtered = visits
-      .slice()
-      .sort((a, b) => String(b.id).localeCompare(String(a.id)))
-      .filter(v => {
-        if (!q) return true;
-        const pet = petById.get(String(v.pet_id));
-        const owner = pet ? ownerById.get(String(pet.owner_id)) : null;
-
-        return [
-          v.date, v.note, v.rx,
-          pet?.name, pet?.species, pet?.breed,
-          owner?.name, owner?.phone
-        ].filter(Boolean).join(" ").toLowerCase().includes(q);
-      });
 
     visitListElement.innerHTML = "";
 
-    if (!filtered.length) {
+    if (!visits.length) {
       visitListElement.innerHTML = `<div class="hint">Нічого не знайдено.</div>`;
       return;
     }
 
-    filtered.forEach(v => {
+    visits.forEach(v => {
       const pet = petById.get(String(v.pet_id));
       const owner = pet ? ownerById.get(String(pet.owner_id)) : null;
 
@@ -35554,6 +36343,7 @@ async function renderVisitsTab() {
             ${owner?.name ? " • " + escapeHtml(owner.name) : ""}
           </div>
           ${v.note ? `<div class="meta" style="opacity:.85">${escapeHtml(v.note)}</div>` : ""}
+          ${v.lines_count ? `<div class="meta">${escapeHtml(String(v.lines_count))} поз. • ${escapeHtml(String(v.total ?? 0))} грн</div>` : ""}
         </div>
         <div class="right" style="display:flex; gap:6px;">
           <button class="iconBtn" data-action="open">➡️</button>
@@ -35564,7 +36354,12 @@ async function renderVisitsTab() {
     });
   }
 
-  search?.addEventListener("input", paint);
+  let searchTimer = null;
+
+  search?.addEventListener("input", () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(reloadForSearch, 300);
+  });
 
   visitListElement.onclick = async (e) => {
     const card = e.target.closest(".item[data-visit-id]");
@@ -35578,8 +36373,7 @@ async function renderVisitsTab() {
 
       const ok = await deleteVisitApi(visitId);
       if (ok) {
-        const arr = await loadVisitsApi();
-        state.visits = arr;
+        visitsPage.rows = visitsPage.rows.filter(v => String(v.id) !== String(visitId));
         paint();
       }
       return;
@@ -38727,6 +39521,27 @@ async function renderPatientTab(tab, pet) {
   const root = $("#patientCardRoot");
   if (!root || !pet) return;
 
+  // Огляд картки читає візити, діагнози, вагу й щеплення —
+  // забираємо їх одним /api/batch замість чотирьох запитів.
+  if (tab === "overview") {
+    const patientPath =
+      `/api/patients/${encodeURIComponent(
+        String(pet.id)
+      )}`;
+
+    await prefetchBatchResponses([
+      "/api/visits?" +
+        new URLSearchParams({
+          pet_id: pet.id,
+        }).toString(),
+      `${patientPath}/diagnoses?scope=${encodeURIComponent(
+        "active"
+      )}`,
+      `${patientPath}/weights`,
+      `${patientPath}/vaccinations`,
+    ]);
+  }
+
   const patientVisits =
   await loadVisitsApi({
     pet_id: pet.id,
@@ -46882,18 +47697,29 @@ async function loadStaffApi() {
 }
 
 async function loadCalendarApi() {
+  const cachedEvents =
+    LS.get(
+      CALENDAR_KEY,
+      []
+    );
+
   try {
     const res =
       await fetch(
-        `/api/calendar?_=${Date.now()}`,
+        syncUrl(
+          "/api/calendar",
+          "calendar",
+          cachedEvents
+        ),
         {
           method: "GET",
 
           credentials:
             "include",
 
+          // Перевірка через If-None-Match: 304, якщо дані не змінились.
           cache:
-            "no-store",
+            "no-cache",
 
           headers: {
             Accept:
@@ -46914,6 +47740,23 @@ async function loadCalendarApi() {
       );
     }
 
+    const synced =
+      mergeSyncDelta(
+        "calendar",
+        cachedEvents,
+        json.data
+      );
+
+    if (synced) {
+      saveSyncedRegister(
+        CALENDAR_KEY,
+        "calendar",
+        synced
+      );
+
+      return synced;
+    }
+
     return Array.isArray(
       json.items
     )
@@ -47534,14 +48377,20 @@ $$("[data-week-create-date]")
 
     const dayNames = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Нд"];
 
-    const monthEvents = events.filter((ev) => {
-      const d = String(ev.event_date || "");
-      return monthDays.includes(d);
-    });
+    // Для місяця — лише кількість записів по днях, без самих записів.
+    const [occupancyDays, scheduleRows] = await Promise.all([
+      loadCalendarOccupancyApi(
+        monthDays[0],
+        monthDays[monthDays.length - 1]
+      ),
+      loadStaffScheduleRangeApi(
+        monthDays[0],
+        monthDays[monthDays.length - 1]
+      ),
+    ]);
 
-    const scheduleRows = await loadStaffScheduleRangeApi(
-      monthDays[0],
-      monthDays[monthDays.length - 1]
+    const occupancyByDate = new Map(
+      occupancyDays.map((day) => [String(day.date || ""), day])
     );
 
     const scheduleByDate = new Map(
@@ -47615,13 +48464,13 @@ $$("[data-week-create-date]")
                   ? staff.filter((doc) => activeIds.has(String(doc.id)))
                   : [];
 
-                const dayEvents = monthEvents.filter((ev) => String(ev.event_date || "") === date);
+                const dayEventsCount = Number(occupancyByDate.get(date)?.events || 0);
 
                 return `
                   <div class="monthDay ${isCurrentMonth ? "" : "muted"} ${isToday ? "today" : ""}" data-month-date="${escapeHtml(date)}">
                     <div class="monthDayTop">
                       <div class="monthDayNum">${d.getDate()}</div>
-                      ${dayEvents.length ? `<div class="monthVisitCount">${dayEvents.length} записів</div>` : ""}
+                      ${dayEventsCount ? `<div class="monthVisitCount">${dayEventsCount} записів</div>` : ""}
                     </div>
 
                     <div class="monthStaffList">
@@ -58565,6 +59414,111 @@ function closeDischargeModal() {
 // =========================
 // OWNERS — Адаптированный рендер для стеклянной таблицы
 // =========================
+// =========================
+// Пошук клієнтів на сервері (/api/search/clients)
+// =========================
+const OWNERS_SERVER_SEARCH_DELAY_MS = 250;
+
+let ownersServerSearch = {
+  q: "",
+  ownerIds: [],
+};
+
+let ownersServerSearchTimer = null;
+
+async function searchClientsApi(q) {
+  const res = await fetch(
+    `/api/search/clients?q=${encodeURIComponent(q)}&limit=50`,
+    {
+      credentials: "include",
+      headers: {
+        Accept: "application/json",
+        ...getOrgHeaders(),
+      },
+    }
+  );
+
+  let json = null;
+
+  try {
+    json = await res.json();
+  } catch {}
+
+  if (!res.ok || json?.ok !== true) {
+    throw new Error(
+      json?.error ||
+      `HTTP ${res.status}`
+    );
+  }
+
+  return Array.isArray(json.data)
+    ? json.data
+    : [];
+}
+
+function scheduleOwnersServerSearch(value) {
+  clearTimeout(ownersServerSearchTimer);
+
+  const q = String(value || "")
+    .trim()
+    .toLowerCase();
+
+  if (q.length < 2) {
+    ownersServerSearch = { q: "", ownerIds: [] };
+    return;
+  }
+
+  ownersServerSearchTimer = setTimeout(async () => {
+    try {
+      const hits = await searchClientsApi(q);
+
+      ownersServerSearch = {
+        q,
+        ownerIds: Array.from(
+          new Set(
+            hits
+              .map((hit) => String(hit.owner_id || ""))
+              .filter(Boolean)
+          )
+        ),
+      };
+
+      const currentQ = String(
+        document.getElementById("globalSearch")?.value || ""
+      )
+        .trim()
+        .toLowerCase();
+
+      if (state.route === "owners" && currentQ === q) {
+        renderOwners();
+      }
+    } catch (e) {
+      // Без сервера лишається локальний фільтр.
+      console.warn("searchClientsApi failed:", e);
+    }
+  }, OWNERS_SERVER_SEARCH_DELAY_MS);
+}
+
+function mergeOwnersSearchResults(owners, rankedIds, localMatches) {
+  const byId = new Map(
+    owners.map((owner) => [String(owner.id), owner])
+  );
+
+  const result = rankedIds
+    .map((id) => byId.get(id))
+    .filter(Boolean);
+
+  const seen = new Set(
+    result.map((owner) => String(owner.id))
+  );
+
+  localMatches.forEach((owner) => {
+    if (!seen.has(String(owner.id))) result.push(owner);
+  });
+
+  return result;
+}
+
 function renderOwners() {
   const tbody = document.getElementById("owners-table-body");
   if (!tbody) return;
@@ -58589,7 +59543,7 @@ const qDigits =
   );
   const ownersRaw = Array.isArray(state.owners) ? state.owners : [];
 
-    const filteredOwners = ownersRaw.filter((owner) => {
+    const locallyFilteredOwners = ownersRaw.filter((owner) => {
   if (!q) return true;
 
   const name =
@@ -58656,6 +59610,17 @@ const qDigits =
   );
 });
 
+  // Спочатку ранжовані збіги сервера, потім локальні (нотатки, telegram).
+  const filteredOwners =
+    q &&
+    ownersServerSearch.q === q
+      ? mergeOwnersSearchResults(
+          ownersRaw,
+          ownersServerSearch.ownerIds,
+          locallyFilteredOwners
+        )
+      : locallyFilteredOwners;
+
   if (!filteredOwners.length) {
     tbody.innerHTML = `
   <tr>
@@ -68864,6 +69829,160 @@ function openRequiredPasswordChangeModal() {
     }, 80);
   });
 }
+// =========================
+// СТАРТОВІ ДАНІ ОДНИМ ЗАПИТОМ (/api/bootstrap, /api/batch)
+// =========================
+// Сервер паралельно збирає відповіді кількох GET-запитів.
+// Перший fetch кожного з них віддається з цього пакета,
+// наступні (і будь-які після змін) йдуть на сервер.
+const PREFETCHED_RESPONSES_TTL_MS = 30000;
+
+const prefetchedResponses = new Map();
+
+const nativeFetch =
+  window.fetch.bind(window);
+
+function storePrefetchedResponses(items) {
+  const expiresAt =
+    Date.now() +
+    PREFETCHED_RESPONSES_TTL_MS;
+
+  items.forEach(
+    ([path, section]) => {
+      prefetchedResponses.set(path, {
+        status: section?.status || 200,
+        body: section?.body ?? null,
+        expiresAt,
+      });
+    }
+  );
+}
+
+async function primeBootstrapResponses() {
+  try {
+    const response =
+      await nativeFetch(
+        "/api/bootstrap",
+        {
+          method: "GET",
+          credentials: "include",
+
+          headers: {
+            Accept:
+              "application/json",
+          },
+        }
+      );
+
+    if (!response.ok) {
+      return;
+    }
+
+    const json =
+      await response.json();
+
+    storePrefetchedResponses(
+      Object.entries(
+        json?.data?.sections || {}
+      )
+    );
+  } catch (error) {
+    console.warn(
+      "Bootstrap недоступний, завантажуємо окремо:",
+      error
+    );
+  }
+}
+
+async function prefetchBatchResponses(paths) {
+  try {
+    const response =
+      await nativeFetch(
+        "/api/batch",
+        {
+          method: "POST",
+          credentials: "include",
+
+          headers: {
+            Accept:
+              "application/json",
+
+            "Content-Type":
+              "application/json",
+          },
+
+          body: JSON.stringify({
+            requests: paths,
+          }),
+        }
+      );
+
+    if (!response.ok) {
+      return;
+    }
+
+    const json =
+      await response.json();
+
+    storePrefetchedResponses(
+      (json?.data?.responses || []).map(
+        (item) => [item.path, item]
+      )
+    );
+  } catch (error) {
+    console.warn(
+      "Batch недоступний, завантажуємо окремо:",
+      error
+    );
+  }
+}
+
+window.fetch = function prefetchAwareFetch(
+  input,
+  options = {}
+) {
+  const method =
+    String(
+      options?.method || "GET"
+    ).toUpperCase();
+
+  if (method !== "GET") {
+    prefetchedResponses.clear();
+
+    return nativeFetch(input, options);
+  }
+
+  const path =
+    typeof input === "string"
+      ? input
+      : "";
+
+  const cached =
+    prefetchedResponses.get(path);
+
+  if (cached) {
+    prefetchedResponses.delete(path);
+
+    if (cached.expiresAt > Date.now()) {
+      return Promise.resolve(
+        new Response(
+          JSON.stringify(cached.body),
+          {
+            status: cached.status,
+
+            headers: {
+              "Content-Type":
+                "application/json",
+            },
+          }
+        )
+      );
+    }
+  }
+
+  return nativeFetch(input, options);
+};
+
 // =========================
 // ГЛАВНЫЙ ИНИЦИАЛИЗАТОР ПРИЛОЖЕНИЯ (BOOTSTRAP)
 // =========================
@@ -68881,6 +70000,8 @@ async function init() {
 
   let sessionAuthenticated = false;
 
+  await primeBootstrapResponses();
+
   // Проверяем настоящую серверную сессию
   try {
     const sessionResponse =
@@ -69362,6 +70483,10 @@ ownersGlobalSearch
         "owners"
       ) {
         renderOwners();
+
+        scheduleOwnersServerSearch(
+          ownersGlobalSearch.value
+        );
       }
     }
   );
@@ -71302,6 +72427,32 @@ document.addEventListener('click', function(event) {
     }
 });
 
+async function loadCalendarOccupancyApi(from, to) {
+  try {
+    const res = await fetch(
+      `/api/calendar/occupancy?from=${encodeURIComponent(from)}&to=${encodeURIComponent(to)}`,
+      {
+        credentials: "include",
+        headers: {
+          Accept: "application/json",
+          ...getOrgHeaders(),
+        },
+      }
+    );
+
+    const json = await res.json();
+
+    if (!res.ok || json?.ok !== true) {
+      throw new Error(json?.error || `HTTP ${res.status}`);
+    }
+
+    return Array.isArray(json.data?.days) ? json.data.days : [];
+  } catch (e) {
+    console.error("loadCalendarOccupancyApi failed:", e);
+    return [];
+  }
+}
+
 async function loadStaffScheduleRangeApi(
   from,
   to
@@ -0,0 +1,527 @@
+"""
+Бенчмарк тяжёлых эндпоинтов на in-memory заменителе PostgREST.
+
+    python -m benchmarks.bench_endpoints
+    python -m benchmarks.bench_endpoints --latency-ms 8 --repeat 10
+    python -m benchmarks.bench_endpoints --owners 500 --visits 5000 --lines 25000
+
+По каждому эндпоинту печатает p50/p95 и число запросов к Supabase
+за один вызов. Задержка --latency-ms добавляется к каждому запросу,
+поэтому N+1 и последовательные выборки видны сразу.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, time as day_time, timedelta, timezone
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "benchmark-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "benchmark-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "11111111-1111-4111-8111-111111111111"
+USER_ID = "22222222-2222-4222-8222-222222222222"
+
+SPECIES = ("dog", "cat", "bird", "rodent", "reptile")
+VISIT_STATUSES = ("completed", "completed", "completed", "in_progress", "planned")
+FINANCIAL_STATUSES = ("paid", "paid", "partial", "unpaid", "cancelled")
+
+BENCHMARK_ENDPOINTS = (
+    ("client balances", "GET", "/api/finance/client-balances"),
+    ("staff rating rebuild", "POST", "/api/staff/rating/rebuild"),
+    ("daily report", "GET", "/api/reports/daily?date={report_date}"),
+    ("visits list", "GET", "/api/visits"),
+    ("stock list", "GET", "/api/stock"),
+)
+
+
+def seeded_uuid(kind, number):
+    return str(
+        uuid.UUID(
+            int=(kind << 96) | number,
+            version=4,
+        )
+    )
+
+
+def seed_clinic(
+    *,
+    owners=10_000,
+    visits=100_000,
+    lines=500_000,
+    staff=12,
+    services=150,
+    stock=400,
+    days=730,
+    today=None,
+    seed=7,
+):
+    """
+    Синтетическая клиника: owners → patients → visits → visit_services /
+    visit_stock, платежи, календарь, склад и стационар за `days` дней.
+    """
+
+    rng = random.Random(seed)
+    today = today or date.today()
+    now = datetime.now(timezone.utc)
+
+    def day_offset(offset):
+        return today - timedelta(days=offset)
+
+    def timestamp(day):
+        return datetime.combine(
+            day,
+            day_time(9 + rng.randrange(10), rng.randrange(60)),
+            tzinfo=timezone.utc,
+        ).isoformat()
+
+    rows = {
+        "orgs": [{"id": ORG_ID, "name": "Benchmark Clinic"}],
+        "clinic_users": [{
+            "id": USER_ID,
+            "org_id": ORG_ID,
+            "staff_id": None,
+            "username": "owner",
+            "display_name": "Owner",
+            "role": "owner",
+            "is_active": True,
+            "must_change_password": False,
+            "session_version": 1,
+        }],
+    }
+
+    rows["staff"] = [
+        {
+            "id": seeded_uuid(1, index),
+            "org_id": ORG_ID,
+            "name": f"Лікар {index}",
+            "avatar": "",
+            "role": "vet",
+        }
+        for index in range(staff)
+    ]
+
+    rows["services"] = [
+        {
+            "id": seeded_uuid(2, index),
+            "org_id": ORG_ID,
+            "name": f"Послуга {index}",
+            "price": rng.randrange(200, 3000),
+        }
+        for index in range(services)
+    ]
+
+    rows["stock"] = [
+        {
+            "id": seeded_uuid(3, index),
+            "org_id": ORG_ID,
+            "name": f"Препарат {index:04d}",
+            "unit": "шт",
+            "qty": rng.randrange(0, 200),
+            "minimum_qty": rng.randrange(0, 20),
+            "price": rng.randrange(20, 800),
+            "active": True,
+            "created_at": timestamp(day_offset(days)),
+            "updated_at": timestamp(day_offset(rng.randrange(days))),
+        }
+        for index in range(stock)
+    ]
+
+    rows["owners"] = []
+    rows["patients"] = []
+
+    for index in range(owners):
+        created_day = day_offset(rng.randrange(days))
+        owner_id = seeded_uuid(4, index)
+
+        rows["owners"].append({
+            "id": owner_id,
+            "org_id": ORG_ID,
+            "name": f"Власник {index:05d}",
+            "phone": f"+38067{index:07d}",
+            "created_at": timestamp(created_day),
+            "updated_at": timestamp(created_day),
+        })
+
+        for _pet in range(1 + (rng.random() < 0.5)):
+            rows["patients"].append({
+                "id": seeded_uuid(5, len(rows["patients"])),
+                "org_id": ORG_ID,
+                "owner_id": owner_id,
+                "name": f"Пацієнт {len(rows['patients'])}",
+                "species": rng.choice(SPECIES),
+                "status": "active",
+                "created_at": timestamp(created_day),
+                "updated_at": timestamp(created_day),
+            })
+
+    rows["visits"] = []
+    rows["finance_transactions"] = []
+    rows["calendar_events"] = []
+
+    for index in range(visits):
+        visit_day = day_offset(rng.randrange(days))
+        patient = rng.choice(rows["patients"])
+        visit_id = seeded_uuid(6, index)
+        financial_status = rng.choice(FINANCIAL_STATUSES)
+        status = rng.choice(VISIT_STATUSES)
+
+        rows["visits"].append({
+            "id": visit_id,
+            "org_id": ORG_ID,
+            "pet_id": patient["id"],
+            "staff_id": rng.choice(rows["staff"])["id"],
+            "date": visit_day.isoformat(),
+            "status": status,
+            "dx": "",
+            "note": "",
+            "discount_amount": 0,
+            "financial_status": financial_status,
+            "total_amount": 0,
+            "paid_amount": 0,
+            "completed_at": (
+                timestamp(visit_day)
+                if status == "completed"
+                else None
+            ),
+            "created_at": timestamp(visit_day),
+            "updated_at": timestamp(visit_day),
+        })
+
+        rows["calendar_events"].append({
+            "id": seeded_uuid(7, index),
+            "org_id": ORG_ID,
+            "visit_id": visit_id,
+            "staff_id": rows["visits"][-1]["staff_id"],
+            "event_date": visit_day.isoformat(),
+            "start_time": "10:00",
+            "status": "done" if status == "completed" else "planned",
+        })
+
+        if financial_status in {"paid", "partial"}:
+            rows["finance_transactions"].append({
+                "id": seeded_uuid(8, index),
+                "org_id": ORG_ID,
+                "visit_id": visit_id,
+                "transaction_type": "payment",
+                "status": "completed",
+                "amount": rng.randrange(100, 4000),
+                "occurred_at": timestamp(visit_day),
+            })
+
+    rows["visit_services"] = []
+    rows["visit_stock"] = []
+    rows["stock_movements"] = []
+
+    for index in range(lines):
+        visit = rows["visits"][rng.randrange(visits)] if visits else None
+
+        if visit is None:
+            break
+
+        if rng.random() < 0.6:
+            service = rng.choice(rows["services"])
+            rows["visit_services"].append({
+                "id": seeded_uuid(9, index),
+                "visit_id": visit["id"],
+                "service_id": service["id"],
+                "qty": 1,
+                "price_snap": service["price"],
+                "name_snap": service["name"],
+            })
+            continue
+
+        item = rng.choice(rows["stock"])
+        rows["visit_stock"].append({
+            "id": seeded_uuid(9, index),
+            "visit_id": visit["id"],
+            "stock_id": item["id"],
+            "qty": rng.randrange(1, 4),
+            "price_snap": item["price"],
+            "name_snap": item["name"],
+            "inventory_synced": True,
+        })
+        rows["stock_movements"].append({
+            "id": seeded_uuid(10, index),
+            "org_id": ORG_ID,
+            "stock_id": item["id"],
+            "movement_type": "writeoff",
+            "quantity": -rows["visit_stock"][-1]["qty"],
+            "unit_cost": item["price"],
+            "name_snap": item["name"],
+            "created_at": visit["created_at"],
+        })
+
+    rows["hospitalizations"] = [
+        {
+            "id": seeded_uuid(11, index),
+            "org_id": ORG_ID,
+            "status": "active",
+            "is_active": index % 4 == 0,
+        }
+        for index in range(max(visits // 500, 1))
+    ]
+
+    rows["hospital_tasks"] = [
+        {
+            "id": seeded_uuid(12, index),
+            "org_id": ORG_ID,
+            "status": "planned" if index % 3 else "completed",
+            "scheduled_at": (
+                now - timedelta(hours=index % 48)
+            ).isoformat(),
+        }
+        for index in range(max(visits // 100, 1))
+    ]
+
+    rows["staff_rating_snapshots"] = []
+    rows["clinic_report_settings"] = []
+
+    return rows
+
+
+def finance_overview_rpc(client, params):
+    """
+    Упрощённый get_finance_overview: оплаты/возвраты за период.
+    """
+
+    date_from = str(params.get("p_date_from") or "")
+    date_to = str(params.get("p_date_to") or "")
+    payments = 0
+    refunds = 0
+
+    for row in client.rows.get("finance_transactions", []):
+        day = str(row.get("occurred_at") or "")[:10]
+
+        if not (date_from <= day <= date_to):
+            continue
+
+        if row.get("status") != "completed":
+            continue
+
+        if row.get("transaction_type") == "payment":
+            payments += row.get("amount") or 0
+        elif row.get("transaction_type") == "refund":
+            refunds += row.get("amount") or 0
+
+    return {
+        "summary": {
+            "payments": payments,
+            "refunds": refunds,
+            "expenses": 0,
+            "net_revenue": payments - refunds,
+            "outstanding": 0,
+        },
+    }
+
+
+def create_standin(rows, latency_ms=0.0):
+    standin = SupabaseStandin(
+        rows,
+        latency_ms=latency_ms,
+    )
+    standin.rpc_handlers["get_finance_overview"] = (
+        finance_overview_rpc
+    )
+
+    return standin
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+
+    if not ordered:
+        return 0.0
+
+    index = max(
+        math.ceil(fraction * len(ordered)) - 1,
+        0,
+    )
+
+    return ordered[index]
+
+
+def run_benchmarks(
+    standin,
+    *,
+    repeat=5,
+    report_date=None,
+    endpoints=BENCHMARK_ENDPOINTS,
+):
+    """
+    Вызывает каждый эндпоинт repeat раз через Flask test client
+    с настоящей сессией и возвращает статистику по каждому.
+    """
+
+    report_date = report_date or (
+        date.today() - timedelta(days=1)
+    )
+
+    results = []
+
+    with patch.object(server, "supabase", standin):
+        server.schema_capabilities.invalidate()
+        server.invalidate_current_user_cache()
+
+        client = server.app.test_client()
+
+        with client.session_transaction(
+            base_url="https://localhost",
+        ) as session:
+            session["user_id"] = USER_ID
+            session["org_id"] = ORG_ID
+            session["session_version"] = 1
+
+        # Прогрев: схема и кэш пользователя не должны
+        # попадать в замеры первого эндпоинта.
+        client.get("/api/session", base_url="https://localhost")
+        standin.reset_calls()
+
+        for name, method, path in endpoints:
+            path = path.format(report_date=report_date.isoformat())
+            durations = []
+            query_counts = []
+            statuses = set()
+            calls = []
+
+            for _attempt in range(repeat):
+                started_at = time.perf_counter()
+                response = client.open(
+                    path,
+                    method=method,
+                    base_url="https://localhost",
+                )
+                durations.append(
+                    (time.perf_counter() - started_at) * 1000
+                )
+
+                calls = standin.reset_calls()
+                query_counts.append(len(calls))
+                statuses.add(response.status_code)
+
+            results.append({
+                "endpoint": name,
+                "method": method,
+                "path": path,
+                "status": sorted(statuses),
+                "p50_ms": round(percentile(durations, 0.5), 1),
+                "p95_ms": round(percentile(durations, 0.95), 1),
+                "queries": max(query_counts or [0]),
+                "by_table": dict(
+                    standin.call_counts(calls).most_common(5)
+                ),
+            })
+
+    return results
+
+
+def format_results(results, latency_ms):
+    lines = [
+        f"latency per query: {latency_ms} ms",
+        "{:<22} {:>7} {:>10} {:>10} {:>8}  {}".format(
+            "endpoint",
+            "status",
+            "p50 ms",
+            "p95 ms",
+            "queries",
+            "top tables",
+        ),
+    ]
+
+    for row in results:
+        lines.append(
+            "{:<22} {:>7} {:>10.1f} {:>10.1f} {:>8}  {}".format(
+                row["endpoint"],
+                ",".join(str(status) for status in row["status"]),
+                row["p50_ms"],
+                row["p95_ms"],
+                row["queries"],
+                ", ".join(
+                    f"{key}×{value}"
+                    for key, value in row["by_table"].items()
+                ),
+            )
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="DocPug endpoint benchmarks (in-memory PostgREST)",
+    )
+    parser.add_argument("--owners", type=int, default=10_000)
+    parser.add_argument("--visits", type=int, default=100_000)
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="endpoint name substring, e.g. --only balances",
+    )
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    seeding_started = time.perf_counter()
+    rows = seed_clinic(
+        owners=args.owners,
+        visits=args.visits,
+        lines=args.lines,
+        seed=args.seed,
+    )
+    print(
+        "seeded {} owners, {} visits, {} lines in {:.1f}s".format(
+            len(rows["owners"]),
+            len(rows["visits"]),
+            len(rows["visit_services"]) + len(rows["visit_stock"]),
+            time.perf_counter() - seeding_started,
+        ),
+        file=sys.stderr,
+    )
+
+    endpoints = [
+        endpoint
+        for endpoint in BENCHMARK_ENDPOINTS
+        if not args.only
+        or any(part in endpoint[0] for part in args.only)
+    ]
+
+    results = run_benchmarks(
+        create_standin(rows, args.latency_ms),
+        repeat=args.repeat,
+        endpoints=endpoints,
+    )
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(format_results(results, args.latency_ms))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,803 @@
+"""
+In-memory заменитель PostgREST для бенчмарков.
+
+Понимает фильтры, сортировку, keyset-курсоры (or=...),
+проекции колонок, count="exact", upsert и rpc, держит
+hash-индексы по колонкам eq/in_ и добавляет заданную
+задержку на каждый вызов, как сетевой round-trip.
+"""
+
+import itertools
+import re
+import threading
+import time
+from collections import Counter
+
+
+class StandinResult:
+    def __init__(self, data=None, count=None):
+        self.data = data
+        self.count = count
+
+
+def parse_select_columns(columns):
+    text = str(columns or "*").strip()
+
+    if not text or text == "*":
+        return None
+
+    names = []
+
+    for item in text.split(","):
+        item = item.strip()
+
+        # Вложенные ресурсы owners(name) не поддерживаются —
+        # эндпоинты из бенчмарка их не используют.
+        if not item or "(" in item:
+            continue
+
+        names.append(item.split(":")[-1].strip())
+
+    return names or None
+
+
+def split_top_level(text):
+    parts = []
+    depth = 0
+    quoted = False
+    current = []
+    index = 0
+
+    while index < len(text):
+        char = text[index]
+
+        if quoted and char == "\\" and index + 1 < len(text):
+            current.append(text[index:index + 2])
+            index += 2
+            continue
+
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            index += 1
+            continue
+
+        current.append(char)
+        index += 1
+
+    if current:
+        parts.append("".join(current))
+
+    return parts
+
+
+def unquote_value(value):
+    value = str(value)
+
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return (
+            value[1:-1]
+            .replace('\\"', '"')
+            .replace("\\\\", "\\")
+        )
+
+    return value
+
+
+def comparable(left, right):
+    """
+    Приводит значение из строки и значение фильтра
+    к сравнимым типам (PostgREST передаёт всё строкой).
+    """
+
+    if isinstance(left, bool) or isinstance(right, bool):
+        return str(left).lower(), str(right).lower()
+
+    if isinstance(left, (int, float)) and isinstance(
+        right,
+        (int, float),
+    ):
+        return left, right
+
+    if isinstance(left, (int, float)) and not isinstance(
+        right,
+        (int, float),
+    ):
+        try:
+            return left, float(right)
+        except (TypeError, ValueError):
+            return str(left), str(right)
+
+    return str(left), str(right)
+
+
+def like_matches(value, pattern, case_insensitive):
+    expression = ".*".join(
+        re.escape(part)
+        for part in str(pattern).replace("*", "%").split("%")
+    )
+
+    return re.fullmatch(
+        expression,
+        str(value),
+        re.IGNORECASE if case_insensitive else 0,
+    ) is not None
+
+
+def compare(operator, row_value, value):
+    if operator == "is":
+        text = str(value).lower()
+
+        if text == "null":
+            return row_value is None
+
+        if text in {"true", "false"}:
+            return row_value is (text == "true")
+
+        return False
+
+    if operator == "in":
+        return str(row_value) in value
+
+    if row_value is None:
+        return False
+
+    if operator in {"like", "ilike"}:
+        return like_matches(
+            row_value,
+            value,
+            operator == "ilike",
+        )
+
+    left, right = comparable(row_value, value)
+
+    if operator == "eq":
+        return left == right
+    if operator == "neq":
+        return left != right
+    if operator == "gt":
+        return left > right
+    if operator == "gte":
+        return left >= right
+    if operator == "lt":
+        return left < right
+    if operator == "lte":
+        return left <= right
+
+    raise ValueError(f"Unsupported operator: {operator}")
+
+
+def parse_logic_tree(text):
+    """
+    Разбирает выражение из or=(...) / and(...) в дерево
+    ("or"|"and", [узлы]) / ("cmp", column, operator, value).
+    """
+
+    nodes = []
+
+    for part in split_top_level(text):
+        part = part.strip()
+
+        for group in ("and", "or"):
+            if part.startswith(group + "(") and part.endswith(")"):
+                nodes.append(
+                    (group, parse_logic_tree(part[len(group) + 1:-1]))
+                )
+                break
+        else:
+            column, operator, value = part.split(".", 2)
+
+            if operator == "in":
+                value = frozenset(
+                    unquote_value(item)
+                    for item in split_top_level(value.strip("()"))
+                )
+            else:
+                value = unquote_value(value)
+
+            nodes.append(("cmp", column, operator, value))
+
+    return nodes
+
+
+def evaluate_logic(node, row):
+    kind = node[0]
+
+    if kind == "cmp":
+        _kind, column, operator, value = node
+        return compare(operator, row.get(column), value)
+
+    if kind == "or":
+        return any(evaluate_logic(item, row) for item in node[1])
+
+    return all(evaluate_logic(item, row) for item in node[1])
+
+
+def logic_leaves(node):
+    if node[0] == "cmp":
+        return [node]
+
+    return [
+        leaf
+        for item in node[1]
+        for leaf in logic_leaves(item)
+    ]
+
+
+def is_keyset_node(node, orders):
+    """
+    Курсор из apply_keyset_cursor(): or_ по колонкам сортировки
+    (col.lt/gt, and(col.eq, id.gt), col.is.null) либо gt/lt по
+    первой колонке сортировки в её направлении.
+    """
+
+    if not orders:
+        return False
+
+    order_columns = {column for column, _desc, _nulls in orders}
+
+    if node[0] == "cmp":
+        first_column, desc, _nullsfirst = orders[0]
+
+        return node[1] == first_column and node[2] in (
+            {"lt", "lte"} if desc else {"gt", "gte"}
+        )
+
+    return node[0] == "or" and all(
+        leaf[1] in order_columns
+        and leaf[2] in {"eq", "lt", "lte", "gt", "gte", "is"}
+        for leaf in logic_leaves(node)
+    )
+
+
+def sort_rows(rows, orders):
+    for column, desc, nullsfirst in reversed(orders):
+        # Postgres: NULLS LAST для ASC и NULLS FIRST для DESC.
+        if nullsfirst is None:
+            nullsfirst = desc
+
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+
+        present.sort(
+            key=lambda row, column=column: row.get(column),
+            reverse=desc,
+        )
+
+        rows = (
+            missing + present
+            if nullsfirst
+            else present + missing
+        )
+
+    return rows
+
+
+class StandinQuery:
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.operation = "select"
+        self.columns = None
+        self.count_mode = None
+        self.filters = []
+        self.orders = []
+        self.limit_value = None
+        self.offset_value = 0
+        self.payload = None
+        self.on_conflict = None
+        self.single_row = False
+
+    # ---------- операции ----------
+
+    def select(self, columns="*", count=None, **_kwargs):
+        self.columns = parse_select_columns(columns)
+        self.count_mode = count
+        return self
+
+    def insert(self, payload, **_kwargs):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def upsert(self, payload, on_conflict=None, **_kwargs):
+        self.operation = "upsert"
+        self.payload = payload
+        self.on_conflict = on_conflict
+        return self
+
+    def update(self, payload, **_kwargs):
+        self.operation = "update"
+        self.payload = payload
+        return self
+
+    def delete(self, **_kwargs):
+        self.operation = "delete"
+        return self
+
+    # ---------- фильтры ----------
+
+    def _filter(self, column, operator, value):
+        self.filters.append(
+            ("cmp", column, operator, value)
+        )
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def is_(self, column, value):
+        return self._filter(
+            column,
+            "is",
+            "null" if value is None else value,
+        )
+
+    def in_(self, column, values):
+        return self._filter(
+            column,
+            "in",
+            frozenset(str(value) for value in values),
+        )
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def match(self, query):
+        for column, value in dict(query).items():
+            self.eq(column, value)
+        return self
+
+    def or_(self, filters, **_kwargs):
+        self.filters.append(
+            ("or", parse_logic_tree(filters))
+        )
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None, **_kwargs):
+        self.orders.append(
+            (column, bool(desc), nullsfirst)
+        )
+        return self
+
+    def limit(self, value, **_kwargs):
+        self.limit_value = int(value)
+        return self
+
+    def range(self, start, end, **_kwargs):
+        self.offset_value = int(start)
+        self.limit_value = int(end) - int(start) + 1
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def maybe_single(self):
+        self.single_row = True
+        return self
+
+    # ---------- выполнение ----------
+
+    def execute(self):
+        self.client.record_call(
+            self.table_name,
+            self.operation,
+        )
+
+        with self.client.lock:
+            if self.operation == "select":
+                return self._execute_select()
+
+            if self.operation in {"insert", "upsert"}:
+                return self._execute_write()
+
+            if self.operation == "update":
+                return self._execute_update()
+
+            return self._execute_delete()
+
+    def _matching_rows(self, rows=None):
+        if rows is None:
+            rows = self.client.candidate_rows(
+                self.table_name,
+                self.filters,
+            )
+
+        return [
+            row
+            for row in rows
+            if all(
+                evaluate_logic(node, row)
+                for node in self.filters
+            )
+        ]
+
+    def _project(self, row):
+        if self.columns is None:
+            return dict(row)
+
+        return {
+            column: row.get(column)
+            for column in self.columns
+        }
+
+    def _first_sorted_rows(self, wanted):
+        """
+        Страница по (почти) всей таблице: идём по закэшированному
+        порядку сортировки и останавливаемся на `wanted` строках,
+        как индексный скан в Postgres.
+        """
+
+        rows = []
+        ordered = self.client.sorted_rows(
+            self.table_name,
+            self.orders,
+        )
+        seek_nodes = [
+            node
+            for node in self.filters
+            if is_keyset_node(node, self.orders)
+        ]
+        start = 0
+        end = len(ordered)
+
+        # Простое сравнение по первой колонке не проходит ни одна
+        # строка с NULL: как Postgres, ищем только среди непустых.
+        if any(node[0] == "cmp" for node in seek_nodes):
+            first_column = self.orders[0][0]
+
+            while end and ordered[end - 1].get(first_column) is None:
+                end -= 1
+
+            while start < end and ordered[start].get(first_column) is None:
+                start += 1
+
+        # Keyset-условие монотонно вдоль сортировки: бинарным
+        # поиском находим первую строку после курсора.
+        if seek_nodes:
+            while start < end:
+                middle = (start + end) // 2
+
+                if all(
+                    evaluate_logic(node, ordered[middle])
+                    for node in seek_nodes
+                ):
+                    end = middle
+                else:
+                    start = middle + 1
+
+        for row in itertools.islice(ordered, start, None):
+            if all(
+                evaluate_logic(node, row)
+                for node in self.filters
+            ):
+                rows.append(row)
+
+                if len(rows) >= wanted:
+                    break
+
+        return rows
+
+    def _execute_select(self):
+        total = None
+        candidates = self.client.candidate_rows(
+            self.table_name,
+            self.filters,
+        )
+
+        if (
+            self.orders
+            and self.limit_value is not None
+            and not self.count_mode
+            and len(candidates) * 2
+            >= len(self.client.rows.get(self.table_name, []))
+        ):
+            rows = self._first_sorted_rows(
+                self.offset_value + self.limit_value
+            )
+
+        else:
+            rows = self._matching_rows(candidates)
+            total = len(rows)
+
+            if self.orders:
+                rows = sort_rows(rows, self.orders)
+
+        rows = rows[self.offset_value:]
+
+        if self.limit_value is not None:
+            rows = rows[:self.limit_value]
+
+        data = [self._project(row) for row in rows]
+
+        if self.single_row:
+            data = data[0] if data else None
+
+        return StandinResult(
+            data,
+            total if self.count_mode else None,
+        )
+
+    def _execute_write(self):
+        payload = (
+            self.payload
+            if isinstance(self.payload, list)
+            else [self.payload]
+        )
+
+        conflict_columns = [
+            column.strip()
+            for column in str(self.on_conflict or "id").split(",")
+        ]
+
+        table = self.client.rows.setdefault(self.table_name, [])
+        written = []
+
+        for item in payload:
+            row = dict(item)
+            existing = None
+
+            if self.operation == "upsert":
+                key = tuple(str(row.get(column)) for column in conflict_columns)
+                existing = next(
+                    (
+                        current
+                        for current in table
+                        if tuple(
+                            str(current.get(column))
+                            for column in conflict_columns
+                        ) == key
+                    ),
+                    None,
+                )
+
+            if existing is not None:
+                existing.update(row)
+                written.append(existing)
+            else:
+                row.setdefault("id", self.client.next_id(self.table_name))
+                table.append(row)
+                written.append(row)
+
+        self.client.invalidate_indexes(self.table_name)
+
+        return StandinResult([dict(row) for row in written])
+
+    def _execute_update(self):
+        rows = self._matching_rows()
+
+        for row in rows:
+            row.update(self.payload or {})
+
+        self.client.invalidate_indexes(self.table_name)
+
+        return StandinResult([dict(row) for row in rows])
+
+    def _execute_delete(self):
+        rows = self._matching_rows()
+        removed = {id(row) for row in rows}
+
+        self.client.rows[self.table_name] = [
+            row
+            for row in self.client.rows.get(self.table_name, [])
+            if id(row) not in removed
+        ]
+        self.client.invalidate_indexes(self.table_name)
+
+        return StandinResult([dict(row) for row in rows])
+
+
+class StandinRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params or {}
+
+    def execute(self):
+        self.client.record_call(
+            "rpc:" + self.name,
+            "rpc",
+        )
+
+        handler = self.client.rpc_handlers.get(self.name)
+
+        if handler is None:
+            return StandinResult(None)
+
+        with self.client.lock:
+            return StandinResult(handler(self.client, self.params))
+
+
+class StandinOpenApiResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self.payload
+
+
+class StandinPostgrest:
+    """
+    Отдаёт OpenAPI-схему по колонкам засеянных таблиц,
+    чтобы select_columns() работал как с настоящей базой.
+    """
+
+    base_url = "http://standin.local/rest/v1"
+    headers = {}
+
+    def __init__(self, client):
+        self.client = client
+        self.session = self
+
+    def get(self, _url, **_kwargs):
+        return StandinOpenApiResponse({
+            "definitions": {
+                table: {
+                    "properties": {
+                        column: {}
+                        for column in columns
+                    },
+                }
+                for table, columns in self.client.table_columns().items()
+            },
+        })
+
+
+class SupabaseStandin:
+    """
+    Заменитель клиента supabase-py: server.supabase = SupabaseStandin(rows).
+    latency_ms добавляется к каждому execute() (sleep вне блокировки,
+    поэтому параллельные запросы gather_supabase_queries перекрываются).
+    """
+
+    def __init__(self, rows=None, *, latency_ms=0.0, columns=None):
+        self.rows = rows if rows is not None else {}
+        self.latency_ms = float(latency_ms or 0)
+        self.columns = dict(columns or {})
+        self.rpc_handlers = {}
+        self.calls = []
+        self.lock = threading.RLock()
+        self.calls_lock = threading.Lock()
+        self.indexes = {}
+        self.id_counter = 0
+        self.postgrest = StandinPostgrest(self)
+
+    def table(self, table_name):
+        return StandinQuery(self, table_name)
+
+    def rpc(self, name, params=None):
+        return StandinRpc(self, name, params)
+
+    # ---------- учёт вызовов ----------
+
+    def record_call(self, table, operation):
+        with self.calls_lock:
+            self.calls.append((table, operation))
+
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    def reset_calls(self):
+        with self.calls_lock:
+            calls = list(self.calls)
+            self.calls = []
+
+        return calls
+
+    def call_counts(self, calls=None):
+        return Counter(
+            f"{operation} {table}"
+            for table, operation in (
+                self.calls
+                if calls is None
+                else calls
+            )
+        )
+
+    # ---------- индексы и схема ----------
+
+    def next_id(self, table_name):
+        self.id_counter += 1
+        return f"{table_name}-standin-{self.id_counter}"
+
+    def invalidate_indexes(self, table_name):
+        for key in list(self.indexes):
+            if key[0] == table_name:
+                self.indexes.pop(key, None)
+
+    def sorted_rows(self, table_name, orders):
+        key = (table_name, "order", tuple(orders))
+        rows = self.indexes.get(key)
+
+        if rows is None:
+            rows = sort_rows(
+                list(self.rows.get(table_name, [])),
+                orders,
+            )
+            self.indexes[key] = rows
+
+        return rows
+
+    def index_for(self, table_name, column):
+        key = (table_name, column)
+        index = self.indexes.get(key)
+
+        if index is None:
+            index = {}
+
+            for row in self.rows.get(table_name, []):
+                index.setdefault(str(row.get(column)), []).append(row)
+
+            self.indexes[key] = index
+
+        return index
+
+    def candidate_rows(self, table_name, filters):
+        """
+        Сужает перебор по самому узкому eq/in_ фильтру через
+        hash-индекс: in_("visit_id", 150 ids) на 500k строк
+        не должен стоить полного прохода.
+        """
+
+        best = None
+
+        for node in filters:
+            if node[0] != "cmp" or node[2] not in {"eq", "in"}:
+                continue
+
+            index = self.index_for(table_name, node[1])
+            values = node[3] if node[2] == "in" else [node[3]]
+            rows = []
+
+            for value in values:
+                rows.extend(index.get(str(value), ()))
+
+            if best is None or len(rows) < len(best):
+                best = rows
+
+        if best is None:
+            return list(self.rows.get(table_name, []))
+
+        return best
+
+    def table_columns(self):
+        columns = {
+            table: set(names)
+            for table, names in self.columns.items()
+        }
+
+        for table, rows in self.rows.items():
+            known = columns.setdefault(table, set())
+
+            for row in rows[:50]:
+                known.update(row)
+
+        return columns
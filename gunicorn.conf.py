@@ -0,0 +1,31 @@
+# Конфигурация gunicorn (подхватывается автоматически из
+# рабочего каталога: `gunicorn server:app`).
+#
+# gthread: каждый запрос занимает поток, а не весь воркер.
+# Открытая вкладка почти всё время держит поток своим
+# /api/events/stream (переподключение через 1 с после
+# EVENT_STREAM_MAX_SECONDS), поэтому server.py пускает в поток
+# не больше EVENT_STREAM_SLOTS вкладок на воркер — по умолчанию
+# четверть GUNICORN_THREADS. Остальные получают 204 и живут
+# на опросе, а API остаются три четверти потоков.
+#
+# Переменные окружения:
+#   WEB_CONCURRENCY    — число процессов (по умолчанию 2);
+#   GUNICORN_THREADS   — потоков на процесс (по умолчанию 16);
+#   EVENT_STREAM_SLOTS — потоков под SSE на процесс.
+# Адрес по умолчанию gunicorn берёт из $PORT.
+import os
+
+
+worker_class = "gthread"
+
+workers = int(os.getenv("WEB_CONCURRENCY") or 2)
+
+threads = int(os.getenv("GUNICORN_THREADS") or 16)
+
+# Для gthread это таймаут «зависшего» воркера, а не запроса.
+timeout = 60
+
+graceful_timeout = 30
+
+keepalive = 5
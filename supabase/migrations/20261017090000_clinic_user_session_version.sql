@@ -0,0 +1,29 @@
+-- Session version lets API workers cache the active clinic user between
+-- requests. Any change that affects access (role, deactivation, password)
+-- bumps the version, so a cached or signed session with an older value is
+-- rejected on the next refresh.
+alter table public.clinic_users
+  add column if not exists session_version integer not null default 1;
+
+create or replace function public.bump_clinic_user_session_version()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  if new.role is distinct from old.role
+     or new.is_active is distinct from old.is_active
+     or new.password_hash is distinct from old.password_hash
+     or new.org_id is distinct from old.org_id then
+    new.session_version := coalesce(old.session_version, 1) + 1;
+  end if;
+  return new;
+end
+$function$;
+
+drop trigger if exists bump_clinic_user_session_version
+  on public.clinic_users;
+create trigger bump_clinic_user_session_version
+before update on public.clinic_users
+for each row execute function public.bump_clinic_user_session_version();
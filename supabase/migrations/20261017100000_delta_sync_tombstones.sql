@@ -0,0 +1,221 @@
+-- Delta sync: the SPA keeps local copies of patients, owners, visits and
+-- calendar events and asks only for rows changed since its cursor
+-- (GET ...?since=<timestamptz>).
+--
+-- * updated_at is kept current by a BEFORE UPDATE trigger, so every write
+--   path (Flask, RPC, manual SQL) moves the row forward;
+-- * changes of visit_services / visit_stock touch the parent visit, because
+--   the visit payload embeds its lines;
+-- * deletes leave a tombstone in sync_tombstones so that clients can drop
+--   the row from their cache; the prune-sync-tombstones cron job drops
+--   tombstones older than the 30-day delta window;
+-- * (org_id, updated_at) indexes keep the delta query a range scan.
+
+begin;
+
+do $migration$
+begin
+  if to_regclass('public.patients') is null
+     or to_regclass('public.owners') is null
+     or to_regclass('public.visits') is null
+     or to_regclass('public.calendar_events') is null then
+    raise exception using
+      errcode = '55000',
+      message = 'Delta sync requires patients, owners, visits and calendar_events';
+  end if;
+end
+$migration$;
+
+alter table public.patients
+  add column if not exists updated_at timestamptz not null default now();
+alter table public.owners
+  add column if not exists updated_at timestamptz not null default now();
+alter table public.visits
+  add column if not exists updated_at timestamptz not null default now();
+alter table public.calendar_events
+  add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists patients_org_id_updated_at_idx
+  on public.patients (org_id, updated_at);
+create index if not exists owners_org_id_updated_at_idx
+  on public.owners (org_id, updated_at);
+create index if not exists visits_org_id_updated_at_idx
+  on public.visits (org_id, updated_at);
+create index if not exists calendar_events_org_id_updated_at_idx
+  on public.calendar_events (org_id, updated_at);
+
+create table if not exists public.sync_tombstones (
+  id bigint generated always as identity primary key,
+  org_id uuid not null,
+  table_name text not null check (
+    table_name in ('patients', 'owners', 'visits', 'calendar_events')
+  ),
+  row_id text not null,
+  deleted_at timestamptz not null default now()
+);
+
+create index if not exists sync_tombstones_org_table_deleted_at_idx
+  on public.sync_tombstones (org_id, table_name, deleted_at);
+
+create or replace function public.touch_sync_updated_at()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  new.updated_at := now();
+  return new;
+end
+$function$;
+
+create or replace function public.record_sync_tombstone()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+declare
+  old_row jsonb := to_jsonb(old);
+begin
+  if old_row ->> 'org_id' is not null and old_row ->> 'id' is not null then
+    insert into public.sync_tombstones (org_id, table_name, row_id)
+    values (
+      (old_row ->> 'org_id')::uuid,
+      tg_table_name,
+      old_row ->> 'id'
+    );
+  end if;
+  return old;
+end
+$function$;
+
+create or replace function public.touch_visit_from_line()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+declare
+  line_row jsonb := to_jsonb(coalesce(new, old));
+begin
+  if line_row ->> 'visit_id' is not null then
+    update public.visits
+    set updated_at = now()
+    where id = (line_row ->> 'visit_id')::uuid;
+  end if;
+  return null;
+end
+$function$;
+
+-- Old rows can be older than any cursor; tombstones are only kept for the
+-- window in which the API still answers with a delta (see
+-- DELTA_SYNC_TOMBSTONE_RETENTION_DAYS in server.py).
+create or replace function public.prune_sync_tombstones(
+  p_older_than interval default interval '30 days'
+)
+returns integer
+language sql
+security invoker
+set search_path = public, pg_temp
+as $function$
+  with removed as (
+    delete from public.sync_tombstones
+    where deleted_at < now() - p_older_than
+    returning 1
+  )
+  select count(*)::integer from removed;
+$function$;
+
+do $migration$
+declare
+  synced_table text;
+begin
+  foreach synced_table in array array[
+    'patients', 'owners', 'visits', 'calendar_events'
+  ] loop
+    execute format(
+      'drop trigger if exists touch_sync_updated_at on public.%I',
+      synced_table
+    );
+    execute format(
+      'create trigger touch_sync_updated_at '
+      'before update on public.%I '
+      'for each row execute function public.touch_sync_updated_at()',
+      synced_table
+    );
+
+    execute format(
+      'drop trigger if exists record_sync_tombstone on public.%I',
+      synced_table
+    );
+    execute format(
+      'create trigger record_sync_tombstone '
+      'after delete on public.%I '
+      'for each row execute function public.record_sync_tombstone()',
+      synced_table
+    );
+  end loop;
+
+  foreach synced_table in array array['visit_services', 'visit_stock'] loop
+    if to_regclass(format('public.%I', synced_table)) is not null then
+      execute format(
+        'drop trigger if exists touch_visit_from_line on public.%I',
+        synced_table
+      );
+      execute format(
+        'create trigger touch_visit_from_line '
+        'after insert or update or delete on public.%I '
+        'for each row execute function public.touch_visit_from_line()',
+        synced_table
+      );
+    end if;
+  end loop;
+end
+$migration$;
+
+alter table public.sync_tombstones enable row level security;
+
+revoke all privileges on table public.sync_tombstones
+  from public, anon, authenticated, service_role;
+
+grant select, insert, delete on table public.sync_tombstones
+  to service_role;
+
+revoke all privileges on function public.touch_sync_updated_at()
+  from public, anon, authenticated;
+revoke all privileges on function public.record_sync_tombstone()
+  from public, anon, authenticated;
+revoke all privileges on function public.touch_visit_from_line()
+  from public, anon, authenticated;
+revoke all privileges on function public.prune_sync_tombstones(interval)
+  from public, anon, authenticated;
+grant execute on function public.prune_sync_tombstones(interval)
+  to service_role;
+
+-- Nightly pruning with the same 30-day window the API uses.
+do $migration$
+declare
+  existing_job_id bigint;
+begin
+  select jobid
+    into existing_job_id
+  from cron.job
+  where jobname = 'prune-sync-tombstones'
+  limit 1;
+
+  if existing_job_id is not null then
+    perform cron.unschedule(existing_job_id);
+  end if;
+
+  perform cron.schedule(
+    'prune-sync-tombstones',
+    '40 2 * * *',
+    $cron$
+      select public.prune_sync_tombstones(interval '30 days');
+    $cron$
+  );
+end
+$migration$;
+
+commit;
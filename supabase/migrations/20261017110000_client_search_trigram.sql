@@ -0,0 +1,161 @@
+-- Reception search: one ranked query over owners and patients
+-- (GET /api/search/clients -> public.search_clients).
+--
+-- * owners.phone_digits keeps only the digits of the phone, so "067 123",
+--   "+380671234567" and "(067) 123-45-67" match the same row;
+-- * pg_trgm GIN indexes serve the prefix, infix and fuzzy lookups (ILIKE,
+--   LIKE and <%) with a runtime pattern, so the function's generic plan
+--   stays an index scan instead of a pass over the whole register.
+
+begin;
+
+create extension if not exists pg_trgm with schema extensions;
+
+do $migration$
+begin
+  if to_regclass('public.owners') is null
+     or to_regclass('public.patients') is null then
+    raise exception using
+      errcode = '55000',
+      message = 'Client search requires owners and patients';
+  end if;
+end
+$migration$;
+
+alter table public.owners
+  add column if not exists phone_digits text
+  generated always as (
+    nullif(regexp_replace(coalesce(phone, ''), '\D', '', 'g'), '')
+  ) stored;
+
+create index if not exists owners_name_trgm_idx
+  on public.owners using gin (name extensions.gin_trgm_ops);
+create index if not exists owners_phone_digits_trgm_idx
+  on public.owners using gin (phone_digits extensions.gin_trgm_ops);
+create index if not exists patients_name_trgm_idx
+  on public.patients using gin (name extensions.gin_trgm_ops);
+
+-- Ranking: exact/prefix name or phone match first, then word prefix,
+-- then trigram similarity. A patient hit carries its owner so that
+-- reception lands on the client card either way.
+create or replace function public.search_clients(
+  p_org_id uuid,
+  p_query text,
+  p_limit integer default 20
+)
+returns table (
+  kind text,
+  id uuid,
+  owner_id uuid,
+  name text,
+  owner_name text,
+  phone text,
+  species text,
+  score real
+)
+language sql
+stable
+security invoker
+set search_path = public, extensions, pg_temp
+as $function$
+  with input as (
+    select
+      lower(trim(coalesce(p_query, ''))) as term,
+      regexp_replace(coalesce(p_query, ''), '\D', '', 'g') as digits
+  ),
+  params as (
+    select
+      input.term,
+      -- User input is matched literally, not as a LIKE pattern.
+      replace(replace(replace(input.term, '\', '\\'), '%', '\%'), '_', '\_')
+        as like_term,
+      input.digits,
+      least(greatest(coalesce(p_limit, 20), 1), 50) as row_limit
+    from input
+  ),
+  owner_hits as (
+    select
+      'owner'::text as kind,
+      o.id,
+      o.id as owner_id,
+      o.name,
+      o.name as owner_name,
+      o.phone,
+      null::text as species,
+      greatest(
+        case when lower(o.name) = params.term then 1.0 else 0 end,
+        case when o.name ilike params.like_term || '%' then 0.9 else 0 end,
+        case when o.name ilike '% ' || params.like_term || '%' then 0.8 else 0 end,
+        -- Local "067..." is a prefix of the stored "38067...".
+        case
+          when length(params.digits) < 3 then 0
+          when o.phone_digits like params.digits || '%'
+            or o.phone_digits like '38' || params.digits || '%' then 0.95
+          when o.phone_digits like '%' || params.digits || '%' then 0.85
+          else 0
+        end,
+        word_similarity(params.term, o.name) * 0.7
+      )::real as score
+    from public.owners as o, params
+    where o.org_id = p_org_id
+      and params.term <> ''
+      and (
+        o.name ilike '%' || params.like_term || '%'
+        or params.term <% o.name
+        or (
+          length(params.digits) >= 3
+          and o.phone_digits like '%' || params.digits || '%'
+        )
+      )
+  ),
+  patient_hits as (
+    select
+      'patient'::text as kind,
+      p.id,
+      p.owner_id,
+      p.name,
+      o.name as owner_name,
+      o.phone,
+      p.species,
+      greatest(
+        case when lower(p.name) = params.term then 0.95 else 0 end,
+        case when p.name ilike params.like_term || '%' then 0.85 else 0 end,
+        case when p.name ilike '% ' || params.like_term || '%' then 0.75 else 0 end,
+        word_similarity(params.term, p.name) * 0.65
+      )::real as score
+    from public.patients as p
+    cross join params
+    left join public.owners as o
+      on o.id = p.owner_id
+     and o.org_id = p.org_id
+    where p.org_id = p_org_id
+      and params.term <> ''
+      and (
+        p.name ilike '%' || params.like_term || '%'
+        or params.term <% p.name
+      )
+  )
+  select
+    hits.kind,
+    hits.id,
+    hits.owner_id,
+    hits.name,
+    hits.owner_name,
+    hits.phone,
+    hits.species,
+    hits.score
+  from (
+    select * from owner_hits
+    union all
+    select * from patient_hits
+  ) as hits
+  order by hits.score desc, hits.name, hits.id
+  limit (select row_limit from params);
+$function$;
+
+revoke all privileges on function public.search_clients(uuid, text, integer)
+  from public, anon, authenticated;
+grant execute on function public.search_clients(uuid, text, integer)
+  to service_role;
+
+commit;
@@ -0,0 +1,5 @@
+-- Calendar range reads: GET /api/calendar?from=&to= and the month
+-- occupancy rollup (GET /api/calendar/occupancy) filter one clinic by
+-- event_date and order by (event_date, start_time).
+create index if not exists calendar_events_org_id_event_date_start_time_idx
+  on public.calendar_events (org_id, event_date, start_time);
@@ -0,0 +1,8 @@
+-- Visits register pages: GET /api/visits?from=&to=&staff_id=&cursor=
+-- filters one clinic by date (optionally by staff) and walks keyset
+-- pages ordered by (date desc nulls last, id).
+create index if not exists visits_org_id_date_id_idx
+  on public.visits (org_id, date desc nulls last, id);
+
+create index if not exists visits_org_id_staff_id_date_idx
+  on public.visits (org_id, staff_id, date desc);
@@ -0,0 +1,717 @@
+-- Client settlements: per-visit and per-client balances kept current by
+-- triggers, so GET /api/finance/client-balances reads a handful of indexed
+-- rows instead of recomputing every visit, line and payment in Python.
+--
+-- * visit_settlements holds total / paid / remaining / financial_status per
+--   visit. It is refreshed whenever visit lines, the visit discount or
+--   status, the patient's owner or the visit's payments and refunds change;
+-- * client_settlements rolls visit_settlements up per owner and is refreshed
+--   from visit_settlements changes, so a payment touches one visit row and
+--   one client row;
+-- * the rules mirror the old Python register: lines are qty * price_snap
+--   (a missing qty counts as 1), the discount is subtracted, completed
+--   payments minus completed refunds are paid, cancelled/refunded visits
+--   count as zero and visits with neither a total nor a payment are left out
+--   of the client rollup;
+-- * refreshes of one clinic are serialised by a transaction-level advisory
+--   lock taken in its own statement before the sums are read: under READ
+--   COMMITTED the later statements then see what a concurrent transaction
+--   (save_visit_lines vs a payment, two visits of one owner) committed,
+--   instead of overwriting it with totals from an older snapshot. One lock
+--   per clinic (not per visit) keeps the backfill and the reconciliation
+--   within the shared lock table;
+-- * reconcile_settlements() recomputes a whole clinic; the
+--   reconcile-settlements cron job runs it nightly for every clinic.
+
+begin;
+
+do $migration$
+begin
+  if to_regclass('public.owners') is null
+     or to_regclass('public.patients') is null
+     or to_regclass('public.visits') is null
+     or to_regclass('public.visit_services') is null
+     or to_regclass('public.visit_stock') is null
+     or to_regclass('public.finance_transactions') is null then
+    raise exception using
+      errcode = '55000',
+      message = 'Visit settlements require owners, patients, visits, '
+        || 'visit lines and finance_transactions';
+  end if;
+end
+$migration$;
+
+create table if not exists public.visit_settlements (
+  visit_id uuid primary key
+    references public.visits(id)
+    on delete cascade,
+  org_id uuid not null,
+  patient_id uuid,
+  owner_id uuid,
+  visit_date text,
+  total numeric(14, 2) not null default 0,
+  paid numeric(14, 2) not null default 0,
+  remaining numeric(14, 2) not null default 0,
+  financial_status text not null default 'unpaid',
+  updated_at timestamptz not null default now()
+);
+
+create index if not exists visit_settlements_org_id_owner_id_date_idx
+  on public.visit_settlements (org_id, owner_id, visit_date desc);
+
+create index if not exists visit_settlements_org_id_open_date_idx
+  on public.visit_settlements (org_id, visit_date desc)
+  where remaining > 0;
+
+create table if not exists public.client_settlements (
+  org_id uuid not null,
+  owner_id uuid not null,
+  billed numeric(14, 2) not null default 0,
+  paid numeric(14, 2) not null default 0,
+  remaining numeric(14, 2) not null default 0,
+  visits_count integer not null default 0,
+  debt_visits_count integer not null default 0,
+  patients_count integer not null default 0,
+  last_visit_date text,
+  updated_at timestamptz not null default now(),
+  primary key (org_id, owner_id)
+);
+
+create index if not exists client_settlements_org_id_remaining_idx
+  on public.client_settlements (org_id, remaining desc, owner_id);
+
+create index if not exists visits_org_id_pet_id_idx
+  on public.visits (org_id, pet_id);
+
+create index if not exists finance_transactions_org_id_visit_id_idx
+  on public.finance_transactions (org_id, visit_id)
+  where visit_id is not null;
+
+create or replace function public.lock_clinic_settlements(
+  p_org_id uuid
+)
+returns void
+language sql
+security invoker
+set search_path = public, pg_temp
+as $function$
+  select pg_advisory_xact_lock(
+    hashtext('settlements:' || p_org_id::text)
+  );
+$function$;
+
+create or replace function public.refresh_visit_settlements(
+  p_visit_ids uuid[]
+)
+returns void
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+declare
+  locked_org_id uuid;
+begin
+  if coalesce(cardinality(p_visit_ids), 0) = 0 then
+    return;
+  end if;
+
+  -- Locks first, in a fixed order; the statements below take a new
+  -- snapshot and see everything committed while we waited.
+  for locked_org_id in
+    select affected.org_id
+    from (
+      select visit.org_id
+      from public.visits as visit
+      where visit.id = any(p_visit_ids)
+      union
+      select settlement.org_id
+      from public.visit_settlements as settlement
+      where settlement.visit_id = any(p_visit_ids)
+    ) as affected
+    order by affected.org_id
+  loop
+    perform public.lock_clinic_settlements(locked_org_id);
+  end loop;
+
+  delete from public.visit_settlements as settlement
+  where settlement.visit_id = any(p_visit_ids)
+    and not exists (
+      select 1
+      from public.visits as visit
+      where visit.id = settlement.visit_id
+    );
+
+  insert into public.visit_settlements as settlement (
+    visit_id,
+    org_id,
+    patient_id,
+    owner_id,
+    visit_date,
+    total,
+    paid,
+    remaining,
+    financial_status,
+    updated_at
+  )
+  select
+    computed.visit_id,
+    computed.org_id,
+    computed.patient_id,
+    computed.owner_id,
+    computed.visit_date,
+    computed.total,
+    computed.paid,
+    greatest(computed.total - computed.paid, 0),
+    case
+      when computed.total - computed.paid <= 0 then 'paid'
+      when computed.paid > 0 then 'partial'
+      else 'unpaid'
+    end,
+    now()
+  from (
+    select
+      visit.id as visit_id,
+      visit.org_id,
+      patient.id as patient_id,
+      patient.owner_id,
+      visit.date::text as visit_date,
+      case
+        when lower(coalesce(visit.financial_status, ''))
+          in ('cancelled', 'refunded') then 0
+        else round(greatest(
+          coalesce(services.amount, 0)
+            + coalesce(stock.amount, 0)
+            - greatest(coalesce(visit.discount_amount, 0), 0),
+          0
+        ), 2)
+      end as total,
+      case
+        when lower(coalesce(visit.financial_status, ''))
+          in ('cancelled', 'refunded') then 0
+        else round(greatest(coalesce(payments.amount, 0), 0), 2)
+      end as paid
+    from public.visits as visit
+    left join public.patients as patient
+      on patient.id = visit.pet_id
+     and patient.org_id = visit.org_id
+    left join lateral (
+      select sum(
+        coalesce(nullif(line.qty, 0), 1) * coalesce(line.price_snap, 0)
+      ) as amount
+      from public.visit_services as line
+      where line.visit_id = visit.id
+    ) as services on true
+    left join lateral (
+      select sum(
+        coalesce(nullif(line.qty, 0), 1) * coalesce(line.price_snap, 0)
+      ) as amount
+      from public.visit_stock as line
+      where line.visit_id = visit.id
+    ) as stock on true
+    left join lateral (
+      select sum(
+        case
+          when payment.transaction_type = 'payment'
+            then payment.amount
+          when payment.transaction_type = 'refund'
+            then -payment.amount
+          else 0
+        end
+      ) as amount
+      from public.finance_transactions as payment
+      where payment.org_id = visit.org_id
+        and payment.visit_id = visit.id
+        and payment.status = 'completed'
+    ) as payments on true
+    where visit.id = any(p_visit_ids)
+  ) as computed
+  on conflict (visit_id) do update
+  set
+    org_id = excluded.org_id,
+    patient_id = excluded.patient_id,
+    owner_id = excluded.owner_id,
+    visit_date = excluded.visit_date,
+    total = excluded.total,
+    paid = excluded.paid,
+    remaining = excluded.remaining,
+    financial_status = excluded.financial_status,
+    updated_at = excluded.updated_at
+  -- Unchanged settlements are not rewritten, so the client rollup below
+  -- only runs for visits whose numbers actually moved.
+  where (
+    settlement.org_id,
+    settlement.patient_id,
+    settlement.owner_id,
+    settlement.visit_date,
+    settlement.total,
+    settlement.paid,
+    settlement.financial_status
+  ) is distinct from (
+    excluded.org_id,
+    excluded.patient_id,
+    excluded.owner_id,
+    excluded.visit_date,
+    excluded.total,
+    excluded.paid,
+    excluded.financial_status
+  );
+end
+$function$;
+
+create or replace function public.refresh_client_settlements(
+  p_org_id uuid,
+  p_owner_ids uuid[]
+)
+returns void
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  -- Already held when called from a visit refresh of this clinic.
+  perform public.lock_clinic_settlements(p_org_id);
+
+  delete from public.client_settlements as client
+  where client.org_id = p_org_id
+    and client.owner_id = any(p_owner_ids)
+    and not exists (
+      select 1
+      from public.visit_settlements as settlement
+      where settlement.org_id = p_org_id
+        and settlement.owner_id = client.owner_id
+        and (settlement.total > 0 or settlement.paid > 0)
+    );
+
+  insert into public.client_settlements as client (
+    org_id,
+    owner_id,
+    billed,
+    paid,
+    remaining,
+    visits_count,
+    debt_visits_count,
+    patients_count,
+    last_visit_date,
+    updated_at
+  )
+  select
+    settlement.org_id,
+    settlement.owner_id,
+    sum(settlement.total),
+    sum(settlement.paid),
+    sum(settlement.remaining),
+    count(*),
+    count(*) filter (where settlement.remaining > 0),
+    count(distinct settlement.patient_id),
+    max(settlement.visit_date),
+    now()
+  from public.visit_settlements as settlement
+  where settlement.org_id = p_org_id
+    and settlement.owner_id = any(p_owner_ids)
+    and (settlement.total > 0 or settlement.paid > 0)
+  group by settlement.org_id, settlement.owner_id
+  on conflict (org_id, owner_id) do update
+  set
+    billed = excluded.billed,
+    paid = excluded.paid,
+    remaining = excluded.remaining,
+    visits_count = excluded.visits_count,
+    debt_visits_count = excluded.debt_visits_count,
+    patients_count = excluded.patients_count,
+    last_visit_date = excluded.last_visit_date,
+    updated_at = excluded.updated_at;
+end
+$function$;
+
+-- Full recomputation of one clinic: repairs settlements that drifted
+-- (rows written before the locking above, manual SQL with triggers
+-- disabled) and drops client rows left without visits.
+create or replace function public.reconcile_settlements(
+  p_org_id uuid
+)
+returns void
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  perform public.lock_clinic_settlements(p_org_id);
+
+  perform public.refresh_visit_settlements(
+    array(
+      select visit.id
+      from public.visits as visit
+      where visit.org_id = p_org_id
+      union
+      select settlement.visit_id
+      from public.visit_settlements as settlement
+      where settlement.org_id = p_org_id
+    )
+  );
+
+  perform public.refresh_client_settlements(
+    p_org_id,
+    array(
+      select settlement.owner_id
+      from public.visit_settlements as settlement
+      where settlement.org_id = p_org_id
+        and settlement.owner_id is not null
+      union
+      select client.owner_id
+      from public.client_settlements as client
+      where client.org_id = p_org_id
+    )
+  );
+end
+$function$;
+
+-- One transaction per clinic, so the nightly run never holds the locks
+-- of every clinic at once. No SET clause: a procedure with one cannot
+-- commit, so every name here is schema-qualified.
+create or replace procedure public.reconcile_all_settlements()
+language plpgsql
+security invoker
+as $procedure$
+declare
+  clinic_id uuid;
+begin
+  for clinic_id in
+    select distinct visit.org_id
+    from public.visits as visit
+    where visit.org_id is not null
+    order by visit.org_id
+  loop
+    perform public.reconcile_settlements(clinic_id);
+    commit;
+  end loop;
+end
+$procedure$;
+
+-- Statement-level: save_visit_lines replaces all lines of a visit in one
+-- delete and one insert, which refreshes the visit twice, not per line.
+create or replace function public.settle_visits_from_rows()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+declare
+  affected uuid[];
+begin
+  if tg_op = 'INSERT' then
+    select array_agg(distinct changed.visit_id::uuid)
+    into affected
+    from new_rows as changed
+    where changed.visit_id is not null;
+  elsif tg_op = 'UPDATE' then
+    select array_agg(distinct changed.visit_id::uuid)
+    into affected
+    from (
+      select visit_id from new_rows
+      union
+      select visit_id from old_rows
+    ) as changed
+    where changed.visit_id is not null;
+  else
+    select array_agg(distinct changed.visit_id::uuid)
+    into affected
+    from old_rows as changed
+    where changed.visit_id is not null;
+  end if;
+
+  perform public.refresh_visit_settlements(affected);
+  return null;
+end
+$function$;
+
+create or replace function public.settle_visit_from_visit()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  perform public.refresh_visit_settlements(array[new.id]);
+  return null;
+end
+$function$;
+
+create or replace function public.settle_visits_from_patient()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  perform public.refresh_visit_settlements(
+    array(
+      select visit.id
+      from public.visits as visit
+      where visit.org_id = new.org_id
+        and visit.pet_id = new.id
+    )
+  );
+  return null;
+end
+$function$;
+
+create or replace function public.settle_clients_from_visits()
+returns trigger
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+declare
+  changed record;
+begin
+  if tg_op in ('INSERT', 'UPDATE') then
+    for changed in
+      select changed_rows.org_id, array_agg(distinct changed_rows.owner_id) as owner_ids
+      from new_rows as changed_rows
+      where changed_rows.owner_id is not null
+      group by changed_rows.org_id
+    loop
+      perform public.refresh_client_settlements(
+        changed.org_id,
+        changed.owner_ids
+      );
+    end loop;
+  end if;
+
+  if tg_op in ('UPDATE', 'DELETE') then
+    for changed in
+      select changed_rows.org_id, array_agg(distinct changed_rows.owner_id) as owner_ids
+      from old_rows as changed_rows
+      where changed_rows.owner_id is not null
+      group by changed_rows.org_id
+    loop
+      perform public.refresh_client_settlements(
+        changed.org_id,
+        changed.owner_ids
+      );
+    end loop;
+  end if;
+
+  return null;
+end
+$function$;
+
+do $migration$
+declare
+  source_table text;
+  trigger_function text;
+begin
+  foreach source_table in array array[
+    'visit_services', 'visit_stock', 'finance_transactions',
+    'visit_settlements'
+  ] loop
+    trigger_function := case source_table
+      when 'visit_settlements' then 'settle_clients_from_visits'
+      else 'settle_visits_from_rows'
+    end;
+
+    execute format(
+      'drop trigger if exists settle_on_insert on public.%I',
+      source_table
+    );
+    execute format(
+      'create trigger settle_on_insert '
+      'after insert on public.%I '
+      'referencing new table as new_rows '
+      'for each statement execute function public.%I()',
+      source_table,
+      trigger_function
+    );
+
+    execute format(
+      'drop trigger if exists settle_on_update on public.%I',
+      source_table
+    );
+    execute format(
+      'create trigger settle_on_update '
+      'after update on public.%I '
+      'referencing new table as new_rows old table as old_rows '
+      'for each statement execute function public.%I()',
+      source_table,
+      trigger_function
+    );
+
+    execute format(
+      'drop trigger if exists settle_on_delete on public.%I',
+      source_table
+    );
+    execute format(
+      'create trigger settle_on_delete '
+      'after delete on public.%I '
+      'referencing old table as old_rows '
+      'for each statement execute function public.%I()',
+      source_table,
+      trigger_function
+    );
+  end loop;
+end
+$migration$;
+
+drop trigger if exists settle_visit on public.visits;
+create trigger settle_visit
+  after insert or update of pet_id, date, discount_amount, financial_status
+  on public.visits
+  for each row
+  execute function public.settle_visit_from_visit();
+
+drop trigger if exists settle_patient_visits on public.patients;
+create trigger settle_patient_visits
+  after update of owner_id
+  on public.patients
+  for each row
+  when (old.owner_id is distinct from new.owner_id)
+  execute function public.settle_visits_from_patient();
+
+-- Register views for PostgREST; id is the keyset tie-breaker used by the
+-- API pagers (owner_id / visit_id).
+create or replace view public.client_balance_register
+with (security_invoker = true)
+as
+select
+  client.owner_id as id,
+  client.org_id,
+  client.owner_id,
+  owner.name as owner_name,
+  owner.phone,
+  client.billed,
+  client.paid,
+  client.remaining,
+  client.visits_count,
+  client.debt_visits_count,
+  client.patients_count,
+  client.last_visit_date,
+  case when client.remaining > 0 then 'debt' else 'paid' end as status
+from public.client_settlements as client
+left join public.owners as owner
+  on owner.id = client.owner_id
+ and owner.org_id = client.org_id;
+
+create or replace view public.visit_settlement_register
+with (security_invoker = true)
+as
+select
+  settlement.visit_id as id,
+  settlement.org_id,
+  settlement.visit_id,
+  settlement.owner_id,
+  settlement.patient_id,
+  patient.name as patient_name,
+  patient.species,
+  settlement.visit_date as date,
+  visit.dx as diagnosis,
+  settlement.total,
+  settlement.paid,
+  settlement.remaining,
+  settlement.financial_status
+from public.visit_settlements as settlement
+join public.visits as visit
+  on visit.id = settlement.visit_id
+left join public.patients as patient
+  on patient.id = settlement.patient_id
+ and patient.org_id = settlement.org_id
+where settlement.patient_id is not null
+  and (settlement.total > 0 or settlement.paid > 0);
+
+create or replace function public.get_client_balance_summary(
+  p_org_id uuid
+)
+returns jsonb
+language sql
+stable
+security invoker
+set search_path = public, pg_temp
+as $function$
+  select jsonb_build_object(
+    'billed', coalesce(sum(client.billed), 0),
+    'paid', coalesce(sum(client.paid), 0),
+    'outstanding', coalesce(sum(client.remaining), 0),
+    'clients_count', count(*),
+    'debt_clients_count', count(*) filter (where client.remaining > 0),
+    'debt_visits_count', coalesce(sum(client.debt_visits_count), 0)
+  )
+  from public.client_settlements as client
+  where client.org_id = p_org_id;
+$function$;
+
+-- Backfill. The visit_settlements insert trigger fills client_settlements.
+select public.refresh_visit_settlements(array_agg(visit.id))
+from public.visits as visit;
+
+alter table public.visit_settlements enable row level security;
+alter table public.client_settlements enable row level security;
+
+revoke all privileges on table public.visit_settlements
+  from public, anon, authenticated;
+revoke all privileges on table public.client_settlements
+  from public, anon, authenticated;
+revoke all privileges on table public.client_balance_register
+  from public, anon, authenticated;
+revoke all privileges on table public.visit_settlement_register
+  from public, anon, authenticated;
+
+grant select, insert, update, delete on table public.visit_settlements
+  to service_role;
+grant select, insert, update, delete on table public.client_settlements
+  to service_role;
+grant select on table public.client_balance_register to service_role;
+grant select on table public.visit_settlement_register to service_role;
+
+revoke all privileges on function public.refresh_visit_settlements(uuid[])
+  from public, anon, authenticated;
+revoke all privileges on function public.refresh_client_settlements(uuid, uuid[])
+  from public, anon, authenticated;
+revoke all privileges on function public.settle_visits_from_rows()
+  from public, anon, authenticated;
+revoke all privileges on function public.settle_visit_from_visit()
+  from public, anon, authenticated;
+revoke all privileges on function public.settle_visits_from_patient()
+  from public, anon, authenticated;
+revoke all privileges on function public.settle_clients_from_visits()
+  from public, anon, authenticated;
+revoke all privileges on function public.get_client_balance_summary(uuid)
+  from public, anon, authenticated;
+
+revoke all privileges on function public.lock_clinic_settlements(uuid)
+  from public, anon, authenticated;
+revoke all privileges on function public.reconcile_settlements(uuid)
+  from public, anon, authenticated;
+revoke all privileges on procedure public.reconcile_all_settlements()
+  from public, anon, authenticated;
+
+grant execute on function public.refresh_visit_settlements(uuid[])
+  to service_role;
+grant execute on function public.reconcile_settlements(uuid)
+  to service_role;
+grant execute on function public.get_client_balance_summary(uuid)
+  to service_role;
+
+do $migration$
+declare
+  existing_job_id bigint;
+begin
+  select jobid
+    into existing_job_id
+  from cron.job
+  where jobname = 'reconcile-settlements'
+  limit 1;
+
+  if existing_job_id is not null then
+    perform cron.unschedule(existing_job_id);
+  end if;
+
+  perform cron.schedule(
+    'reconcile-settlements',
+    '50 2 * * *',
+    $cron$
+      call public.reconcile_all_settlements();
+    $cron$
+  );
+end
+$migration$;
+
+commit;
@@ -0,0 +1,60 @@
+-- Paged client balances (GET /api/finance/client-balances?status=debt&...)
+-- and lazy per-client visits (GET .../client-balances/<owner_id>/visits).
+--
+-- * client_balance_register gains the latest open visit of a debtor, so the
+--   finance dashboard can offer "accept payment" without loading visits;
+-- * the partial index serves both that lookup and the per-client open
+--   visits list.
+
+begin;
+
+create index if not exists visit_settlements_org_id_owner_id_open_date_idx
+  on public.visit_settlements (org_id, owner_id, visit_date desc)
+  where remaining > 0;
+
+create or replace view public.client_balance_register
+with (security_invoker = true)
+as
+select
+  client.owner_id as id,
+  client.org_id,
+  client.owner_id,
+  owner.name as owner_name,
+  owner.phone,
+  client.billed,
+  client.paid,
+  client.remaining,
+  client.visits_count,
+  client.debt_visits_count,
+  client.patients_count,
+  client.last_visit_date,
+  case when client.remaining > 0 then 'debt' else 'paid' end as status,
+  open_visit.visit_id as open_visit_id,
+  open_visit.patient_name as open_visit_patient_name,
+  open_visit.visit_date as open_visit_date
+from public.client_settlements as client
+left join public.owners as owner
+  on owner.id = client.owner_id
+ and owner.org_id = client.org_id
+left join lateral (
+  select
+    settlement.visit_id,
+    patient.name as patient_name,
+    settlement.visit_date
+  from public.visit_settlements as settlement
+  left join public.patients as patient
+    on patient.id = settlement.patient_id
+   and patient.org_id = settlement.org_id
+  where client.remaining > 0
+    and settlement.org_id = client.org_id
+    and settlement.owner_id = client.owner_id
+    and settlement.remaining > 0
+  order by settlement.visit_date desc nulls last
+  limit 1
+) as open_visit on true;
+
+revoke all privileges on table public.client_balance_register
+  from public, anon, authenticated;
+grant select on table public.client_balance_register to service_role;
+
+commit;
@@ -0,0 +1,5 @@
+-- Single-owner balance: GET /api/finance/client-balances/<owner_id>.
+-- Schemas without visit_settlements resolve the owner's patients first
+-- and then their visits through visits_org_id_pet_id_idx.
+create index if not exists patients_org_id_owner_id_idx
+  on public.patients (org_id, owner_id);
@@ -0,0 +1,479 @@
+-- Live staff rating: creating, editing, completing or deleting a visit (and
+-- adding or removing its lines) moves that visit's contribution in the
+-- doctor's staff_rating_snapshots row for the visit's season, instead of
+-- waiting for a full rebuild.
+--
+-- * staff_rating_contributions remembers what every visit last added
+--   (season, doctor, revenue), so a repeated call applies no delta and a
+--   changed doctor or date moves the visit between snapshot rows; a visit
+--   that no longer counts keeps a row without season/doctor (tombstone), so
+--   a concurrent rebuild can tell it was withdrawn;
+-- * apply_staff_rating_contribution() swaps a visit's old contribution for
+--   the new one in one transaction;
+-- * replace_staff_rating_season() is the write of the full rebuild. Under
+--   the clinic lock it keeps contributions written by deltas after the
+--   rebuild started (p_started_at), replaces the rest and sums the season's
+--   snapshots from the contributions, so a delta that raced the rebuild is
+--   not lost;
+-- * rank is no longer maintained per delta, GET /api/staff/rating orders by
+--   score;
+-- * the staff-rating-reconcile cron job runs the full rebuild as a nightly
+--   consistency check (POST /api/internal/staff-rating/reconcile, dispatcher
+--   token of the automatic owner reports). Every call rebuilds a bounded
+--   batch of clinics not yet reconciled that night
+--   (staff_rating_reconciliations), so the job is repeated every few minutes
+--   during the night window.
+
+begin;
+
+do $migration$
+begin
+  if to_regclass('public.staff_rating_snapshots') is null
+     or to_regclass('public.staff') is null then
+    raise exception using
+      errcode = '55000',
+      message = 'Staff rating deltas require staff and staff_rating_snapshots';
+  end if;
+end
+$migration$;
+
+create table if not exists public.staff_rating_contributions (
+  visit_id uuid primary key,
+  org_id uuid not null,
+  season_key text,
+  staff_id uuid,
+  revenue numeric(14, 2) not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+-- Tombstones have neither season nor doctor.
+alter table public.staff_rating_contributions
+  alter column season_key drop not null,
+  alter column staff_id drop not null;
+
+create table if not exists public.staff_rating_reconciliations (
+  org_id uuid primary key,
+  season_key text not null,
+  reconciled_at timestamptz not null default now()
+);
+
+create index if not exists staff_rating_contributions_org_id_season_key_idx
+  on public.staff_rating_contributions (org_id, season_key);
+
+create index if not exists staff_rating_snapshots_org_id_season_key_score_idx
+  on public.staff_rating_snapshots (org_id, season_key, score desc);
+
+-- Same formula as staff_rating_metrics() in server.py.
+create or replace function public.apply_staff_rating_delta(
+  p_org_id uuid,
+  p_season_key text,
+  p_staff_id uuid,
+  p_visits integer,
+  p_revenue numeric
+)
+returns void
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  if p_staff_id is null or p_season_key is null then
+    return;
+  end if;
+
+  -- First visit of the season: the row is created for known staff only,
+  -- like the full rebuild does.
+  insert into public.staff_rating_snapshots (
+    org_id,
+    season_key,
+    staff_id,
+    staff_name,
+    avatar,
+    score,
+    visits_count,
+    revenue,
+    avg_check,
+    xp,
+    rank,
+    updated_at
+  )
+  select
+    p_org_id,
+    p_season_key,
+    staff.id,
+    coalesce(to_jsonb(staff) ->> 'name', 'Працівник'),
+    coalesce(to_jsonb(staff) ->> 'avatar', ''),
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    now()
+  from public.staff as staff
+  where staff.org_id = p_org_id
+    and staff.id = p_staff_id
+  on conflict (org_id, season_key, staff_id) do nothing;
+
+  update public.staff_rating_snapshots
+  set
+    visits_count = greatest(coalesce(visits_count, 0) + p_visits, 0),
+    revenue = greatest(round(coalesce(revenue, 0) + p_revenue), 0),
+    updated_at = now()
+  where org_id = p_org_id
+    and season_key = p_season_key
+    and staff_id = p_staff_id;
+
+  update public.staff_rating_snapshots
+  set
+    avg_check = case
+      when visits_count > 0 then round(revenue / visits_count)
+      else 0
+    end,
+    xp = visits_count * 10
+  where org_id = p_org_id
+    and season_key = p_season_key
+    and staff_id = p_staff_id;
+
+  update public.staff_rating_snapshots
+  set score = round(
+    visits_count * 25
+    + revenue * 0.01
+    + avg_check * 0.05
+    + xp
+  )
+  where org_id = p_org_id
+    and season_key = p_season_key
+    and staff_id = p_staff_id;
+end;
+$function$;
+
+create or replace function public.apply_staff_rating_contribution(
+  p_org_id uuid,
+  p_visit_id uuid,
+  p_season_key text,
+  p_staff_id uuid,
+  p_revenue numeric
+)
+returns void
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+declare
+  previous public.staff_rating_contributions%rowtype;
+  next_revenue numeric := round(coalesce(p_revenue, 0));
+begin
+  -- Serialises with replace_staff_rating_season() of the same clinic.
+  perform pg_advisory_xact_lock(
+    hashtext('staff_rating:' || p_org_id::text)
+  );
+
+  select *
+    into previous
+  from public.staff_rating_contributions
+  where visit_id = p_visit_id
+    and org_id = p_org_id
+  for update;
+
+  if found then
+    if previous.season_key is not distinct from p_season_key
+       and previous.staff_id is not distinct from p_staff_id
+       and previous.revenue = next_revenue then
+      return;
+    end if;
+
+    perform public.apply_staff_rating_delta(
+      p_org_id,
+      previous.season_key,
+      previous.staff_id,
+      -1,
+      -previous.revenue
+    );
+  end if;
+
+  if p_staff_id is null or p_season_key is null then
+    -- Tombstone: a rebuild that read the visit earlier keeps it withdrawn.
+    insert into public.staff_rating_contributions (
+      visit_id,
+      org_id,
+      season_key,
+      staff_id,
+      revenue,
+      updated_at
+    ) values (
+      p_visit_id,
+      p_org_id,
+      null,
+      null,
+      0,
+      now()
+    )
+    on conflict (visit_id) do update
+      set season_key = null,
+          staff_id = null,
+          revenue = 0,
+          updated_at = excluded.updated_at;
+
+    return;
+  end if;
+
+  insert into public.staff_rating_contributions (
+    visit_id,
+    org_id,
+    season_key,
+    staff_id,
+    revenue,
+    updated_at
+  ) values (
+    p_visit_id,
+    p_org_id,
+    p_season_key,
+    p_staff_id,
+    next_revenue,
+    now()
+  )
+  on conflict (visit_id) do update
+    set season_key = excluded.season_key,
+        staff_id = excluded.staff_id,
+        revenue = excluded.revenue,
+        updated_at = excluded.updated_at;
+
+  perform public.apply_staff_rating_delta(
+    p_org_id,
+    p_season_key,
+    p_staff_id,
+    1,
+    next_revenue
+  );
+end;
+$function$;
+
+drop function if exists public.replace_staff_rating_season(
+  uuid, text, jsonb, jsonb
+);
+
+-- Same formula as staff_rating_metrics() in server.py.
+create or replace function public.replace_staff_rating_season(
+  p_org_id uuid,
+  p_season_key text,
+  p_started_at timestamptz,
+  p_staff jsonb,
+  p_contributions jsonb
+)
+returns void
+language plpgsql
+security invoker
+set search_path = public, pg_temp
+as $function$
+begin
+  perform pg_advisory_xact_lock(
+    hashtext('staff_rating:' || p_org_id::text)
+  );
+
+  -- Rows a delta wrote after the rebuild started are newer than what the
+  -- rebuild read: they are neither deleted nor overwritten.
+  delete from public.staff_rating_contributions as contribution
+  where contribution.org_id = p_org_id
+    and (
+      contribution.season_key = p_season_key
+      or contribution.staff_id is null
+    )
+    and contribution.updated_at < p_started_at
+    and not exists (
+      select 1
+      from jsonb_to_recordset(coalesce(p_contributions, '[]'::jsonb))
+        as item (visit_id uuid)
+      where item.visit_id = contribution.visit_id
+    );
+
+  insert into public.staff_rating_contributions as contribution (
+    visit_id,
+    org_id,
+    season_key,
+    staff_id,
+    revenue,
+    updated_at
+  )
+  select
+    item.visit_id,
+    p_org_id,
+    p_season_key,
+    item.staff_id,
+    round(coalesce(item.revenue, 0)),
+    now()
+  from jsonb_to_recordset(coalesce(p_contributions, '[]'::jsonb)) as item (
+    visit_id uuid,
+    staff_id uuid,
+    revenue numeric
+  )
+  where item.visit_id is not null
+    and item.staff_id is not null
+  on conflict (visit_id) do update
+    set season_key = excluded.season_key,
+        staff_id = excluded.staff_id,
+        revenue = excluded.revenue,
+        updated_at = excluded.updated_at
+  where contribution.org_id = p_org_id
+    and contribution.updated_at < p_started_at;
+
+  insert into public.staff_rating_snapshots as snapshot (
+    org_id,
+    season_key,
+    staff_id,
+    staff_name,
+    avatar,
+    score,
+    visits_count,
+    revenue,
+    avg_check,
+    xp,
+    rank,
+    updated_at
+  )
+  select
+    p_org_id,
+    p_season_key,
+    scored.staff_id,
+    scored.staff_name,
+    scored.avatar,
+    scored.score,
+    scored.visits_count,
+    scored.revenue,
+    scored.avg_check,
+    scored.xp,
+    row_number() over (
+      order by scored.score desc, scored.staff_id
+    ),
+    now()
+  from (
+    select
+      metrics.*,
+      round(
+        metrics.visits_count * 25
+        + metrics.revenue * 0.01
+        + metrics.avg_check * 0.05
+        + metrics.xp
+      ) as score
+    from (
+      select
+        roster.staff_id,
+        coalesce(roster.staff_name, 'Працівник') as staff_name,
+        coalesce(roster.avatar, '') as avatar,
+        coalesce(totals.visits_count, 0) as visits_count,
+        coalesce(totals.revenue, 0) as revenue,
+        case
+          when coalesce(totals.visits_count, 0) > 0
+            then round(totals.revenue / totals.visits_count)
+          else 0
+        end as avg_check,
+        coalesce(totals.visits_count, 0) * 10 as xp
+      from jsonb_to_recordset(coalesce(p_staff, '[]'::jsonb)) as roster (
+        staff_id uuid,
+        staff_name text,
+        avatar text
+      )
+      left join (
+        select
+          contribution.staff_id,
+          count(*)::integer as visits_count,
+          round(sum(contribution.revenue)) as revenue
+        from public.staff_rating_contributions as contribution
+        where contribution.org_id = p_org_id
+          and contribution.season_key = p_season_key
+        group by contribution.staff_id
+      ) as totals
+        on totals.staff_id = roster.staff_id
+      where roster.staff_id is not null
+    ) as metrics
+  ) as scored
+  on conflict (org_id, season_key, staff_id) do update
+    set staff_name = excluded.staff_name,
+        avatar = excluded.avatar,
+        score = excluded.score,
+        visits_count = excluded.visits_count,
+        revenue = excluded.revenue,
+        avg_check = excluded.avg_check,
+        xp = excluded.xp,
+        rank = excluded.rank,
+        updated_at = excluded.updated_at;
+end;
+$function$;
+
+alter table public.staff_rating_contributions enable row level security;
+alter table public.staff_rating_reconciliations enable row level security;
+
+revoke all privileges on table public.staff_rating_contributions
+  from public, anon, authenticated;
+revoke all privileges on table public.staff_rating_reconciliations
+  from public, anon, authenticated;
+
+grant select, insert, update, delete
+  on table public.staff_rating_contributions
+  to service_role;
+grant select, insert, update
+  on table public.staff_rating_reconciliations
+  to service_role;
+
+revoke all privileges on function
+  public.apply_staff_rating_delta(uuid, text, uuid, integer, numeric)
+  from public, anon, authenticated;
+revoke all privileges on function
+  public.apply_staff_rating_contribution(uuid, uuid, text, uuid, numeric)
+  from public, anon, authenticated;
+revoke all privileges on function
+  public.replace_staff_rating_season(
+    uuid, text, timestamptz, jsonb, jsonb
+  )
+  from public, anon, authenticated;
+
+grant execute on function
+  public.apply_staff_rating_contribution(uuid, uuid, text, uuid, numeric)
+  to service_role;
+grant execute on function
+  public.replace_staff_rating_season(
+    uuid, text, timestamptz, jsonb, jsonb
+  )
+  to service_role;
+
+do $migration$
+declare
+  existing_job_id bigint;
+begin
+  select jobid
+    into existing_job_id
+  from cron.job
+  where jobname = 'staff-rating-reconcile'
+  limit 1;
+
+  if existing_job_id is not null then
+    perform cron.unschedule(existing_job_id);
+  end if;
+
+  perform cron.schedule(
+    'staff-rating-reconcile',
+    '*/5 1-3 * * *',
+    $cron$
+      select net.http_post(
+        url := 'https://docpug-crm.onrender.com/api/internal/staff-rating/reconcile',
+        headers := jsonb_build_object(
+          'Content-Type', 'application/json',
+          'Authorization', 'Bearer ' || (
+            select decrypted_secret
+            from vault.decrypted_secrets
+            where name = 'owner_daily_report_dispatch_token'
+            limit 1
+          )
+        ),
+        body := jsonb_build_object('source', 'supabase-cron'),
+        timeout_milliseconds := 60000
+      );
+    $cron$
+  );
+end
+$migration$;
+
+comment on table public.staff_rating_contributions is
+  'Last contribution of each visit to staff_rating_snapshots.';
+
+commit;
@@ -0,0 +1,87 @@
+-- Shared event log for /api/events/stream.
+--
+-- * mutation requests (visits, tasks, hospital tasks, calendar) append a row
+--   after the response is sent; every web worker relays new rows to the
+--   streams of its own tabs, so a change made on one worker reaches tabs
+--   connected to any other worker within about a second;
+-- * staff_ids addresses task events to the assignee; an empty array means
+--   the whole clinic;
+-- * the bigint id is the SSE event id: a reconnecting tab sends it back as
+--   Last-Event-ID and receives the rows it missed;
+-- * rows are only needed for reconnect catch-up, the prune-app-events cron
+--   job drops them after a day.
+
+begin;
+
+create table if not exists public.app_events (
+  id bigint generated always as identity primary key,
+  org_id uuid not null,
+  event_type text not null,
+  staff_ids text[] not null default '{}',
+  data jsonb not null default '{}'::jsonb,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists app_events_org_id_id_idx
+  on public.app_events (org_id, id);
+
+create index if not exists app_events_created_at_idx
+  on public.app_events (created_at);
+
+create or replace function public.prune_app_events(
+  p_older_than interval default interval '1 day'
+)
+returns integer
+language sql
+security invoker
+set search_path = public, pg_temp
+as $function$
+  with removed as (
+    delete from public.app_events
+    where created_at < now() - p_older_than
+    returning 1
+  )
+  select count(*)::integer from removed;
+$function$;
+
+alter table public.app_events enable row level security;
+
+revoke all privileges on table public.app_events
+  from public, anon, authenticated, service_role;
+
+grant select, insert, delete on table public.app_events
+  to service_role;
+
+revoke all privileges on function public.prune_app_events(interval)
+  from public, anon, authenticated;
+grant execute on function public.prune_app_events(interval)
+  to service_role;
+
+do $migration$
+declare
+  existing_job_id bigint;
+begin
+  select jobid
+    into existing_job_id
+  from cron.job
+  where jobname = 'prune-app-events'
+  limit 1;
+
+  if existing_job_id is not null then
+    perform cron.unschedule(existing_job_id);
+  end if;
+
+  perform cron.schedule(
+    'prune-app-events',
+    '15 * * * *',
+    $cron$
+      select public.prune_app_events(interval '1 day');
+    $cron$
+  );
+end
+$migration$;
+
+comment on table public.app_events is
+  'Cross-worker event log behind /api/events/stream.';
+
+commit;
@@ -0,0 +1,148 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "11111111-1111-4111-8111-111111111111"
+USER_ID = "22222222-2222-4222-8222-222222222222"
+
+
+class BatchApiTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin({
+            "stock": [
+                {"id": "stock-1", "org_id": ORG_ID, "name": "Бинт"},
+            ],
+            "stock_movements": [],
+            "services": [
+                {
+                    "id": "service-1",
+                    "org_id": ORG_ID,
+                    "name": "Огляд",
+                    "price": 500,
+                    "active": True,
+                },
+            ],
+            "specializations": [],
+        })
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+        self.user_loads = 0
+
+    def load_user(self):
+        self.user_loads += 1
+
+        return {
+            "id": USER_ID,
+            "org_id": ORG_ID,
+            "role": "owner",
+            "is_active": True,
+        }
+
+    def batch(self, payload):
+        def cached_user():
+            if not server.g.get("batch_test_user"):
+                server.g.batch_test_user = self.load_user()
+
+            return server.g.batch_test_user
+
+        with (
+            patch.object(server, "get_current_user", cached_user),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.post(
+                "/api/batch",
+                json=payload,
+            )
+
+    def test_sub_requests_share_auth_and_return_own_status(self):
+        response = self.batch({
+            "requests": [
+                {"id": "stock", "path": "/api/stock"},
+                "/api/services",
+                {"id": "missing", "path": "/api/not-a-route"},
+            ],
+        })
+
+        self.assertEqual(response.status_code, 200)
+
+        items = response.get_json()["data"]["responses"]
+
+        self.assertEqual(
+            [item["id"] for item in items],
+            ["stock", 1, "missing"],
+        )
+        self.assertEqual(
+            [item["status"] for item in items],
+            [200, 200, 404],
+        )
+        self.assertEqual(
+            items[0]["body"]["data"][0]["name"],
+            "Бинт",
+        )
+        self.assertEqual(
+            items[1]["body"]["data"][0]["name"],
+            "Огляд",
+        )
+        self.assertEqual(self.user_loads, 1)
+
+    def test_query_string_reaches_sub_request(self):
+        response = self.batch([
+            "/api/patients?fields=password_hash",
+        ])
+
+        item = response.get_json()["data"]["responses"][0]
+
+        self.assertEqual(item["status"], 400)
+        self.assertEqual(
+            item["body"]["error"],
+            "Unknown field: password_hash",
+        )
+
+    def test_only_api_get_requests_are_accepted(self):
+        for payload in (
+            {"requests": []},
+            {"requests": [{"path": "/api/stock", "method": "POST"}]},
+            {"requests": ["/index.html"]},
+            {"requests": ["/api/batch"]},
+            {"requests": ["/api/stock"] * (server.BATCH_MAX_REQUESTS + 1)},
+        ):
+            with self.subTest(payload=str(payload)[:60]):
+                response = self.batch(payload)
+                self.assertEqual(response.status_code, 400)
+
+    def test_post_only_route_is_not_dispatched(self):
+        response = self.batch(["/api/login"])
+        item = response.get_json()["data"]["responses"][0]
+
+        self.assertEqual(item["status"], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
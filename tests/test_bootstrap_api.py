@@ -0,0 +1,170 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "11111111-1111-4111-8111-111111111111"
+USER_ID = "22222222-2222-4222-8222-222222222222"
+
+SECTIONS = [
+    "/api/session",
+    "/api/organization/profile",
+    "/api/subscription",
+    "/api/staff",
+    "/api/services",
+    "/api/specializations",
+    "/api/appointment-templates",
+    "/api/reports/settings",
+]
+
+
+def clinic_rows():
+    return {
+        "orgs": [{"id": ORG_ID, "name": "Doc.PUG", "theme": "purple"}],
+        "clinic_subscriptions": [{
+            "org_id": ORG_ID,
+            "status": "active",
+            "access_ends_on": "2099-01-01",
+        }],
+        "staff": [{
+            "id": "staff-1",
+            "org_id": ORG_ID,
+            "name": "Лікар",
+            "is_active": True,
+        }],
+        "services": [{
+            "id": "service-1",
+            "org_id": ORG_ID,
+            "name": "Огляд",
+            "price": 500,
+            "active": True,
+        }],
+        "specializations": [{
+            "id": "spec-1",
+            "org_id": ORG_ID,
+            "name": "Терапія",
+            "is_active": True,
+        }],
+        "appointment_templates": [{
+            "id": "template-1",
+            "org_id": ORG_ID,
+            "name": "Огляд",
+            "duration_min": 45,
+            "sort_order": 10,
+        }],
+        "clinic_report_settings": [],
+    }
+
+
+class BootstrapApiTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(clinic_rows())
+
+    def bootstrap(self, role="owner"):
+        with self.client.session_transaction(
+            base_url="https://localhost",
+        ) as session:
+            session["user_id"] = USER_ID
+            session["org_id"] = ORG_ID
+            session["role"] = role
+            session["username"] = "doctor"
+
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": USER_ID,
+                    "org_id": ORG_ID,
+                    "staff_id": "staff-1",
+                    "role": role,
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(
+                "/api/bootstrap",
+                base_url="https://localhost",
+            )
+
+    def test_bootstrap_returns_every_startup_section(self):
+        response = self.bootstrap()
+        payload = response.get_json()["data"]
+        sections = payload["sections"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(payload["version"], server.BOOTSTRAP_VERSION)
+        self.assertEqual(sorted(sections), sorted(SECTIONS))
+
+        for path in SECTIONS:
+            self.assertEqual(sections[path]["status"], 200, path)
+
+        self.assertEqual(
+            sections["/api/session"]["body"]["data"]["clinic_name"],
+            "Doc.PUG",
+        )
+        self.assertEqual(
+            sections["/api/services"]["body"]["data"][0]["name"],
+            "Огляд",
+        )
+        self.assertEqual(
+            sections["/api/subscription"]["body"]["data"]["status"],
+            "active",
+        )
+
+    def test_sections_keep_their_own_access_rules(self):
+        sections = self.bootstrap(role="vet").get_json()["data"]["sections"]
+
+        self.assertEqual(
+            sections["/api/reports/settings"]["status"],
+            403,
+        )
+        self.assertEqual(sections["/api/staff"]["status"], 200)
+
+    def test_failing_section_does_not_break_bootstrap(self):
+        def broken_view():
+            raise RuntimeError("boom")
+
+        with patch.object(server, "api_services_list", broken_view):
+            response = self.bootstrap()
+
+        sections = response.get_json()["data"]["sections"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sections["/api/services"]["status"], 500)
+        self.assertEqual(sections["/api/staff"]["status"], 200)
+
+    def test_bootstrap_requires_session(self):
+        with patch.object(server, "get_current_user", return_value=None):
+            response = self.client.get("/api/bootstrap")
+
+        self.assertEqual(response.status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
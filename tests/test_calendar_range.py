@@ -0,0 +1,191 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def event(event_id, event_date, staff_id, start, end, status="planned"):
+    return {
+        "id": event_id,
+        "org_id": ORG_ID,
+        "event_date": event_date,
+        "staff_id": staff_id,
+        "start_time": start,
+        "end_time": end,
+        "status": status,
+        "title": "Прийом",
+    }
+
+
+def calendar_rows():
+    return {
+        "calendar_events": [
+            event("e1", "2026-09-30", "staff-1", "09:00", "10:00"),
+            event("e2", "2026-10-01", "staff-1", "09:00", "09:30"),
+            event("e3", "2026-10-01", "staff-1", "10:00", "11:00"),
+            event("e4", "2026-10-01", "staff-2", "12:00", "12:45"),
+            event("e5", "2026-10-01", "staff-2", "13:00", "14:00", "cancelled"),
+            event("e6", "2026-10-31", "staff-2", "16:00", "16:20:00"),
+            event("e7", "2026-11-01", "staff-1", "09:00", "10:00"),
+            {
+                **event("e8", "2026-10-01", "staff-1", "09:00", "10:00"),
+                "org_id": "org-2",
+            },
+        ],
+    }
+
+
+class CalendarRangeTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(calendar_rows())
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path, query_string=None):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(
+                path,
+                query_string=query_string,
+            )
+
+    def test_range_limits_events(self):
+        response = self.get(
+            "/api/calendar",
+            {"from": "2026-10-01", "to": "2026-10-31"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["id"] for row in response.get_json()["data"]],
+            ["e2", "e3", "e4", "e5", "e6"],
+        )
+
+    def test_without_range_every_event_is_returned(self):
+        data = self.get("/api/calendar").get_json()["data"]
+
+        self.assertEqual(len(data), 7)
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in (
+            {"from": "01.10.2026"},
+            {"from": "2026-10-02", "to": "2026-10-01"},
+            {"from": "2026-01-01", "to": "2026-12-31"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(
+                    self.get("/api/calendar", params).status_code,
+                    400,
+                )
+
+    def test_month_occupancy_counts_per_day_and_staff(self):
+        response = self.get(
+            "/api/calendar/occupancy",
+            {"month": "2026-10"},
+        )
+        data = response.get_json()["data"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["from"], "2026-10-01")
+        self.assertEqual(data["to"], "2026-10-31")
+        self.assertEqual(
+            data["days"],
+            [
+                {
+                    "date": "2026-10-01",
+                    "events": 3,
+                    "busy_minutes": 135,
+                    "staff": [
+                        {
+                            "staff_id": "staff-1",
+                            "events": 2,
+                            "busy_minutes": 90,
+                        },
+                        {
+                            "staff_id": "staff-2",
+                            "events": 1,
+                            "busy_minutes": 45,
+                        },
+                    ],
+                },
+                {
+                    "date": "2026-10-31",
+                    "events": 1,
+                    "busy_minutes": 20,
+                    "staff": [
+                        {
+                            "staff_id": "staff-2",
+                            "events": 1,
+                            "busy_minutes": 20,
+                        },
+                    ],
+                },
+            ],
+        )
+
+    def test_occupancy_does_not_ship_event_rows(self):
+        self.get(
+            "/api/calendar/occupancy",
+            {"from": "2026-09-28", "to": "2026-11-08"},
+        )
+
+        self.assertEqual(
+            self.standin.call_counts()["select calendar_events"],
+            1,
+        )
+
+    def test_occupancy_requires_bounded_range(self):
+        for params in (
+            {},
+            {"from": "2026-10-01"},
+            {"from": "2026-01-01", "to": "2026-06-01"},
+            {"month": "2026-13"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(
+                    self.get("/api/calendar/occupancy", params).status_code,
+                    400,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
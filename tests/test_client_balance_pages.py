@@ -0,0 +1,395 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def client_row(owner_id, name, billed, paid, phone="+380 67 000 00 00"):
+    return {
+        "id": owner_id,
+        "org_id": ORG_ID,
+        "owner_id": owner_id,
+        "owner_name": name,
+        "phone": phone,
+        "billed": billed,
+        "paid": paid,
+        "remaining": billed - paid,
+        "visits_count": 2,
+        "debt_visits_count": 1 if billed > paid else 0,
+        "patients_count": 1,
+        "last_visit_date": "2026-10-01",
+        "status": "debt" if billed > paid else "paid",
+        "open_visit_id": f"visit-{owner_id}" if billed > paid else None,
+        "open_visit_patient_name": "Жужа" if billed > paid else None,
+        "open_visit_date": "2026-10-01" if billed > paid else None,
+    }
+
+
+def visit_row(visit_id, owner_id, date, total, paid):
+    return {
+        "id": visit_id,
+        "org_id": ORG_ID,
+        "visit_id": visit_id,
+        "owner_id": owner_id,
+        "patient_id": f"pet-{owner_id}",
+        "patient_name": "Жужа",
+        "species": "dog",
+        "date": date,
+        "diagnosis": "Огляд",
+        "total": total,
+        "paid": paid,
+        "remaining": total - paid,
+        "financial_status": "paid" if paid >= total else "unpaid",
+    }
+
+
+def settlement_rows():
+    clients = [
+        client_row("owner-1", "Валерій", 450, 300),
+        client_row("owner-2", "Олена", 200, 200),
+        client_row("owner-3", "Ігор", 900, 0, phone="+380 50 123 45 67"),
+        client_row("owner-4", "Марія", 300, 0),
+        client_row("owner-5", "Тарас", 120, 0),
+        {
+            **client_row("owner-x", "Чужий", 5000, 0),
+            "org_id": "org-2",
+        },
+    ]
+
+    return {
+        "client_settlements": [
+            {"org_id": row["org_id"], "owner_id": row["owner_id"]}
+            for row in clients
+        ],
+        "client_balance_register": clients,
+        "visit_settlement_register": [
+            visit_row("visit-1", "owner-1", "2026-09-01", 250, 100),
+            visit_row("visit-2", "owner-1", "2026-10-01", 200, 200),
+            visit_row("visit-3", "owner-3", "2026-08-01", 500, 0),
+        ],
+        "owners": [
+            {"id": "owner-9", "org_id": ORG_ID, "name": "Нова", "phone": "9"},
+        ],
+    }
+
+
+def legacy_rows():
+    return {
+        "owners": [
+            {"id": "owner-1", "org_id": ORG_ID, "name": "Валерій", "phone": "1"},
+            {"id": "owner-2", "org_id": ORG_ID, "name": "Олена", "phone": "2"},
+        ],
+        "patients": [
+            {
+                "id": "pet-1",
+                "org_id": ORG_ID,
+                "owner_id": "owner-1",
+                "name": "Жужа",
+                "species": "dog",
+            },
+            {
+                "id": "pet-2",
+                "org_id": ORG_ID,
+                "owner_id": "owner-2",
+                "name": "Мурка",
+                "species": "cat",
+            },
+        ],
+        "visits": [
+            {
+                "id": "visit-1",
+                "org_id": ORG_ID,
+                "pet_id": "pet-1",
+                "date": "2026-09-01",
+                "dx": "Огляд",
+                "discount_amount": 0,
+                "financial_status": "unpaid",
+            },
+            {
+                "id": "visit-2",
+                "org_id": ORG_ID,
+                "pet_id": "pet-1",
+                "date": "2026-10-01",
+                "dx": "Щеплення",
+                "discount_amount": 0,
+                "financial_status": "paid",
+            },
+            {
+                "id": "visit-3",
+                "org_id": ORG_ID,
+                "pet_id": "pet-2",
+                "date": "2026-10-02",
+                "dx": "Огляд",
+                "discount_amount": 0,
+                "financial_status": "paid",
+            },
+        ],
+        "visit_services": [
+            {
+                "id": f"vs-{index}",
+                "visit_id": f"visit-{index}",
+                "qty": 1,
+                "price_snap": 200,
+            }
+            for index in (1, 2, 3)
+        ],
+        "visit_stock": [
+            {
+                "id": "vst-1",
+                "visit_id": "visit-1",
+                "qty": 1,
+                "price_snap": 0,
+            },
+        ],
+        "finance_transactions": [
+            {
+                "id": f"tx-{index}",
+                "org_id": ORG_ID,
+                "visit_id": f"visit-{index}",
+                "transaction_type": "payment",
+                "status": "completed",
+                "amount": 200,
+                "occurred_at": "2026-10-02T10:00:00Z",
+            }
+            for index in (2, 3)
+        ],
+    }
+
+
+class ClientBalancePagesTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(settlement_rows())
+        self.standin.rpc_handlers["get_client_balance_summary"] = (
+            lambda _client, params: {
+                "billed": 1970,
+                "paid": 500,
+                "outstanding": 1470,
+                "clients_count": 5,
+                "debt_clients_count": 4,
+                "debt_visits_count": 4,
+            }
+        )
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path, query_string=None):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+            patch.object(server.time, "sleep"),
+        ):
+            return self.client.get(
+                path,
+                query_string=query_string,
+            )
+
+    def walk(self, params):
+        owners = []
+        cursor = None
+        pages = []
+
+        while True:
+            query = dict(params)
+
+            if cursor:
+                query["cursor"] = cursor
+
+            response = self.get("/api/finance/client-balances", query)
+            self.assertEqual(response.status_code, 200)
+
+            data = response.get_json()["data"]
+            pages.append(data)
+            owners.extend(row["owner_id"] for row in data["rows"])
+            cursor = data["next_cursor"]
+
+            if not cursor:
+                return owners, pages
+
+    def test_debt_pages_walk_largest_first_without_visits(self):
+        owners, pages = self.walk({"status": "debt", "limit": 2})
+
+        self.assertEqual(
+            owners,
+            ["owner-3", "owner-4", "owner-1", "owner-5"],
+        )
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(pages[0]["total"], 4)
+        self.assertEqual(pages[0]["summary"]["outstanding"], 1470)
+        self.assertNotIn("summary", pages[1])
+
+        first = pages[0]["rows"][0]
+
+        self.assertNotIn("visits", first)
+        self.assertEqual(first["open_visit"]["visit_id"], "visit-owner-3")
+
+        counts = self.standin.call_counts()
+
+        self.assertNotIn("select visit_settlement_register", counts)
+        self.assertNotIn("select visits", counts)
+
+    def test_status_min_remaining_and_search_combine(self):
+        owners, _pages = self.walk({
+            "status": "debt",
+            "min_remaining": 150,
+        })
+
+        self.assertEqual(owners, ["owner-3", "owner-4", "owner-1"])
+
+        owners, _pages = self.walk({"status": "paid"})
+
+        self.assertEqual(owners, ["owner-2"])
+
+        owners, _pages = self.walk({"q": "123 45"})
+
+        self.assertEqual(owners, ["owner-3"])
+
+    def test_owner_visits_are_loaded_on_demand(self):
+        path = "/api/finance/client-balances/owner-1/visits"
+
+        all_visits = self.get(path).get_json()["data"]
+        open_visits = self.get(
+            path,
+            {"status": "open"},
+        ).get_json()["data"]
+
+        self.assertEqual(
+            [visit["visit_id"] for visit in all_visits],
+            ["visit-2", "visit-1"],
+        )
+        self.assertEqual(
+            [visit["visit_id"] for visit in open_visits],
+            ["visit-1"],
+        )
+        self.assertEqual(open_visits[0]["remaining"], 150)
+
+    def test_invalid_parameters_are_rejected(self):
+        for path, params in (
+            ("/api/finance/client-balances", {"status": "late"}),
+            ("/api/finance/client-balances", {"min_remaining": "abc"}),
+            ("/api/finance/client-balances", {"sort": "phone"}),
+            ("/api/finance/client-balances/owner-1/visits", {"status": "x"}),
+        ):
+            with self.subTest(path=path, params=params):
+                self.assertEqual(
+                    self.get(path, params).status_code,
+                    400,
+                )
+
+    def test_single_owner_balance_reads_only_that_owner(self):
+        response = self.get("/api/finance/client-balances/owner-1")
+        data = response.get_json()["data"]
+        counts = self.standin.call_counts()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["remaining"], 150)
+        self.assertEqual(data["debt_visits_count"], 1)
+        self.assertEqual(
+            [visit["visit_id"] for visit in data["visits"]],
+            ["visit-1"],
+        )
+        self.assertEqual(counts["select client_balance_register"], 1)
+        self.assertNotIn("rpc rpc:get_client_balance_summary", counts)
+        self.assertNotIn("select owners", counts)
+
+    def test_single_owner_without_visits_or_unknown(self):
+        data = self.get(
+            "/api/finance/client-balances/owner-9"
+        ).get_json()["data"]
+
+        self.assertEqual(data["owner_name"], "Нова")
+        self.assertEqual(data["remaining"], 0)
+        self.assertEqual(data["status"], "paid")
+        self.assertEqual(data["visits"], [])
+
+        for owner_id in ("owner-404", "owner-x"):
+            with self.subTest(owner_id=owner_id):
+                self.assertEqual(
+                    self.get(
+                        f"/api/finance/client-balances/{owner_id}"
+                    ).status_code,
+                    404,
+                )
+
+    def test_legacy_schema_pages_in_memory(self):
+        self.standin = SupabaseStandin(legacy_rows())
+
+        owners, pages = self.walk({"status": "all", "limit": 1})
+
+        self.assertEqual(owners, ["owner-1", "owner-2"])
+        self.assertEqual(pages[0]["summary"]["outstanding"], 200)
+
+        first = pages[0]["rows"][0]
+
+        self.assertNotIn("visits", first)
+        self.assertNotIn("id", first)
+        self.assertEqual(first["remaining"], 200)
+        self.assertEqual(first["open_visit"]["visit_id"], "visit-1")
+
+        open_visits = self.get(
+            "/api/finance/client-balances/owner-1/visits",
+            {"status": "open"},
+        ).get_json()["data"]
+
+        self.assertEqual(
+            [visit["visit_id"] for visit in open_visits],
+            ["visit-1"],
+        )
+
+    def test_legacy_single_owner_balance(self):
+        self.standin = SupabaseStandin(legacy_rows())
+
+        data = self.get(
+            "/api/finance/client-balances/owner-1"
+        ).get_json()["data"]
+
+        self.assertEqual(data["billed"], 400)
+        self.assertEqual(data["paid"], 200)
+        self.assertEqual(data["remaining"], 200)
+        self.assertEqual(data["visits_count"], 2)
+        self.assertEqual(data["last_visit_date"], "2026-10-01")
+        self.assertEqual(data["open_visit"]["visit_id"], "visit-1")
+        self.assertEqual(
+            [visit["visit_id"] for visit in data["visits"]],
+            ["visit-1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+import os
+import re
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+
+ORG_ID = "11111111-1111-4111-8111-111111111111"
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "supabase"
+    / "migrations"
+    / "20261017110000_client_search_trigram.sql"
+)
+
+# Локальный Postgres для проверки SQL, например
+# DOCPUG_TEST_DATABASE_URL=postgresql://postgres@localhost/docpug_test
+TEST_DATABASE_URL = os.environ.get("DOCPUG_TEST_DATABASE_URL")
+SEARCH_BUDGET_MS = float(
+    os.environ.get("CLIENT_SEARCH_BUDGET_MS", "50")
+)
+
+
+class ClientSearchApiTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin()
+        self.rpc_params = []
+
+        def search_clients(_client, params):
+            self.rpc_params.append(params)
+
+            return [{
+                "kind": "owner",
+                "id": "owner-1",
+                "owner_id": "owner-1",
+                "name": "Олена Коваль",
+                "phone": "+380 67 123 45 67",
+                "score": 0.95,
+            }]
+
+        self.standin.rpc_handlers["search_clients"] = search_clients
+
+    def get(self, query_string):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "admin",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(
+                "/api/search/clients",
+                query_string=query_string,
+            )
+
+    def test_search_calls_rpc_for_current_org(self):
+        response = self.get({"q": " 067 123 ", "limit": 500})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json()["data"][0]["id"],
+            "owner-1",
+        )
+        self.assertEqual(
+            self.rpc_params,
+            [{
+                "p_org_id": ORG_ID,
+                "p_query": "067 123",
+                "p_limit": server.CLIENT_SEARCH_MAX_LIMIT,
+            }],
+        )
+
+    def test_short_query_does_not_hit_database(self):
+        response = self.get({"q": "о"})
+
+        self.assertEqual(response.get_json()["data"], [])
+        self.assertEqual(self.rpc_params, [])
+
+    def test_invalid_limit_is_rejected(self):
+        self.assertEqual(
+            self.get({"q": "олена", "limit": "all"}).status_code,
+            400,
+        )
+
+
+@unittest.skipUnless(
+    TEST_DATABASE_URL and psycopg,
+    "DOCPUG_TEST_DATABASE_URL and psycopg are required",
+)
+class ClientSearchSqlTests(unittest.TestCase):
+    """
+    Миграция и search_clients на настоящем Postgres.
+    Всё выполняется в одной транзакции и откатывается.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.connection = psycopg.connect(TEST_DATABASE_URL)
+        cursor = cls.connection.cursor()
+
+        cursor.execute("""
+            create schema if not exists extensions;
+
+            do $roles$
+            declare
+              role_name text;
+            begin
+              foreach role_name in array array[
+                'anon', 'authenticated', 'service_role'
+              ] loop
+                if not exists (
+                  select 1 from pg_roles where rolname = role_name
+                ) then
+                  execute format('create role %I', role_name);
+                end if;
+              end loop;
+            end
+            $roles$;
+
+            create table if not exists public.owners (
+              id uuid primary key default gen_random_uuid(),
+              org_id uuid not null,
+              name text not null,
+              phone text
+            );
+
+            create table if not exists public.patients (
+              id uuid primary key default gen_random_uuid(),
+              org_id uuid not null,
+              owner_id uuid,
+              name text not null,
+              species text
+            );
+        """)
+
+        migration = re.sub(
+            r"^(begin|commit);$",
+            "",
+            MIGRATION_PATH.read_text(encoding="utf-8"),
+            flags=re.MULTILINE,
+        )
+        cursor.execute(migration)
+
+        cursor.execute(
+            """
+            insert into public.owners (org_id, name, phone)
+            select
+              %(org_id)s,
+              'Власник ' || n,
+              '+380 67 ' || lpad((n %% 1000)::text, 3, '0')
+                || ' ' || lpad((n / 1000)::text, 2, '0') || ' 00'
+            from generate_series(1, 50000) as n;
+
+            insert into public.owners (id, org_id, name, phone)
+            values
+              ('aaaaaaaa-0000-4000-8000-000000000001', %(org_id)s,
+               'Олена Коваль', '+380 50 765 43 21'),
+              ('aaaaaaaa-0000-4000-8000-000000000002', %(org_id)s,
+               'Коваленко Ігор', '+380 93 111 22 33'),
+              ('aaaaaaaa-0000-4000-8000-000000000003', gen_random_uuid(),
+               'Олена Коваль', '+380 50 765 43 21');
+
+            insert into public.patients (org_id, owner_id, name, species)
+            values
+              (%(org_id)s, 'aaaaaaaa-0000-4000-8000-000000000001',
+               'Ковбасик', 'dog');
+
+            analyze public.owners;
+            analyze public.patients;
+            """,
+            {"org_id": ORG_ID},
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.rollback()
+        cls.connection.close()
+
+    def search(self, text, limit=20):
+        cursor = self.connection.cursor()
+        started_at = time.perf_counter()
+
+        cursor.execute(
+            "select kind, name, phone, score "
+            "from public.search_clients(%s, %s, %s)",
+            (ORG_ID, text, limit),
+        )
+        rows = cursor.fetchall()
+
+        return rows, (time.perf_counter() - started_at) * 1000
+
+    def test_phone_digits_are_generated(self):
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "select phone_digits from public.owners "
+            "where name = 'Олена Коваль' limit 1"
+        )
+
+        self.assertEqual(cursor.fetchone()[0], "380507654321")
+
+    def test_local_phone_prefix_ranks_first(self):
+        rows, _elapsed = self.search("050 765")
+
+        self.assertEqual(rows[0][1], "Олена Коваль")
+        self.assertEqual(len(rows), 1)
+
+    def test_name_prefix_beats_fuzzy_and_includes_patients(self):
+        rows, _elapsed = self.search("ковал")
+        names = [row[1] for row in rows]
+
+        self.assertEqual(names[0], "Коваленко Ігор")
+        self.assertIn("Олена Коваль", names)
+        self.assertNotIn("Власник 1", names)
+
+        patient_rows, _elapsed = self.search("ковбас")
+
+        self.assertEqual(patient_rows[0][0], "patient")
+
+    def test_search_fits_reception_budget(self):
+        self.search("олена")
+
+        for text in ("олена", "067 123", "коваленко", "власник 4999"):
+            with self.subTest(text=text):
+                _rows, elapsed = self.search(text)
+                self.assertLess(elapsed, SEARCH_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import gzip
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def owner_rows(count):
+    return [
+        {
+            "id": f"owner-{index:04d}",
+            "org_id": ORG_ID,
+            "name": f"Власник {index}",
+            "phone": f"+38067{index:07d}",
+        }
+        for index in range(count)
+    ]
+
+
+class ConditionalJsonTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin({
+            "owners": owner_rows(60),
+        })
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path, headers=None):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(
+                path,
+                headers=headers or {},
+            )
+
+    def test_unchanged_register_returns_304(self):
+        first = self.get("/api/owners")
+        etag = first.headers["ETag"]
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(
+            first.headers["Cache-Control"],
+            "private, no-cache",
+        )
+
+        second = self.get(
+            "/api/owners",
+            {"If-None-Match": etag},
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.get_data(), b"")
+        self.assertEqual(second.headers["ETag"], etag)
+
+    def test_changed_register_gets_new_etag(self):
+        etag = self.get("/api/owners").headers["ETag"]
+
+        self.standin.rows["owners"][0]["name"] = "Нове ім'я"
+        self.standin.invalidate_indexes("owners")
+
+        response = self.get(
+            "/api/owners",
+            {"If-None-Match": etag},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_large_json_is_gzipped_when_accepted(self):
+        plain = self.get("/api/owners")
+        compressed = self.get(
+            "/api/owners",
+            {"Accept-Encoding": "gzip"},
+        )
+
+        self.assertEqual(
+            compressed.headers["Content-Encoding"],
+            "gzip",
+        )
+        self.assertIn(
+            "Accept-Encoding",
+            compressed.headers["Vary"],
+        )
+        self.assertEqual(
+            gzip.decompress(compressed.get_data()),
+            plain.get_data(),
+        )
+        self.assertEqual(
+            compressed.headers["ETag"].strip('"'),
+            plain.headers["ETag"].strip('"') + "-gzip",
+        )
+
+    def test_compressed_etag_revalidates(self):
+        etag = self.get(
+            "/api/owners",
+            {"Accept-Encoding": "gzip"},
+        ).headers["ETag"]
+
+        response = self.get(
+            "/api/owners",
+            {"If-None-Match": etag},
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_small_json_is_not_compressed(self):
+        self.standin.rows["owners"] = owner_rows(1)
+
+        response = self.get(
+            "/api/owners",
+            {"Accept-Encoding": "gzip"},
+        )
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("ETag", response.headers)
+
+    @unittest.skipIf(server.brotli is None, "Brotli not installed")
+    def test_brotli_is_preferred_when_available(self):
+        response = self.get(
+            "/api/owners",
+            {"Accept-Encoding": "gzip, br"},
+        )
+
+        self.assertEqual(
+            response.headers["Content-Encoding"],
+            "br",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+
+class ClinicUserQuery:
+    def __init__(self, client):
+        self.client = client
+
+    def select(self, columns="*", **_kwargs):
+        self.client.selected = columns
+        return self
+
+    def eq(self, *_args, **_kwargs):
+        return self
+
+    def limit(self, *_args, **_kwargs):
+        return self
+
+    def execute(self):
+        self.client.reads += 1
+        self.data = [dict(self.client.row)]
+        return self
+
+
+class ClinicUserSupabase:
+    def __init__(self, row):
+        self.row = row
+        self.reads = 0
+        self.selected = None
+
+    def table(self, table_name):
+        assert table_name == "clinic_users"
+        return ClinicUserQuery(self)
+
+
+def user_row(**overrides):
+    row = {
+        "id": "user-1",
+        "org_id": "org-1",
+        "staff_id": "staff-1",
+        "username": "doctor",
+        "display_name": "Doctor",
+        "role": "vet",
+        "is_active": True,
+        "must_change_password": False,
+        "session_version": 1,
+    }
+    row.update(overrides)
+    return row
+
+
+class CurrentUserCacheTests(unittest.TestCase):
+    def setUp(self):
+        server.invalidate_current_user_cache()
+        self.addCleanup(
+            server.invalidate_current_user_cache
+        )
+
+    def load_user(self, fake, session_version=1):
+        with (
+            patch.object(server, "supabase", fake),
+            server.app.test_request_context(
+                "/api/patients"
+            ),
+        ):
+            server.session["user_id"] = "user-1"
+            server.session["org_id"] = "org-1"
+            server.session["session_version"] = (
+                session_version
+            )
+
+            user = server.get_current_user()
+
+            return user, dict(server.session)
+
+    def test_second_request_is_served_from_worker_cache(self):
+        fake = ClinicUserSupabase(user_row())
+
+        first, _session = self.load_user(fake)
+        second, _session = self.load_user(fake)
+
+        self.assertEqual(first["id"], "user-1")
+        self.assertEqual(second["role"], "vet")
+        self.assertEqual(fake.reads, 1)
+
+    def test_invalidation_forces_fresh_read(self):
+        fake = ClinicUserSupabase(user_row())
+
+        self.load_user(fake)
+
+        fake.row = user_row(role="admin")
+        server.invalidate_current_user_cache(
+            org_id="org-1",
+            staff_id="staff-1",
+        )
+
+        user, _session = self.load_user(fake)
+
+        self.assertEqual(user["role"], "admin")
+        self.assertEqual(fake.reads, 2)
+
+    def test_inactive_user_is_not_cached(self):
+        fake = ClinicUserSupabase(
+            user_row(is_active=False)
+        )
+
+        user, session_data = self.load_user(fake)
+        self.assertIsNone(user)
+        self.assertNotIn("user_id", session_data)
+
+        self.load_user(fake)
+        self.assertEqual(fake.reads, 2)
+
+    def test_bumped_session_version_revokes_session(self):
+        fake = ClinicUserSupabase(
+            user_row(session_version=2)
+        )
+
+        user, session_data = self.load_user(
+            fake,
+            session_version=1,
+        )
+
+        self.assertIsNone(user)
+        self.assertNotIn("user_id", session_data)
+
+    def test_schema_without_session_version_keeps_sessions(self):
+        row = user_row()
+        row.pop("session_version")
+        fake = ClinicUserSupabase(row)
+
+        with patch.object(
+            server.schema_capabilities,
+            "columns",
+            return_value=set(row),
+        ):
+            user, stored_session = self.load_user(
+                fake,
+                session_version=3,
+            )
+
+        # Колонку до миграции не запрашиваем, сессия остаётся.
+        self.assertNotIn("session_version", fake.selected)
+        self.assertEqual(user["id"], "user-1")
+        self.assertEqual(stored_session["user_id"], "user-1")
+
+    def test_stale_session_is_rejected_from_cache(self):
+        fake = ClinicUserSupabase(
+            user_row(session_version=2)
+        )
+
+        self.load_user(fake, session_version=2)
+
+        user, _session = self.load_user(
+            fake,
+            session_version=1,
+        )
+
+        self.assertIsNone(user)
+        self.assertEqual(fake.reads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
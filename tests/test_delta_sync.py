@@ -0,0 +1,227 @@
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+NOW = datetime.now(timezone.utc)
+
+
+def stamp(minutes_ago):
+    return (NOW - timedelta(minutes=minutes_ago)).isoformat()
+
+
+def clinic_rows():
+    return {
+        "owners": [
+            {
+                "id": "owner-old",
+                "org_id": ORG_ID,
+                "name": "Старий",
+                "updated_at": stamp(120),
+            },
+            {
+                "id": "owner-new",
+                "org_id": ORG_ID,
+                "name": "Новий",
+                "updated_at": stamp(1),
+            },
+            {
+                "id": "owner-other-org",
+                "org_id": "org-2",
+                "name": "Чужий",
+                "updated_at": stamp(1),
+            },
+        ],
+        "visits": [
+            {
+                "id": "visit-old-000",
+                "org_id": ORG_ID,
+                "pet_id": "pet-1",
+                "updated_at": stamp(120),
+            },
+            {
+                "id": "visit-new-000",
+                "org_id": ORG_ID,
+                "pet_id": "pet-1",
+                "updated_at": stamp(1),
+            },
+        ],
+        "visit_services": [
+            {
+                "id": "line-1",
+                "visit_id": "visit-new-000",
+                "qty": 1,
+            },
+        ],
+        "visit_stock": [],
+        "sync_tombstones": [
+            {
+                "id": 1,
+                "org_id": ORG_ID,
+                "table_name": "owners",
+                "row_id": "owner-deleted",
+                "deleted_at": stamp(2),
+            },
+            {
+                "id": 2,
+                "org_id": ORG_ID,
+                "table_name": "owners",
+                "row_id": "owner-deleted-long-ago",
+                "deleted_at": stamp(300),
+            },
+            {
+                "id": 3,
+                "org_id": ORG_ID,
+                "table_name": "visits",
+                "row_id": "visit-deleted",
+                "deleted_at": stamp(2),
+            },
+        ],
+    }
+
+
+class DeltaSyncTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(clinic_rows())
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path, query_string=None):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(
+                path,
+                query_string=query_string,
+            )
+
+    def test_without_since_response_is_unchanged(self):
+        response = self.get("/api/owners")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(row["id"] for row in response.get_json()["data"]),
+            ["owner-new", "owner-old"],
+        )
+
+    def test_since_returns_changed_rows_and_tombstones(self):
+        response = self.get(
+            "/api/owners",
+            {"since": stamp(60)},
+        )
+        data = response.get_json()["data"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(data["full"])
+        self.assertEqual(
+            [row["id"] for row in data["rows"]],
+            ["owner-new"],
+        )
+        self.assertEqual(data["deleted"], ["owner-deleted"])
+        self.assertGreater(
+            datetime.fromisoformat(data["cursor"]),
+            NOW - timedelta(minutes=1),
+        )
+
+    def test_since_zero_is_full_snapshot_with_cursor(self):
+        data = self.get(
+            "/api/owners",
+            {"since": "0"},
+        ).get_json()["data"]
+
+        self.assertTrue(data["full"])
+        self.assertEqual(data["deleted"], [])
+        self.assertEqual(len(data["rows"]), 2)
+        self.assertTrue(data["cursor"])
+
+    def test_cursor_older_than_tombstone_retention_is_full(self):
+        data = self.get(
+            "/api/owners",
+            {
+                "since": (
+                    NOW - timedelta(
+                        days=server.DELTA_SYNC_TOMBSTONE_RETENTION_DAYS + 1
+                    )
+                ).isoformat(),
+            },
+        ).get_json()["data"]
+
+        self.assertTrue(data["full"])
+        self.assertEqual(len(data["rows"]), 2)
+
+    def test_schema_without_tombstones_falls_back_to_full(self):
+        del self.standin.rows["sync_tombstones"]
+
+        data = self.get(
+            "/api/owners",
+            {"since": stamp(60)},
+        ).get_json()["data"]
+
+        self.assertTrue(data["full"])
+        self.assertEqual(len(data["rows"]), 2)
+
+    def test_visit_delta_keeps_lines(self):
+        data = self.get(
+            "/api/visits",
+            {"since": stamp(60)},
+        ).get_json()["data"]
+
+        self.assertEqual(
+            [row["id"] for row in data["rows"]],
+            ["visit-new-000"],
+        )
+        self.assertEqual(
+            data["rows"][0]["services"][0]["id"],
+            "line-1",
+        )
+        self.assertEqual(data["deleted"], ["visit-deleted"])
+
+    def test_invalid_since_is_rejected(self):
+        response = self.get(
+            "/api/patients",
+            {"since": "yesterday"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.bench_endpoints import (
+    BENCHMARK_ENDPOINTS,
+    ORG_ID,
+    create_standin,
+    percentile,
+    run_benchmarks,
+    seed_clinic,
+)
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+class SupabaseStandinTests(unittest.TestCase):
+    def setUp(self):
+        self.standin = SupabaseStandin({
+            "visits": [
+                {"id": "v1", "org_id": "o1", "date": "2026-01-02", "total": 10},
+                {"id": "v2", "org_id": "o1", "date": "2026-01-01", "total": 20},
+                {"id": "v3", "org_id": "o1", "date": None, "total": 30},
+                {"id": "v4", "org_id": "o2", "date": "2026-01-03", "total": 40},
+                {"id": "v5", "org_id": "o1", "date": "2026-01-02", "total": 50},
+            ],
+        })
+
+    def test_filters_projection_order_and_count(self):
+        result = (
+            self.standin.table("visits")
+            .select("id, total", count="exact")
+            .eq("org_id", "o1")
+            .gte("total", 20)
+            .order("total", desc=True)
+            .limit(2)
+            .execute()
+        )
+
+        self.assertEqual(
+            result.data,
+            [{"id": "v5", "total": 50}, {"id": "v3", "total": 30}],
+        )
+        self.assertEqual(result.count, 3)
+
+    def test_in_and_or_filters(self):
+        result = (
+            self.standin.table("visits")
+            .select("id")
+            .in_("id", ["v1", "v4", "missing"])
+            .or_('date.gt."2026-01-02",total.lt.15')
+            .execute()
+        )
+
+        self.assertEqual(
+            sorted(row["id"] for row in result.data),
+            ["v1", "v4"],
+        )
+
+    def test_keyset_pages_cover_every_row_once(self):
+        with patch.object(server, "supabase", self.standin):
+            pages = list(
+                server.iter_org_rows_pages(
+                    "visits",
+                    org_id="o1",
+                    columns="id,date",
+                    order_by="date",
+                    desc=True,
+                    page_size=2,
+                )
+            )
+
+        self.assertEqual(
+            [row["id"] for page in pages for row in page],
+            ["v1", "v5", "v2", "v3"],
+        )
+
+    def test_latency_is_injected_per_call(self):
+        self.standin.latency_ms = 20
+
+        started_at = time.perf_counter()
+        self.standin.table("visits").select("id").execute()
+        self.standin.table("visits").select("id").execute()
+
+        self.assertGreaterEqual(
+            time.perf_counter() - started_at,
+            0.04,
+        )
+        self.assertEqual(
+            self.standin.call_counts()["select visits"],
+            2,
+        )
+
+
+class EndpointBenchmarkTests(unittest.TestCase):
+    def test_seed_scales_to_requested_volume(self):
+        rows = seed_clinic(owners=20, visits=100, lines=400)
+
+        self.assertEqual(len(rows["owners"]), 20)
+        self.assertEqual(len(rows["visits"]), 100)
+        self.assertEqual(
+            len(rows["visit_services"]) + len(rows["visit_stock"]),
+            400,
+        )
+        self.assertTrue(
+            all(row["org_id"] == ORG_ID for row in rows["visits"])
+        )
+
+    def test_every_heavy_endpoint_is_measured(self):
+        standin = create_standin(
+            seed_clinic(owners=30, visits=200, lines=800),
+        )
+
+        results = run_benchmarks(standin, repeat=2)
+
+        self.assertEqual(
+            [row["endpoint"] for row in results],
+            [endpoint[0] for endpoint in BENCHMARK_ENDPOINTS],
+        )
+
+        for row in results:
+            self.assertEqual(row["status"], [200], row)
+            self.assertGreater(row["queries"], 0, row)
+            self.assertGreaterEqual(row["p95_ms"], row["p50_ms"])
+
+    def test_percentile_uses_nearest_rank(self):
+        samples = [10, 20, 30, 40, 100]
+
+        self.assertEqual(percentile(samples, 0.5), 30)
+        self.assertEqual(percentile(samples, 0.95), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,478 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+class LocalEventBusTests(unittest.TestCase):
+    def test_publish_reaches_only_same_org(self):
+        bus = server.LocalEventBus()
+        first = bus.subscribe(ORG_ID)
+        second = bus.subscribe(ORG_ID)
+        other = bus.subscribe("org-2")
+
+        bus.publish(ORG_ID, "tasks", {"path": "/api/tasks"})
+
+        self.assertEqual(first.get_nowait()["type"], "tasks")
+        self.assertEqual(second.get_nowait()["data"]["path"], "/api/tasks")
+        self.assertTrue(other.empty())
+
+        bus.unsubscribe(ORG_ID, first)
+        bus.unsubscribe(ORG_ID, second)
+
+        self.assertEqual(bus.subscriber_count(ORG_ID), 0)
+        self.assertEqual(bus.subscriber_count(), 1)
+
+    def test_task_events_reach_only_their_staff(self):
+        bus = server.LocalEventBus()
+        assignee = bus.subscribe(ORG_ID, "staff-1")
+        colleague = bus.subscribe(ORG_ID, "staff-2")
+
+        bus.publish(ORG_ID, "tasks", staff_ids=["staff-1"])
+        bus.publish(ORG_ID, "calendar")
+
+        self.assertEqual(assignee.get_nowait()["type"], "tasks")
+        self.assertEqual(assignee.get_nowait()["type"], "calendar")
+        self.assertEqual(colleague.get_nowait()["type"], "calendar")
+        self.assertTrue(colleague.empty())
+
+    def test_event_with_same_id_is_delivered_once(self):
+        bus = server.LocalEventBus()
+        subscriber = bus.subscribe(ORG_ID)
+
+        bus.publish(ORG_ID, "tasks", event_id=7)
+        bus.publish(ORG_ID, "tasks", event_id=7)
+
+        self.assertEqual(subscriber.get_nowait()["id"], 7)
+        self.assertTrue(subscriber.empty())
+
+    def test_overflowing_subscriber_gets_single_resync(self):
+        bus = server.LocalEventBus(queue_size=2)
+        subscriber = bus.subscribe(ORG_ID)
+
+        for _ in range(3):
+            bus.publish(ORG_ID, "calendar")
+
+        event = subscriber.get_nowait()
+
+        self.assertEqual(event["type"], "resync")
+        self.assertTrue(subscriber.empty())
+
+
+class MutationEventTests(unittest.TestCase):
+    def setUp(self):
+        self.bus = server.LocalEventBus()
+        self.subscriber = self.bus.subscribe(ORG_ID)
+
+        patches = (
+            patch.object(server, "event_bus", self.bus),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(
+                server,
+                "app_events_available",
+                return_value=False,
+            ),
+        )
+
+        for item in patches:
+            item.start()
+            self.addCleanup(item.stop)
+
+    def finish(self, path, method="POST", status=200, response=None):
+        response = response or server.Response(status=status)
+
+        with server.app.test_request_context(path, method=method):
+            server.publish_mutation_events(response)
+
+            # Событие уходит после отправки ответа.
+            self.assertTrue(self.subscriber.empty())
+
+        response.close()
+
+        events = []
+
+        while not self.subscriber.empty():
+            events.append(self.subscriber.get_nowait())
+
+        return [event["type"] for event in events]
+
+    def test_mutations_publish_their_topics(self):
+        self.assertEqual(
+            self.finish("/api/visit-tasks/task-1/complete"),
+            ["tasks"],
+        )
+        self.assertEqual(
+            self.finish("/api/hospital-tasks/task-1", "DELETE"),
+            ["tasks"],
+        )
+        self.assertEqual(
+            self.finish("/api/visits", "PUT"),
+            ["visits", "calendar"],
+        )
+        self.assertEqual(
+            self.finish("/api/calendar/event-1", "PUT"),
+            ["calendar"],
+        )
+
+    def test_task_event_is_addressed_to_assignee(self):
+        assignee = self.bus.subscribe(ORG_ID, "staff-1")
+        colleague = self.bus.subscribe(ORG_ID, "staff-2")
+
+        with server.app.app_context():
+            response = server.ok({"id": "task-1", "staff_id": "staff-1"})
+
+        # Вкладка без staff_id (self.subscriber) тоже не получает.
+        self.assertEqual(
+            self.finish("/api/tasks", response=response),
+            [],
+        )
+        self.assertEqual(assignee.get_nowait()["staff_ids"], ["staff-1"])
+        self.assertTrue(colleague.empty())
+
+    def test_events_are_written_to_shared_log(self):
+        standin = SupabaseStandin({"app_events": []})
+
+        with (
+            patch.object(server, "supabase", standin),
+            patch.object(
+                server,
+                "app_events_available",
+                return_value=True,
+            ),
+        ):
+            self.finish("/api/visits", "PUT")
+
+        self.assertEqual(
+            [
+                row["event_type"]
+                for row in standin.rows["app_events"]
+            ],
+            ["visits", "calendar"],
+        )
+        self.assertEqual(
+            standin.call_counts()["insert app_events"],
+            1,
+        )
+
+    def test_reads_failures_and_other_paths_are_silent(self):
+        self.assertEqual(self.finish("/api/calendar", "GET"), [])
+        self.assertEqual(self.finish("/api/calendar", status=400), [])
+        self.assertEqual(self.finish("/api/stock"), [])
+        self.assertEqual(self.finish("/api/calendarx"), [])
+
+
+class EventRelayTests(unittest.TestCase):
+    def test_relay_delivers_rows_from_other_workers(self):
+        standin = SupabaseStandin({
+            "app_events": [
+                {
+                    "id": 5,
+                    "org_id": ORG_ID,
+                    "event_type": "calendar",
+                    "staff_ids": [],
+                    "data": {},
+                },
+            ],
+        })
+        bus = server.LocalEventBus()
+        relay = server.EventRelay(bus)
+
+        with patch.object(server, "supabase", standin):
+            # Без подписчиков таблица не читается.
+            self.assertEqual(relay.poll_once(), 0)
+            self.assertEqual(standin.call_counts(), {})
+
+            subscriber = bus.subscribe(ORG_ID)
+            relay.poll_once()
+
+            standin.rows["app_events"].extend([
+                {
+                    "id": 6,
+                    "org_id": ORG_ID,
+                    "event_type": "tasks",
+                    "staff_ids": [],
+                    "data": {"path": "/api/tasks"},
+                },
+                {
+                    "id": 7,
+                    "org_id": "org-2",
+                    "event_type": "tasks",
+                    "staff_ids": [],
+                    "data": {},
+                },
+            ])
+
+            relay.poll_once()
+            # Перекрытие по id не даёт повторов.
+            relay.poll_once()
+
+        event = subscriber.get_nowait()
+
+        self.assertEqual((event["id"], event["type"]), (6, "tasks"))
+        self.assertTrue(subscriber.empty())
+
+
+class EventStreamTests(unittest.TestCase):
+    def test_stream_delivers_published_events(self):
+        bus = server.LocalEventBus()
+        client = server.app.test_client()
+
+        with (
+            patch.object(server, "event_bus", bus),
+            patch.object(
+                server,
+                "app_events_available",
+                return_value=False,
+            ),
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "vet",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+        ):
+            response = client.get(
+                "/api/events/stream",
+                buffered=False,
+            )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "text/event-stream")
+            self.assertEqual(bus.subscriber_count(ORG_ID), 1)
+
+            chunks = iter(response.response)
+
+            self.assertIn(b"retry:", next(chunks))
+            self.assertIn(b"event: ready", next(chunks))
+
+            bus.publish(ORG_ID, "tasks", {"path": "/api/tasks"})
+
+            chunk = next(chunks)
+
+            self.assertIn(b"event: tasks", chunk)
+            self.assertIn(b'"/api/tasks"', chunk)
+
+            response.close()
+
+        self.assertEqual(bus.subscriber_count(ORG_ID), 0)
+
+    def test_reconnect_resumes_from_last_event_id(self):
+        bus = server.LocalEventBus()
+        standin = SupabaseStandin({
+            "app_events": [
+                {
+                    "id": event_id,
+                    "org_id": ORG_ID,
+                    "event_type": "tasks",
+                    "staff_ids": staff_ids,
+                    "data": {},
+                }
+                for event_id, staff_ids in (
+                    (3, []),
+                    (4, ["staff-1"]),
+                    (5, ["staff-2"]),
+                )
+            ],
+        })
+
+        with (
+            patch.object(server, "event_bus", bus),
+            patch.object(server, "supabase", standin),
+            patch.object(
+                server,
+                "app_events_available",
+                return_value=True,
+            ),
+            patch.object(server.event_relay, "ensure_started"),
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "vet",
+                    "staff_id": "staff-1",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+        ):
+            response = server.app.test_client().get(
+                "/api/events/stream",
+                headers={"Last-Event-ID": "3"},
+                buffered=False,
+            )
+
+            chunks = iter(response.response)
+            next(chunks)
+            ready = next(chunks)
+
+            self.assertIn(b"id: 3\n", ready)
+            self.assertIn(b'"resumed": true', ready)
+
+            # Событие для staff-2 этой вкладке не отдаётся.
+            self.assertIn(b"id: 3:4\n", next(chunks))
+
+            bus.publish(ORG_ID, "tasks", event_id=5)
+            bus.publish(ORG_ID, "calendar", event_id=7)
+
+            self.assertIn(b"id: 3:4,5,7\nevent: calendar", next(chunks))
+
+            # Строка 6 закоммичена после 7 — всё равно доходит.
+            bus.publish(ORG_ID, "visits", event_id=6)
+
+            self.assertIn(b"id: 3:4,5,6,7\nevent: visits", next(chunks))
+
+            response.close()
+
+    def test_reconnect_catches_up_rows_committed_out_of_order(self):
+        bus = server.LocalEventBus()
+        standin = SupabaseStandin({
+            "app_events": [
+                {
+                    "id": event_id,
+                    "org_id": ORG_ID,
+                    "event_type": "calendar",
+                    "staff_ids": [],
+                    "data": {},
+                }
+                for event_id in (4, 5)
+            ],
+        })
+
+        with (
+            patch.object(server, "event_bus", bus),
+            patch.object(server, "supabase", standin),
+            patch.object(
+                server,
+                "app_events_available",
+                return_value=True,
+            ),
+            patch.object(server.event_relay, "ensure_started"),
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "vet",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+        ):
+            # Вкладка видела 5, а 4 тогда ещё не была закоммичена.
+            response = server.app.test_client().get(
+                "/api/events/stream",
+                headers={"Last-Event-ID": "3:5"},
+                buffered=False,
+            )
+
+            chunks = iter(response.response)
+            next(chunks)
+            next(chunks)
+
+            self.assertIn(b"id: 3:4,5\nevent: calendar", next(chunks))
+
+            response.close()
+
+    def test_stream_over_worker_limit_gets_no_content(self):
+        bus = server.LocalEventBus()
+
+        with (
+            patch.object(server, "event_bus", bus),
+            patch.object(
+                server,
+                "event_stream_slots",
+                server.threading.BoundedSemaphore(1),
+            ),
+            patch.object(
+                server,
+                "app_events_available",
+                return_value=False,
+            ),
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "vet",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+        ):
+            client = server.app.test_client()
+            first = client.get("/api/events/stream", buffered=False)
+            second = client.get("/api/events/stream", buffered=False)
+
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(second.status_code, 204)
+            self.assertEqual(bus.subscriber_count(ORG_ID), 1)
+
+            first.close()
+
+            # Слот освобождается вместе с потоком.
+            third = client.get("/api/events/stream", buffered=False)
+
+            self.assertEqual(third.status_code, 200)
+
+            third.close()
+
+    def test_stream_requires_session(self):
+        with patch.object(server, "get_current_user", return_value=None):
+            response = server.app.test_client().get(
+                "/api/events/stream",
+            )
+
+        self.assertEqual(response.status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
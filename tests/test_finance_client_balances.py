@@ -35,8 +35,9 @@ class FinanceBalanceQuery:
         self.filters = []
         self.in_filters = []
         self.range_bounds = None
-        self.order_field = None
-        self.order_desc = False
+        self.limit_value = None
+        self.after_id = None
+        self.orders = []
 
     def select(self, *_args, **_kwargs):
         return self
@@ -51,15 +52,23 @@ class FinanceBalanceQuery:
         )
         return self
 
+    def gt(self, field, value):
+        assert field == "id"
+        self.after_id = str(value)
+        return self
+
     def order(self, field, desc=False, **_kwargs):
-        self.order_field = field
-        self.order_desc = bool(desc)
+        self.orders.append((field, bool(desc)))
         return self
 
     def range(self, start, end):
         self.range_bounds = (start, end)
         return self
 
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
     def execute(self):
         rows = [
             dict(row)
@@ -83,19 +92,29 @@ class FinanceBalanceQuery:
                 if str(row.get(field)) in values
             ]
 
-        if self.order_field:
+        for field, desc in reversed(self.orders):
             rows.sort(
-                key=lambda row: str(
-                    row.get(self.order_field)
+                key=lambda row, field=field: str(
+                    row.get(field)
                     or ""
                 ),
-                reverse=self.order_desc,
+                reverse=desc,
             )
 
+        if self.after_id is not None:
+            rows = [
+                row
+                for row in rows
+                if str(row.get("id")) > self.after_id
+            ]
+
         if self.range_bounds:
             start, end = self.range_bounds
             rows = rows[start:end + 1]
 
+        if self.limit_value is not None:
+            rows = rows[:self.limit_value]
+
         return FakeResult(rows)
 
 
@@ -254,5 +273,71 @@ class FinanceClientBalanceTests(unittest.TestCase):
         )
 
 
+class KeysetPaginationTests(unittest.TestCase):
+    def test_pages_follow_id_cursor_without_offsets(self):
+        fake = FinanceBalanceSupabase({
+            "owners": [
+                {
+                    "id": f"owner-{index}",
+                    "org_id": ORG_ID,
+                }
+                for index in range(5)
+            ],
+        })
+
+        with patch.object(server, "supabase", fake):
+            pages = list(
+                server.iter_org_rows_pages(
+                    "owners",
+                    org_id=ORG_ID,
+                    page_size=2,
+                )
+            )
+
+        self.assertEqual(
+            [
+                [row["id"] for row in page]
+                for page in pages
+            ],
+            [
+                ["owner-0", "owner-1"],
+                ["owner-2", "owner-3"],
+                ["owner-4"],
+            ],
+        )
+
+    def test_ordered_cursor_continues_after_value_and_id(self):
+        query = server.apply_keyset_cursor(
+            server.supabase.table("visits").select("*"),
+            "date",
+            True,
+            ("2026-07-28", "visit-9"),
+        )
+
+        self.assertEqual(
+            query.request.params["or"],
+            '(date.lt."2026-07-28",'
+            'and(date.eq."2026-07-28",id.gt."visit-9"),'
+            "date.is.null)",
+        )
+
+    def test_null_tail_cursor_only_walks_ids(self):
+        query = server.apply_keyset_cursor(
+            server.supabase.table("owners").select("*"),
+            "name",
+            False,
+            (None, "owner-3"),
+        )
+
+        self.assertEqual(
+            query.request.params["name"],
+            "is.null",
+        )
+        self.assertEqual(
+            query.request.params["id"],
+            "gt.owner-3",
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,235 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def clinic_rows():
+    owners = [
+        {
+            "id": f"owner-{index:03d}",
+            "org_id": ORG_ID,
+            "name": f"Owner {index % 7:02d}",
+            "phone": f"+380 67 {index:03d} 00 00",
+            "created_at": f"2026-01-{index % 28 + 1:02d}",
+        }
+        for index in range(25)
+    ]
+    owners.append({
+        "id": "owner-foreign",
+        "org_id": "org-2",
+        "name": "Owner 00",
+    })
+
+    patients = [
+        {
+            "id": f"pet-{index:03d}",
+            "org_id": ORG_ID,
+            "owner_id": f"owner-{index % 5:03d}",
+            "name": f"Pet {index:02d}",
+            "species": "cat" if index % 2 else "dog",
+            "breed": "Sphynx" if index == 7 else None,
+            "patient_status": (
+                "deceased" if index % 10 == 3
+                else None if index % 3 == 0
+                else "active"
+            ),
+        }
+        for index in range(30)
+    ]
+
+    return {
+        "owners": owners,
+        "patients": patients,
+    }
+
+
+class RegisterPaginationTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(clinic_rows())
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path, query_string=None):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            response = self.client.get(
+                path,
+                query_string=query_string,
+            )
+
+        return response
+
+    def collect(self, path, query_string):
+        rows = []
+        pages = 0
+        cursor = None
+
+        while True:
+            params = dict(query_string)
+
+            if cursor:
+                params["cursor"] = cursor
+
+            data = self.get(path, params).get_json()["data"]
+            rows.extend(data["rows"])
+            pages += 1
+            cursor = data["next_cursor"]
+
+            if not cursor:
+                return rows, pages
+
+    def test_without_page_params_full_list_is_returned(self):
+        data = self.get("/api/owners").get_json()["data"]
+
+        self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 25)
+
+    def test_owner_pages_follow_sort_and_cover_every_row_once(self):
+        first = self.get(
+            "/api/owners",
+            {"limit": 10},
+        ).get_json()["data"]
+
+        self.assertEqual(len(first["rows"]), 10)
+        self.assertEqual(first["total"], 25)
+        self.assertTrue(first["total_estimated"])
+
+        rows, pages = self.collect(
+            "/api/owners",
+            {"limit": 10, "sort": "-name"},
+        )
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len({row["id"] for row in rows}), 25)
+        # name desc, затем id asc.
+        expected = sorted(rows, key=lambda row: row["id"])
+        expected.sort(key=lambda row: row["name"], reverse=True)
+
+        self.assertEqual(rows, expected)
+
+    def test_later_pages_skip_the_count(self):
+        first = self.get(
+            "/api/owners",
+            {"limit": 10},
+        ).get_json()["data"]
+
+        self.standin.reset_calls()
+
+        second = self.get(
+            "/api/owners",
+            {"limit": 10, "cursor": first["next_cursor"]},
+        ).get_json()["data"]
+
+        self.assertIsNone(second["total"])
+        self.assertEqual(
+            self.standin.call_counts()["select owners"],
+            1,
+        )
+
+    def test_search_matches_name_and_phone(self):
+        by_name = self.get(
+            "/api/owners",
+            {"q": "owner 03"},
+        ).get_json()["data"]
+        by_phone = self.get(
+            "/api/owners",
+            {"q": "67 012"},
+        ).get_json()["data"]
+
+        self.assertEqual(
+            sorted(row["id"] for row in by_name["rows"]),
+            ["owner-003", "owner-010", "owner-017", "owner-024"],
+        )
+        self.assertEqual(by_name["total"], 4)
+        self.assertFalse(by_name["total_estimated"])
+        self.assertEqual(
+            [row["id"] for row in by_phone["rows"]],
+            ["owner-012"],
+        )
+
+    def test_patient_filters_combine_with_owner_and_search(self):
+        rows, _pages = self.collect(
+            "/api/patients",
+            {
+                "species": "cat",
+                "status": "active",
+                "owner_id": "owner-001",
+                "limit": 2,
+            },
+        )
+
+        self.assertEqual(
+            [row["id"] for row in rows],
+            ["pet-001", "pet-011", "pet-021"],
+        )
+
+        sphynx = self.get(
+            "/api/patients",
+            {"q": "sphynx"},
+        ).get_json()["data"]
+
+        self.assertEqual(
+            [row["id"] for row in sphynx["rows"]],
+            ["pet-007"],
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        first = self.get(
+            "/api/owners",
+            {"limit": 5},
+        ).get_json()["data"]
+
+        for params in (
+            {"sort": "password_hash"},
+            {"limit": "many"},
+            {"cursor": "not-a-cursor"},
+            {"cursor": first["next_cursor"], "sort": "-name"},
+            {"limit": 5, "since": "0"},
+        ):
+            with self.subTest(params=params):
+                response = self.get("/api/owners", params)
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,284 @@
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+
+SCHEMA = {
+    "patients": ["id", "org_id", "owner_id", "name", "species"],
+    "visits": [
+        "id", "org_id", "pet_id", "date", "dx",
+        "services_json", "stock_json",
+    ],
+    "visit_services": ["id", "visit_id", "service_id", "qty"],
+    "visit_stock": ["id", "visit_id", "stock_id", "qty"],
+}
+
+
+class ProjectionQuery:
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+
+    def select(self, columns, **_kwargs):
+        self.client.selects.append(
+            (self.table_name, columns)
+        )
+        return self
+
+    def eq(self, *_args, **_kwargs):
+        return self
+
+    def in_(self, *_args, **_kwargs):
+        return self
+
+    def or_(self, *_args, **_kwargs):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(
+            data=self.client.rows.get(self.table_name, [])
+        )
+
+
+class ProjectionSupabase:
+    def __init__(self, rows=None):
+        self.rows = rows or {}
+        self.selects = []
+        self.postgrest = SimpleNamespace(
+            base_url="https://example.supabase.co/rest/v1",
+            headers={},
+            session=SimpleNamespace(
+                get=lambda *_args, **_kwargs: SimpleNamespace(
+                    raise_for_status=lambda: None,
+                    json=lambda: {
+                        "definitions": {
+                            table: {
+                                "properties": {
+                                    column: {}
+                                    for column in columns
+                                },
+                            }
+                            for table, columns in SCHEMA.items()
+                        },
+                    },
+                ),
+            ),
+        )
+
+    def table(self, table_name):
+        return ProjectionQuery(self, table_name)
+
+
+class ResponseProjectionTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path, fake):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": "org-1",
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value="org-1",
+            ),
+            patch.object(server, "supabase", fake),
+        ):
+            return self.client.get(path)
+
+    def test_default_projection_only_selects_existing_columns(self):
+        fake = ProjectionSupabase()
+
+        response = self.get("/api/patients", fake)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            fake.selects,
+            [(
+                "patients",
+                "id,org_id,owner_id,name,species",
+            )],
+        )
+
+    def test_fields_parameter_narrows_projection(self):
+        fake = ProjectionSupabase()
+
+        response = self.get(
+            "/api/patients?fields=name,species",
+            fake,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            fake.selects,
+            [("patients", "id,name,species")],
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.get(
+            "/api/patients?fields=password_hash",
+            ProjectionSupabase(),
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_visit_list_without_line_fields_skips_line_queries(self):
+        fake = ProjectionSupabase({
+            "visits": [{"id": "visit-1", "date": "2026-08-01"}],
+        })
+
+        response = self.get(
+            "/api/visits?fields=date",
+            fake,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            fake.selects,
+            [("visits", "id,date")],
+        )
+        self.assertNotIn(
+            "services",
+            response.get_json()["data"][0],
+        )
+
+    def test_legacy_json_lines_are_loaded_only_for_empty_visits(self):
+        fake = ProjectionSupabase({
+            "visits": [{
+                "id": "visit-1",
+                "services_json": [{"serviceId": "s-1", "qty": 1}],
+                "stock_json": None,
+            }],
+        })
+
+        response = self.get("/api/visits", fake)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            fake.selects[0],
+            ("visits", "id,org_id,pet_id,date,dx"),
+        )
+        self.assertEqual(
+            fake.selects[-1],
+            ("visits", "id,services_json,stock_json"),
+        )
+        self.assertEqual(
+            response.get_json()["data"][0]["services"],
+            [{"serviceId": "s-1", "qty": 1}],
+        )
+
+
+class ScriptedSchema(server.SchemaCapabilities):
+    def __init__(self, *results):
+        super().__init__()
+        self.results = list(results)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        result = self.results.pop(0)
+
+        if isinstance(result, Exception):
+            raise result
+
+        if callable(result):
+            return result()
+
+        return result
+
+
+class SchemaCapabilitiesRefreshTests(unittest.TestCase):
+    def test_failed_refresh_keeps_last_known_schema(self):
+        schema = ScriptedSchema(
+            {"visits": frozenset({"id", "date"})},
+            RuntimeError("openapi timeout"),
+        )
+
+        self.assertEqual(
+            schema.columns("visits"),
+            frozenset({"id", "date"}),
+        )
+
+        schema.invalidate()
+
+        self.assertEqual(
+            schema.columns("visits"),
+            frozenset({"id", "date"}),
+        )
+        self.assertEqual(schema.loads, 2)
+
+        # До следующей попытки OpenAPI не перечитывается.
+        schema.columns("visits")
+        self.assertEqual(schema.loads, 2)
+
+    def test_refresh_does_not_block_other_readers(self):
+        loading = threading.Event()
+        release = threading.Event()
+
+        def slow_load():
+            loading.set()
+            release.wait(5)
+            return {"visits": frozenset({"id", "status"})}
+
+        schema = ScriptedSchema(
+            {"visits": frozenset({"id"})},
+            slow_load,
+        )
+        schema.columns("visits")
+        schema.invalidate()
+
+        refresher = threading.Thread(
+            target=schema.columns,
+            args=("visits",),
+        )
+        refresher.start()
+        loading.wait(5)
+
+        # Пока один поток грузит схему, другие читают старую.
+        self.assertEqual(
+            schema.columns("visits"),
+            frozenset({"id"}),
+        )
+
+        release.set()
+        refresher.join()
+
+        self.assertEqual(
+            schema.columns("visits"),
+            frozenset({"id", "status"}),
+        )
+        self.assertEqual(schema.loads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+
+class OpenApiSession:
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.requests = 0
+
+    def get(self, url, headers=None):
+        self.requests += 1
+        return SimpleNamespace(
+            raise_for_status=lambda: None,
+            json=lambda: {"definitions": self.definitions},
+        )
+
+
+class SchemaQuery:
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.operation = None
+        self.payload = None
+        self.filters = []
+
+    def insert(self, payload):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def eq(self, field, value):
+        self.filters.append((field, value))
+        return self
+
+    def execute(self):
+        self.client.operations.append({
+            "table": self.table_name,
+            "operation": self.operation,
+            "payload": self.payload,
+            "filters": list(self.filters),
+        })
+
+        if (
+            self.client.reject_field
+            and (
+                self.client.reject_field
+                in (self.payload or {})
+                or any(
+                    field == self.client.reject_field
+                    for field, _value in self.filters
+                )
+            )
+        ):
+            raise RuntimeError(
+                "PGRST204 Could not find the column"
+            )
+
+        return SimpleNamespace(data=[self.payload or {}])
+
+
+class SchemaSupabase:
+    def __init__(self, definitions=None, reject_field=None):
+        self.operations = []
+        self.reject_field = reject_field
+
+        if definitions is not None:
+            self.postgrest = SimpleNamespace(
+                base_url="https://example.supabase.co/rest/v1",
+                headers={},
+                session=OpenApiSession(definitions),
+            )
+
+    def table(self, table_name):
+        return SchemaQuery(self, table_name)
+
+
+def columns(*names):
+    return {
+        "properties": {
+            name: {}
+            for name in names
+        },
+    }
+
+
+class SchemaCapabilitiesTests(unittest.TestCase):
+    def setUp(self):
+        server.schema_capabilities.reset()
+        self.addCleanup(
+            server.schema_capabilities.reset
+        )
+
+    def test_missing_optional_columns_are_dropped_before_insert(self):
+        fake = SchemaSupabase(
+            definitions={
+                "patients": columns("id", "org_id", "name"),
+            },
+            reject_field="sex",
+        )
+
+        with patch.object(server, "supabase", fake):
+            server.insert_with_optional_fallback(
+                "patients",
+                {
+                    "org_id": "org-1",
+                    "name": "Жужа",
+                    "sex": "female",
+                },
+                optional_fields=["sex"],
+            )
+
+        self.assertEqual(len(fake.operations), 1)
+        self.assertEqual(
+            fake.operations[0]["payload"],
+            {"org_id": "org-1", "name": "Жужа"},
+        )
+
+    def test_schema_is_loaded_once_per_ttl(self):
+        fake = SchemaSupabase(
+            definitions={
+                "patients": columns("id", "name"),
+            },
+        )
+
+        with patch.object(server, "supabase", fake):
+            for _attempt in range(3):
+                server.table_has_column("patients", "name")
+
+        self.assertEqual(
+            fake.postgrest.session.requests,
+            1,
+        )
+
+    def test_unknown_schema_keeps_error_driven_fallback(self):
+        fake = SchemaSupabase(reject_field="sex")
+
+        with patch.object(server, "supabase", fake):
+            server.insert_with_optional_fallback(
+                "patients",
+                {"name": "Жужа", "sex": "female"},
+                optional_fields=["sex"],
+            )
+
+        self.assertEqual(len(fake.operations), 2)
+        self.assertEqual(
+            fake.operations[-1]["payload"],
+            {"name": "Жужа"},
+        )
+
+    def test_visit_lines_delete_skips_missing_org_filter(self):
+        fake = SchemaSupabase(
+            definitions={
+                "visit_services": columns("id", "visit_id"),
+            },
+            reject_field="org_id",
+        )
+
+        with patch.object(server, "supabase", fake):
+            server.delete_lines_by_visit(
+                "visit_services",
+                "visit-1",
+                "org-1",
+            )
+
+        self.assertEqual(
+            [item["filters"] for item in fake.operations],
+            [[("visit_id", "visit-1")]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
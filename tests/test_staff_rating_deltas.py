@@ -0,0 +1,360 @@
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def snapshot(staff_id, score, visits_count, revenue, rank=0):
+    return {
+        "id": f"snap-{staff_id}",
+        "org_id": ORG_ID,
+        "season_key": "2026-Q4",
+        "staff_id": staff_id,
+        "staff_name": staff_id,
+        "avatar": "",
+        "score": score,
+        "visits_count": visits_count,
+        "revenue": revenue,
+        "avg_check": 0,
+        "xp": 0,
+        "rank": rank,
+        "updated_at": None,
+    }
+
+
+def rating_rows():
+    return {
+        "staff": [
+            {"id": "staff-1", "org_id": ORG_ID, "name": "Олена", "avatar": ""},
+            {"id": "staff-2", "org_id": ORG_ID, "name": "Ігор", "avatar": ""},
+        ],
+        "visits": [
+            {
+                "id": "visit-1",
+                "org_id": ORG_ID,
+                "pet_id": "pet-1",
+                "staff_id": "staff-1",
+                "date": "2026-10-02",
+                "note": "",
+                "dx": "",
+                "rx": "",
+                "weight_kg": None,
+            },
+            {
+                "id": "visit-2",
+                "org_id": ORG_ID,
+                "pet_id": "pet-1",
+                "staff_id": None,
+                "date": None,
+                "note": "",
+                "dx": "",
+                "rx": "",
+                "weight_kg": None,
+            },
+        ],
+        "visit_services": [
+            {
+                "id": "vs-1",
+                "visit_id": "visit-1",
+                "service_id": "service-1",
+                "qty": 2,
+                "price_snap": 300,
+            },
+            {
+                "id": "vs-2",
+                "visit_id": "visit-1",
+                "service_id": "service-2",
+                "qty": 1,
+                "price_snap": None,
+            },
+        ],
+        "visit_stock": [
+            {
+                "id": "vst-1",
+                "visit_id": "visit-1",
+                "stock_id": "stock-1",
+                "qty": 1,
+                "price_snap": 45,
+            },
+        ],
+        "services": [
+            {"id": "service-1", "org_id": ORG_ID, "price": 999},
+            {"id": "service-2", "org_id": ORG_ID, "price": 150},
+        ],
+        "stock": [
+            {"id": "stock-1", "org_id": ORG_ID, "price": 60},
+        ],
+        "staff_rating_snapshots": [
+            snapshot("staff-2", 80, 2, 900, rank=1),
+            snapshot("staff-1", 140, 3, 1200, rank=2),
+        ],
+        "staff_rating_contributions": [
+            {
+                "visit_id": "visit-old",
+                "org_id": ORG_ID,
+                "season_key": "2026-Q3",
+                "staff_id": "staff-2",
+                "revenue": 100,
+                "updated_at": None,
+            },
+        ],
+    }
+
+
+class StaffRatingDeltaTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(rating_rows())
+        self.contributions = []
+        self.replaced = []
+        self.standin.rpc_handlers["apply_staff_rating_contribution"] = (
+            lambda _client, params: self.contributions.append(params)
+        )
+        self.standin.rpc_handlers["replace_staff_rating_season"] = (
+            lambda _client, params: self.replaced.append(params)
+        )
+        self.standin.rpc_handlers["delete_visit_with_stock_restore"] = (
+            lambda _client, params: {"deleted": True}
+        )
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+        patches = (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(
+                server,
+                "get_current_season_key",
+                return_value="2026-Q4",
+            ),
+            patch.object(server, "supabase", self.standin),
+            patch.object(server.time, "sleep"),
+        )
+
+        for item in patches:
+            item.start()
+            self.addCleanup(item.stop)
+
+    def test_visit_contribution_is_priced_from_its_lines(self):
+        server.sync_staff_rating_for_visit(ORG_ID, "visit-1")
+
+        # 2 x 300 + 150 по справочнику (нет price_snap) + 45.
+        self.assertEqual(
+            self.contributions,
+            [{
+                "p_org_id": ORG_ID,
+                "p_visit_id": "visit-1",
+                "p_season_key": "2026-Q4",
+                "p_staff_id": "staff-1",
+                "p_revenue": 795,
+            }],
+        )
+
+        # Справочник склада не нужен: у строки есть price_snap.
+        self.assertNotIn(
+            "select stock",
+            self.standin.call_counts(),
+        )
+
+    def test_visit_without_doctor_or_date_withdraws_contribution(self):
+        server.sync_staff_rating_for_visit(ORG_ID, "visit-2")
+
+        self.assertIsNone(self.contributions[0]["p_staff_id"])
+        self.assertIsNone(self.contributions[0]["p_season_key"])
+        self.assertEqual(self.contributions[0]["p_revenue"], 0)
+
+    def test_visit_edit_and_delete_apply_deltas(self):
+        response = self.client.put(
+            "/api/visits",
+            json={"id": "visit-1", "staff_id": "staff-2"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        # Дельта считается уже после отправки ответа.
+        self.assertEqual(self.contributions, [])
+
+        response.close()
+
+        self.assertEqual(self.contributions[-1]["p_staff_id"], "staff-2")
+
+        response = self.client.delete("/api/visits/visit-1")
+        response.close()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.contributions[-1],
+            {
+                "p_org_id": ORG_ID,
+                "p_visit_id": "visit-1",
+                "p_season_key": None,
+                "p_staff_id": None,
+                "p_revenue": 0,
+            },
+        )
+
+    def test_failed_delta_does_not_fail_the_visit_edit(self):
+        def broken(_client, _params):
+            raise RuntimeError("function does not exist")
+
+        self.standin.rpc_handlers["apply_staff_rating_contribution"] = broken
+
+        response = self.client.put(
+            "/api/visits",
+            json={"id": "visit-1", "note": "Повторний огляд"},
+        )
+        response.close()
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_schema_without_contributions_skips_deltas(self):
+        self.standin.rows.pop("staff_rating_contributions")
+        server.schema_capabilities.invalidate()
+
+        server.sync_staff_rating_for_visit(ORG_ID, "visit-1")
+
+        self.assertEqual(self.contributions, [])
+
+    def test_leaderboard_is_ranked_by_live_score(self):
+        rows = self.client.get(
+            "/api/staff/rating"
+        ).get_json()["data"]["rows"]
+
+        self.assertEqual(
+            [(row["staff_id"], row["rank"]) for row in rows],
+            [("staff-1", 1), ("staff-2", 2)],
+        )
+
+    def test_reconcile_rebuilds_season_and_reports_drift(self):
+        self.assertEqual(
+            self.client.post(
+                "/api/internal/staff-rating/reconcile"
+            ).status_code,
+            401,
+        )
+
+        with patch.object(
+            server,
+            "report_dispatch_authorized",
+            return_value=True,
+        ):
+            response = self.client.post(
+                "/api/internal/staff-rating/reconcile"
+            )
+
+        data = response.get_json()["data"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["organizations"], 1)
+        self.assertEqual(data["drifted"], 1)
+        self.assertEqual(len(self.replaced), 1)
+        self.assertEqual(
+            self.replaced[0]["p_contributions"],
+            [{
+                "visit_id": "visit-1",
+                "staff_id": "staff-1",
+                "revenue": 795,
+            }],
+        )
+        self.assertEqual(
+            [row["staff_id"] for row in self.replaced[0]["p_staff"]],
+            ["staff-1", "staff-2"],
+        )
+        self.assertLess(
+            self.replaced[0]["p_started_at"],
+            datetime.now(timezone.utc).isoformat(),
+        )
+        self.assertNotIn(
+            "upsert staff_rating_snapshots",
+            self.standin.call_counts(),
+        )
+        self.assertEqual(
+            [
+                row["org_id"]
+                for row in self.standin.rows[
+                    "staff_rating_reconciliations"
+                ]
+            ],
+            [ORG_ID],
+        )
+
+    def test_reconcile_processes_a_bounded_batch_of_due_clinics(self):
+        self.standin.rows["staff_rating_snapshots"] += [
+            dict(snapshot("staff-9", 0, 0, 0), org_id=f"org-{i}")
+            for i in range(2, 5)
+        ]
+        self.standin.rows["staff_rating_reconciliations"] = [
+            {
+                "org_id": "org-2",
+                "season_key": "2026-Q4",
+                "reconciled_at": datetime.now(timezone.utc).isoformat(),
+            },
+            {
+                "org_id": "org-3",
+                "season_key": "2026-Q3",
+                "reconciled_at": datetime.now(timezone.utc).isoformat(),
+            },
+        ]
+
+        with patch.object(
+            server,
+            "report_dispatch_authorized",
+            return_value=True,
+        ), patch.object(
+            server,
+            "STAFF_RATING_RECONCILE_BATCH",
+            2,
+        ):
+            data = self.client.post(
+                "/api/internal/staff-rating/reconcile"
+            ).get_json()["data"]
+
+        # org-2 уже сверена этой ночью; из org-1, org-3, org-4
+        # за вызов берутся две, последняя остаётся следующему.
+        self.assertEqual(data["organizations"], 4)
+        self.assertEqual(data["reconciled"], 2)
+        self.assertEqual(data["remaining"], 1)
+        self.assertEqual(
+            [params["p_org_id"] for params in self.replaced],
+            [ORG_ID, "org-3"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
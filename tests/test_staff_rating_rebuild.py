@@ -0,0 +1,198 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def visit(visit_id, date, staff_id=None, **extra):
+    return {
+        "id": visit_id,
+        "org_id": ORG_ID,
+        "date": date,
+        "staff_id": staff_id,
+        "doctor_id": None,
+        "vet_id": None,
+        **extra,
+    }
+
+
+def rating_rows():
+    return {
+        "staff": [
+            {"id": "staff-1", "org_id": ORG_ID, "name": "Олена", "avatar": ""},
+            {"id": "staff-2", "org_id": ORG_ID, "name": "Ігор", "avatar": ""},
+            {"id": "staff-3", "org_id": ORG_ID, "name": "Марта", "avatar": ""},
+        ],
+        "visits": [
+            visit("v1", "2026-10-02", "staff-1"),
+            visit("v2", "2026-12-31T18:00:00", "staff-1"),
+            visit("v3", "2026-11-05", None, doctor_id="staff-2"),
+            # Прошлый и следующий сезоны не входят в снапшот.
+            visit("v-old", "2026-09-30", "staff-2"),
+            visit("v-next", "2027-01-01", "staff-1"),
+            {**visit("v-foreign", "2026-10-05", "staff-1"), "org_id": "org-2"},
+        ],
+        "visit_services": [
+            {
+                "id": "vs1",
+                "visit_id": "v1",
+                "service_id": "service-1",
+                "qty": 2,
+                "price_snap": 300,
+            },
+            {
+                "id": "vs2",
+                "visit_id": "v2",
+                "service_id": "service-1",
+                "qty": 1,
+                "price_snap": None,
+            },
+            {
+                "id": "vs-old",
+                "visit_id": "v-old",
+                "service_id": "service-1",
+                "qty": 1,
+                "price_snap": 9000,
+            },
+        ],
+        "visit_stock": [
+            {
+                "id": "vst1",
+                "visit_id": "v3",
+                "stock_id": "stock-1",
+                "qty": 3,
+                "price_snap": None,
+            },
+        ],
+        "services": [
+            {"id": "service-1", "org_id": ORG_ID, "price": 450},
+        ],
+        "stock": [
+            {"id": "stock-1", "org_id": ORG_ID, "price": 40},
+        ],
+        "staff_rating_snapshots": [
+            {
+                "id": "snap-1",
+                "org_id": ORG_ID,
+                "season_key": "2026-Q4",
+                "staff_id": "staff-1",
+                "staff_name": "Олена",
+                "avatar": "",
+                "score": 0,
+                "visits_count": 0,
+                "revenue": 0,
+                "avg_check": 0,
+                "xp": 0,
+                "rank": 0,
+                "updated_at": None,
+            },
+        ],
+    }
+
+
+class StaffRatingRebuildTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(rating_rows())
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def rebuild(self):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(
+                server,
+                "get_current_season_key",
+                return_value="2026-Q4",
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.post("/api/staff/rating/rebuild")
+
+    def test_season_bounds(self):
+        self.assertEqual(
+            server.season_date_bounds("2026-Q4"),
+            ("2026-10-01", "2027-01-01"),
+        )
+        self.assertEqual(
+            server.season_date_bounds("2027-Q2"),
+            ("2027-04-01", "2027-07-01"),
+        )
+
+        with self.assertRaises(ValueError):
+            server.season_date_bounds("2026-Q5")
+
+    def test_rebuild_counts_only_current_season(self):
+        response = self.rebuild()
+        data = response.get_json()["data"]
+        rows = {row["staff_id"]: row for row in data["rows"]}
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["season_key"], "2026-Q4")
+
+        # v1: 2 x 300 по снимку; v2: цена из справочника услуг.
+        self.assertEqual(rows["staff-1"]["visits_count"], 2)
+        self.assertEqual(rows["staff-1"]["revenue"], 1050)
+        self.assertEqual(rows["staff-1"]["avg_check"], 525)
+        self.assertEqual(rows["staff-1"]["rank"], 1)
+
+        # doctor_id как запасной ключ врача, склад по справочнику.
+        self.assertEqual(rows["staff-2"]["visits_count"], 1)
+        self.assertEqual(rows["staff-2"]["revenue"], 120)
+
+        self.assertEqual(rows["staff-3"]["visits_count"], 0)
+        self.assertEqual(rows["staff-3"]["score"], 0)
+        self.assertEqual(rows["staff-3"]["rank"], 3)
+
+    def test_snapshots_are_written_in_one_upsert(self):
+        self.rebuild()
+
+        counts = self.standin.call_counts()
+        snapshots = {
+            row["staff_id"]: row
+            for row in self.standin.rows["staff_rating_snapshots"]
+        }
+
+        self.assertEqual(counts["upsert staff_rating_snapshots"], 1)
+        self.assertEqual(len(snapshots), 3)
+        self.assertEqual(snapshots["staff-1"]["revenue"], 1050)
+
+
+if __name__ == "__main__":
+    unittest.main()
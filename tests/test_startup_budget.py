@@ -0,0 +1,121 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+
+ROOT_DIR = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+# Холодный import server + create_app() на воркере.
+# Бюджет можно поднять для медленного CI через env.
+IMPORT_BUDGET_MS = float(
+    os.getenv("STARTUP_IMPORT_BUDGET_MS")
+    or 1500
+)
+
+APP_FACTORY_BUDGET_MS = float(
+    os.getenv("STARTUP_APP_FACTORY_BUDGET_MS")
+    or 250
+)
+
+STARTUP_PROBE = """
+import json
+import sys
+import time
+
+started_at = time.perf_counter()
+import server
+imported_at = time.perf_counter()
+server.create_app()
+created_at = time.perf_counter()
+
+sys.stderr.write(json.dumps({
+    "import_ms": (imported_at - started_at) * 1000,
+    "create_app_ms": (created_at - imported_at) * 1000,
+    "supabase_loaded": "supabase" in sys.modules,
+    "postgrest_loaded": "postgrest" in sys.modules,
+    "blueprints": sorted(server.app.blueprints),
+}))
+"""
+
+
+def run_startup_probe():
+    env = dict(os.environ)
+    env.update({
+        "SUPABASE_URL": "https://example.supabase.co",
+        "SUPABASE_SERVICE_KEY": "test-service-key",
+        "SESSION_SECRET_KEY": "test-session-secret",
+    })
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    # Первый прогон прогревает .pyc, чтобы мерить
+    # старт воркера, а не компиляцию 25k строк.
+    for _attempt in range(2):
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            cwd=ROOT_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+    if completed.returncode != 0:
+        raise AssertionError(completed.stderr)
+
+    return (
+        completed.stdout,
+        json.loads(
+            completed.stderr.strip().splitlines()[-1]
+        ),
+    )
+
+
+class StartupBudgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stdout, cls.report = run_startup_probe()
+
+    def test_import_fits_budget(self):
+        self.assertLess(
+            self.report["import_ms"],
+            IMPORT_BUDGET_MS,
+            self.report,
+        )
+
+    def test_app_factory_fits_budget(self):
+        self.assertLess(
+            self.report["create_app_ms"],
+            APP_FACTORY_BUDGET_MS,
+            self.report,
+        )
+
+    def test_import_does_not_touch_supabase(self):
+        self.assertFalse(self.report["supabase_loaded"])
+        self.assertFalse(self.report["postgrest_loaded"])
+
+    def test_import_prints_no_banners(self):
+        self.assertEqual(self.stdout, "")
+
+    def test_all_domain_blueprints_are_registered(self):
+        self.assertEqual(
+            self.report["blueprints"],
+            [
+                "auth",
+                "calendar",
+                "core",
+                "finance",
+                "medical",
+                "platform",
+                "reports",
+                "staff",
+                "stock",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import gzip
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+  <link rel="stylesheet" href="style.css?v=manual-1">
+</head>
+<body>
+<script src="ach.js"></script>
+<script src="app.js?v=manual-2"></script>
+</body>
+</html>
+"""
+
+STYLE_CSS = """/* header */
+.card  a :hover {
+  content: "  keep  /* this */ ";
+  margin: 0   auto;
+}
+"""
+
+APP_JS = "const greeting = `  spaced  `;\nconsole.log(greeting);\n"
+
+
+class StaticAssetPipelineTests(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.base_dir = temp_dir.name
+
+        self.write("index.html", INDEX_HTML)
+        self.write("style.css", STYLE_CSS)
+        self.write("app.js", APP_JS)
+        self.write("ach.js", "")
+
+        patches = (
+            patch.object(server, "BASE_DIR", self.base_dir),
+            patch.object(
+                server,
+                "STATIC_BUILD_DIR",
+                os.path.join(self.base_dir, "static_build"),
+            ),
+            patch.object(server, "_static_assets", None),
+        )
+
+        for item in patches:
+            item.start()
+            self.addCleanup(item.stop)
+
+        self.client = server.app.test_client()
+
+    def write(self, name, content):
+        with open(
+            os.path.join(self.base_dir, name),
+            "w",
+            encoding="utf-8",
+        ) as handle:
+            handle.write(content)
+
+    def asset_url(self, html, stem, extension):
+        match = re.search(
+            rf'"(/assets/{stem}\.[0-9a-f]{{12}}\.{extension})"',
+            html,
+        )
+        self.assertIsNotNone(match, html)
+        return match.group(1)
+
+    def test_index_points_to_content_hashed_assets(self):
+        response = self.client.get("/")
+        html = response.get_data(as_text=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        self.assertNotIn("?v=", html)
+        self.asset_url(html, "app", "js")
+        self.asset_url(html, "style", "css")
+        self.assertIn('src="ach.js"', html)
+
+    def test_hashed_asset_is_immutable_and_precompressed(self):
+        html = self.client.get("/").get_data(as_text=True)
+        url = self.asset_url(html, "app", "js")
+
+        response = self.client.get(
+            url,
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["Cache-Control"],
+            server.STATIC_IMMUTABLE_CACHE,
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("javascript", response.headers["Content-Type"])
+        self.assertEqual(
+            gzip.decompress(response.get_data()).decode("utf-8"),
+            APP_JS,
+        )
+        response.close()
+
+        plain = self.client.get(url)
+
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(plain.get_data(as_text=True), APP_JS)
+        plain.close()
+
+    def test_css_is_minified_without_touching_strings(self):
+        html = self.client.get("/").get_data(as_text=True)
+        response = self.client.get(self.asset_url(html, "style", "css"))
+
+        self.assertEqual(
+            response.get_data(as_text=True),
+            '.card a :hover{content: "  keep  /* this */ ";'
+            "margin: 0 auto;}\n",
+        )
+        response.close()
+
+    def test_changed_source_gets_new_hash(self):
+        first = self.client.get("/").get_data(as_text=True)
+
+        self.write("app.js", APP_JS + "console.log(2);\n")
+        os.utime(
+            os.path.join(self.base_dir, "app.js"),
+            (1, 1),
+        )
+
+        second = self.client.get("/").get_data(as_text=True)
+
+        self.assertNotEqual(
+            self.asset_url(first, "app", "js"),
+            self.asset_url(second, "app", "js"),
+        )
+
+    def test_unknown_assets_and_project_files_are_not_served(self):
+        self.write("server.py", "SECRET = 1\n")
+
+        for path in (
+            "/assets/app.000000000000.js",
+            "/assets/../server.py",
+            "/server.py",
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 404)
+                response.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+
+class SlowQuery:
+    def __init__(self, value, delay=0.2, error=None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+
+    def execute(self):
+        time.sleep(self.delay)
+
+        if self.error:
+            raise self.error
+
+        return SimpleNamespace(data=self.value)
+
+
+class SupabaseGatherTests(unittest.TestCase):
+    def setUp(self):
+        server.reset_supabase_circuit_breakers()
+
+    def test_queries_run_concurrently(self):
+        started = time.monotonic()
+
+        results = server.gather_supabase_queries({
+            name: (lambda name=name: SlowQuery([name]))
+            for name in ("a", "b", "c", "d")
+        })
+
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(
+            {
+                name: result.data
+                for name, result in results.items()
+            },
+            {
+                "a": ["a"],
+                "b": ["b"],
+                "c": ["c"],
+                "d": ["d"],
+            },
+        )
+        self.assertLess(elapsed, 0.6)
+
+    def test_failure_is_isolated_per_query(self):
+        results = server.gather_supabase_queries(
+            {
+                "ok": lambda: SlowQuery([1], delay=0),
+                "broken": lambda: SlowQuery(
+                    None,
+                    delay=0,
+                    error=ValueError("bad filter"),
+                ),
+            },
+            return_exceptions=True,
+        )
+
+        self.assertEqual(results["ok"].data, [1])
+        self.assertIsInstance(results["broken"], ValueError)
+
+    def test_first_error_is_raised_after_all_queries(self):
+        finished = []
+
+        def slow_success():
+            finished.append("slow")
+            return SlowQuery([1], delay=0.1)
+
+        with self.assertRaises(ValueError):
+            server.gather_supabase_queries({
+                "broken": lambda: SlowQuery(
+                    None,
+                    delay=0,
+                    error=ValueError("bad filter"),
+                ),
+                "slow": slow_success,
+            })
+
+        self.assertEqual(finished, ["slow"])
+
+    def test_transient_errors_are_retried_per_query(self):
+        attempts = []
+        lock = threading.Lock()
+
+        def flaky():
+            with lock:
+                attempts.append(1)
+                first = len(attempts) == 1
+
+            return SlowQuery(
+                [2],
+                delay=0,
+                error=(
+                    OSError(11, "Resource temporarily unavailable")
+                    if first
+                    else None
+                ),
+            )
+
+        with patch.object(server.time, "sleep"):
+            results = server.gather_supabase_queries({
+                "flaky": flaky,
+                "stable": lambda: SlowQuery([3], delay=0),
+            })
+
+        self.assertEqual(results["flaky"].data, [2])
+        self.assertEqual(len(attempts), 2)
+
+    def test_tasks_see_request_session(self):
+        seen = {}
+
+        def read_session():
+            seen[threading.current_thread().name] = (
+                server.session.get("org_id")
+            )
+            return SlowQuery([], delay=0)
+
+        with server.app.test_request_context("/api/x"):
+            server.session["org_id"] = "org-7"
+
+            server.gather_supabase_queries({
+                "a": read_session,
+                "b": read_session,
+            })
+
+        self.assertEqual(
+            set(seen.values()),
+            {"org-7"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
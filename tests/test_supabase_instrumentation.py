@@ -0,0 +1,160 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+
+def postgrest_handler(request):
+    return server.httpx.Response(
+        200,
+        headers={"content-range": "0-2/*"},
+        json=[{"id": 1}, {"id": 2}, {"id": 3}],
+    )
+
+
+def instrumented_client():
+    return server.httpx.Client(
+        transport=server.SupabaseInstrumentedTransport(
+            server.httpx.MockTransport(
+                postgrest_handler
+            )
+        ),
+        base_url="https://example.supabase.co",
+    )
+
+
+class SupabaseInstrumentationTests(unittest.TestCase):
+    def test_calls_are_recorded_with_table_operation_and_rows(self):
+        client = instrumented_client()
+
+        with server.app.test_request_context("/api/visits"):
+            server.g.supabase_calls = []
+
+            client.get(
+                "/rest/v1/visits",
+                params={
+                    "select": "*",
+                    "org_id": "eq.org-1",
+                },
+            )
+            client.post(
+                "/rest/v1/rpc/get_finance_overview",
+                json={},
+            )
+
+            calls = list(server.g.supabase_calls)
+
+        self.assertEqual(
+            [
+                (call["table"], call["operation"], call["rows"])
+                for call in calls
+            ],
+            [
+                ("visits", "select", 3),
+                ("rpc:get_finance_overview", "rpc", 3),
+            ],
+        )
+        self.assertEqual(
+            calls[0]["shape"],
+            "org_id=eq&select=*",
+        )
+
+    def test_repeated_lookups_by_id_are_flagged_as_n_plus_one(self):
+        client = instrumented_client()
+
+        with server.app.test_request_context("/api/visits"):
+            server.g.supabase_calls = []
+
+            for index in range(6):
+                client.get(
+                    "/rest/v1/patients",
+                    params={
+                        "select": "id,name",
+                        "id": f"eq.pet-{index}",
+                    },
+                )
+
+            client.get(
+                "/rest/v1/owners",
+                params={"org_id": "eq.org-1"},
+            )
+
+            suspects = server.find_supabase_n_plus_one(
+                server.g.supabase_calls
+            )
+
+        self.assertEqual(len(suspects), 1)
+        self.assertEqual(suspects[0]["table"], "patients")
+        self.assertEqual(suspects[0]["count"], 6)
+
+    def test_anonymous_response_has_no_server_timing(self):
+        with patch.object(
+            server,
+            "get_current_user",
+            return_value=None,
+        ):
+            response = server.app.test_client().get(
+                "/api/patients"
+            )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("Server-Timing", response.headers)
+
+    def test_debug_flag_exposes_server_timing_header(self):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value=None,
+            ),
+            patch.object(server, "SERVER_TIMING_DEBUG", True),
+        ):
+            response = server.app.test_client().get(
+                "/api/patients"
+            )
+
+        self.assertIn(
+            'db;dur=0.0;desc="0 supabase calls"',
+            response.headers["Server-Timing"],
+        )
+        self.assertIn(
+            "app;dur=",
+            response.headers["Server-Timing"],
+        )
+
+    def test_server_timing_is_visible_to_owner_only(self):
+        with server.app.test_request_context("/api/visits"):
+            server.g.current_user = {"role": "owner"}
+            self.assertTrue(server.server_timing_visible())
+
+            server.g.current_user = {
+                "role": "doctor",
+                "username": "doctor",
+            }
+            self.assertFalse(server.server_timing_visible())
+
+    def test_calls_outside_request_are_ignored(self):
+        client = instrumented_client()
+
+        response = client.get("/rest/v1/visits")
+
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
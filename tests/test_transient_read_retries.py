@@ -1,4 +1,5 @@
 import os
+import threading
 import unittest
 from unittest.mock import patch
 
@@ -16,6 +17,8 @@ os.environ.setdefault(
     "test-session-secret",
 )
 
+from postgrest.exceptions import APIError
+
 import server
 
 
@@ -345,5 +348,169 @@ class TransientReadRetryTests(unittest.TestCase):
         )
 
 
+class FailingQuery:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        raise self.error
+
+
+class SupabaseTransportTests(unittest.TestCase):
+    def setUp(self):
+        server.reset_supabase_circuit_breakers()
+        self.addCleanup(
+            server.reset_supabase_circuit_breakers
+        )
+
+    def test_errors_are_classified_by_type(self):
+        self.assertTrue(
+            server.is_transient_supabase_error(
+                OSError(11, "Resource temporarily unavailable")
+            )
+        )
+        self.assertTrue(
+            server.is_transient_supabase_error(
+                server.httpx.ReadTimeout("read timed out")
+            )
+        )
+        self.assertTrue(
+            server.is_transient_supabase_error(
+                APIError({
+                    "message": "Could not connect",
+                    "code": "PGRST001",
+                })
+            )
+        )
+        self.assertFalse(
+            server.is_transient_supabase_error(
+                APIError({
+                    "message": (
+                        "canceling statement due to "
+                        "statement timeout"
+                    ),
+                    "code": "57014",
+                })
+            )
+        )
+        self.assertFalse(
+            server.is_transient_supabase_error(
+                ValueError("timeout must be positive")
+            )
+        )
+
+    def test_postgrest_error_response_is_not_retried(self):
+        query = FailingQuery(
+            APIError({
+                "message": "try again later",
+                "code": "23505",
+            })
+        )
+
+        with patch.object(
+            server.time,
+            "sleep",
+        ) as sleep_mock:
+            with self.assertRaises(APIError):
+                server.execute_with_retry(
+                    lambda: query,
+                    attempts=4,
+                )
+
+        self.assertEqual(query.calls, 1)
+        sleep_mock.assert_not_called()
+
+    def test_backoff_is_jittered_and_capped(self):
+        for attempt in range(8):
+            value = server.retry_backoff_seconds(
+                0.25,
+                attempt,
+            )
+            base = min(
+                server.RETRY_MAX_SLEEP_SECONDS,
+                0.25 * (2 ** attempt),
+            )
+            self.assertGreaterEqual(value, base / 2)
+            self.assertLessEqual(value, base)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        query = FailingQuery(
+            ConnectionResetError(
+                "connection reset by peer"
+            )
+        )
+        threshold = (
+            server.supabase_circuit_breaker
+            .failure_threshold
+        )
+
+        with patch.object(server.time, "sleep"):
+            for _attempt in range(threshold):
+                with self.assertRaises(
+                    ConnectionResetError
+                ):
+                    server.execute_with_retry(
+                        lambda: query,
+                        attempts=2,
+                    )
+
+            calls_before_open = query.calls
+
+            with self.assertRaises(
+                server.SupabaseUnavailableError
+            ):
+                server.execute_with_retry(
+                    lambda: query,
+                    attempts=2,
+                )
+
+        self.assertEqual(
+            calls_before_open,
+            threshold * 2,
+        )
+        self.assertEqual(
+            query.calls,
+            calls_before_open,
+        )
+
+    def test_half_open_lets_a_single_probe_through(self):
+        breaker = server.SupabaseCircuitBreaker(
+            failure_threshold=1,
+            cooldown_seconds=0,
+        )
+        key = ("org-1", "visits")
+
+        breaker.record_failure(key)
+
+        outcome = {}
+
+        def other_request():
+            try:
+                breaker.before_call(key)
+                outcome["other"] = "passed"
+            except server.SupabaseUnavailableError:
+                outcome["other"] = "rejected"
+
+        # Первый запрос после cooldown — проба, второй ждёт её итога.
+        breaker.before_call(key)
+        breaker.before_call(key)
+
+        thread = threading.Thread(target=other_request)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(outcome["other"], "rejected")
+
+        breaker.record_success(key)
+
+        thread = threading.Thread(target=other_request)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(outcome["other"], "passed")
+
+
 if __name__ == "__main__":
     unittest.main()
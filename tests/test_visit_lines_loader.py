@@ -0,0 +1,173 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+def visit_line_rows(visit_count, lines_per_visit=2):
+    services = []
+    stock = []
+
+    for index in range(visit_count):
+        visit_id = f"visit-{index:04d}"
+
+        for line in range(lines_per_visit):
+            services.append({
+                "id": f"vs-{index:04d}-{line}",
+                "visit_id": visit_id,
+                "service_id": f"service-{line}",
+                "qty": 1,
+                "price_snap": 100,
+                "name_snap": "Огляд",
+            })
+
+        stock.append({
+            "id": f"vst-{index:04d}",
+            "visit_id": visit_id,
+            "stock_id": "stock-1",
+            "qty": 2,
+            "price_snap": 35,
+            "name_snap": "Шприц",
+            "inventory_synced": True,
+        })
+
+    return {
+        "visit_services": services,
+        "visit_stock": stock,
+    }
+
+
+class VisitLinesLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.visit_ids = [
+            f"visit-{index:04d}"
+            for index in range(400)
+        ]
+        self.standin = SupabaseStandin(visit_line_rows(400))
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+        patches = (
+            patch.object(server, "supabase", self.standin),
+            patch.object(server.time, "sleep"),
+        )
+
+        for item in patches:
+            item.start()
+            self.addCleanup(item.stop)
+
+    def test_large_id_list_is_split_into_chunks(self):
+        services, stock = server.load_visit_lines(self.visit_ids)
+        counts = self.standin.call_counts()
+
+        self.assertEqual(counts["select visit_services"], 3)
+        self.assertEqual(counts["select visit_stock"], 3)
+        self.assertEqual(len(services), 400)
+        self.assertEqual(
+            sum(len(lines) for lines in services.values()),
+            800,
+        )
+        self.assertEqual(
+            stock["visit-0399"],
+            [{
+                "id": "vst-0399",
+                "stockId": "stock-1",
+                "qty": 2,
+                "priceSnap": 35,
+                "nameSnap": "Шприц",
+                "inventorySynced": True,
+                "inventory_synced": True,
+            }],
+        )
+
+    def test_chunk_is_paged_past_row_limit(self):
+        with patch.object(server, "VISIT_LINES_PAGE_SIZE", 100):
+            services, _stock = server.load_visit_lines(
+                self.visit_ids[:150]
+            )
+
+        # 300 строк услуг в одном чанке: 100 + 100 + 100 + пустая.
+        self.assertEqual(
+            self.standin.call_counts()["select visit_services"],
+            4,
+        )
+        self.assertEqual(
+            sum(len(lines) for lines in services.values()),
+            300,
+        )
+
+    def test_narrow_projection_skips_unrequested_columns(self):
+        services, _stock = server.load_visit_lines(
+            self.visit_ids[:2],
+            service_columns=server.FINANCE_VISIT_LINE_COLUMNS,
+        )
+
+        line = services["visit-0000"][0]
+
+        self.assertEqual(line["priceSnap"], 100)
+        self.assertIsNone(line["nameSnap"])
+        self.assertIsNone(line["serviceId"])
+
+    def test_failed_chunk_is_reported_with_partial_result(self):
+        load_chunk = server.load_visit_line_chunk
+
+        def flaky_chunk(table, columns, visit_ids):
+            if table == "visit_stock" and "visit-0200" in visit_ids:
+                raise RuntimeError("statement timeout")
+
+            return load_chunk(table, columns, visit_ids)
+
+        with patch.object(
+            server,
+            "load_visit_line_chunk",
+            side_effect=flaky_chunk,
+        ):
+            with self.assertRaises(server.VisitLinesLoadError) as raised:
+                server.load_visit_lines(self.visit_ids)
+
+        error = raised.exception
+
+        self.assertEqual(
+            error.failed_visit_ids,
+            self.visit_ids[150:300],
+        )
+        self.assertEqual(len(error.services_by_visit["visit-0200"]), 2)
+        self.assertEqual(len(error.stock_by_visit["visit-0399"]), 1)
+
+        with patch.object(
+            server,
+            "load_visit_line_chunk",
+            side_effect=flaky_chunk,
+        ):
+            rows = server.attach_visit_lines([
+                {"id": visit_id}
+                for visit_id in self.visit_ids
+            ])
+
+        self.assertNotIn("lines_incomplete", rows[0])
+        self.assertEqual(len(rows[0]["stock"]), 1)
+        self.assertTrue(rows[200]["lines_incomplete"])
+        self.assertEqual(rows[200]["stock"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def client_row(owner_id, name, billed, paid, **extra):
+    return {
+        "id": owner_id,
+        "org_id": ORG_ID,
+        "owner_id": owner_id,
+        "owner_name": name,
+        "phone": "+380 67 000 00 00",
+        "billed": billed,
+        "paid": paid,
+        "remaining": billed - paid,
+        "visits_count": 1,
+        "debt_visits_count": 1 if billed > paid else 0,
+        "patients_count": 1,
+        "last_visit_date": "2026-10-01",
+        "status": "debt" if billed > paid else "paid",
+        **extra,
+    }
+
+
+def visit_row(visit_id, owner_id, date, total, paid):
+    return {
+        "id": visit_id,
+        "org_id": ORG_ID,
+        "visit_id": visit_id,
+        "owner_id": owner_id,
+        "patient_id": f"pet-{owner_id}",
+        "patient_name": "Жужа",
+        "species": "dog",
+        "date": date,
+        "diagnosis": "Огляд",
+        "total": total,
+        "paid": paid,
+        "remaining": total - paid,
+        "financial_status": "partial" if paid else "unpaid",
+    }
+
+
+def settlement_rows():
+    clients = [
+        client_row("owner-1", "Валерій", 450, 300),
+        client_row("owner-2", "Олена", 200, 200),
+        client_row("owner-3", "Ігор", 900, 0),
+        {
+            **client_row("owner-x", "Чужий", 100, 0),
+            "org_id": "org-2",
+        },
+    ]
+    visits = [
+        visit_row("visit-1", "owner-1", "2026-09-01", 250, 100),
+        visit_row("visit-2", "owner-1", "2026-10-01", 200, 200),
+        visit_row("visit-3", "owner-3", "2026-08-01", 500, 0),
+        visit_row("visit-4", "owner-3", "2026-09-15", 400, 0),
+    ]
+
+    return {
+        "client_settlements": [
+            {"org_id": row["org_id"], "owner_id": row["owner_id"]}
+            for row in clients
+        ],
+        "client_balance_register": clients,
+        "visit_settlement_register": visits,
+    }
+
+
+class SettledClientBalancesTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(settlement_rows())
+        self.standin.rpc_handlers["get_client_balance_summary"] = (
+            lambda _client, params: {
+                "billed": 1550,
+                "paid": 500,
+                "outstanding": 1050,
+                "clients_count": 3,
+                "debt_clients_count": 2,
+                "debt_visits_count": 3,
+            }
+        )
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, path="/api/finance/client-balances"):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(path)
+
+    def test_register_reads_settlements_instead_of_history(self):
+        response = self.get()
+        data = response.get_json()["data"]
+        counts = self.standin.call_counts()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["summary"]["outstanding"], 1050)
+        self.assertEqual(data["summary"]["collection_rate"], 32.3)
+        self.assertEqual(
+            [client["owner_id"] for client in data["items"]],
+            ["owner-3", "owner-1", "owner-2"],
+        )
+
+        for table in (
+            "visits",
+            "visit_services",
+            "visit_stock",
+            "finance_transactions",
+        ):
+            self.assertNotIn(f"select {table}", counts)
+
+    def test_only_open_visits_are_nested(self):
+        items = {
+            client["owner_id"]: client
+            for client in self.get().get_json()["data"]["items"]
+        }
+
+        self.assertEqual(
+            [visit["visit_id"] for visit in items["owner-3"]["visits"]],
+            ["visit-4", "visit-3"],
+        )
+        self.assertEqual(
+            [visit["visit_id"] for visit in items["owner-1"]["visits"]],
+            ["visit-1"],
+        )
+        self.assertEqual(items["owner-1"]["visits"][0]["remaining"], 150)
+        self.assertEqual(items["owner-2"]["visits"], [])
+        self.assertEqual(items["owner-2"]["status"], "paid")
+
+    def test_schema_without_settlements_uses_legacy_path(self):
+        self.standin.rows.pop("client_settlements")
+
+        with patch.object(
+            server,
+            "load_legacy_client_balances",
+            return_value={"summary": {}, "items": []},
+        ) as legacy:
+            response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        legacy.assert_called_once_with(ORG_ID)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+import os
+import unittest
+from unittest.mock import patch
+
+
+os.environ.setdefault(
+    "SUPABASE_URL",
+    "https://example.supabase.co",
+)
+os.environ.setdefault(
+    "SUPABASE_SERVICE_KEY",
+    "test-service-key",
+)
+os.environ.setdefault(
+    "SESSION_SECRET_KEY",
+    "test-session-secret",
+)
+
+import server
+
+from benchmarks.supabase_standin import SupabaseStandin
+
+
+ORG_ID = "org-1"
+
+
+def clinic_rows():
+    visits = [
+        {
+            "id": f"visit-{index:03d}",
+            "org_id": ORG_ID,
+            "pet_id": f"pet-{index % 3}",
+            "staff_id": "staff-1" if index % 2 else "staff-2",
+            "date": f"2026-09-{index + 1:02d}",
+            "status": "completed" if index % 4 == 0 else "open",
+            "note": "Огляд",
+            "discount_amount": 50 if index == 9 else 0,
+        }
+        for index in range(20)
+    ]
+    visits.append({
+        "id": "visit-foreign",
+        "org_id": "org-2",
+        "date": "2026-09-10",
+    })
+
+    return {
+        "visits": visits,
+        "patients": [
+            {
+                "id": f"pet-{index}",
+                "org_id": ORG_ID,
+                "owner_id": f"owner-{index}",
+                "name": name,
+            }
+            for index, name in enumerate(("Жужа", "Мурка", "Бакс"))
+        ],
+        "owners": [
+            {
+                "id": f"owner-{index}",
+                "org_id": ORG_ID,
+                "name": name,
+                "phone": f"+380 67 00{index} 00 00",
+            }
+            for index, name in enumerate(("Олена", "Ігор", "Марта"))
+        ],
+        "visit_services": [
+            {
+                "id": f"vs-{index:03d}",
+                "visit_id": f"visit-{index:03d}",
+                "service_id": "service-1",
+                "qty": 2,
+                "price_snap": 150,
+                "name_snap": "Огляд",
+            }
+            for index in range(20)
+        ],
+        "visit_stock": [
+            {
+                "id": "vst-009",
+                "visit_id": "visit-009",
+                "stock_id": "stock-1",
+                "qty": 1,
+                "price_snap": 40,
+                "name_snap": "Шприц",
+            },
+        ],
+    }
+
+
+class VisitsRegisterTests(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        self.standin = SupabaseStandin(clinic_rows())
+        server.schema_capabilities.invalidate()
+        self.addCleanup(
+            server.schema_capabilities.invalidate
+        )
+
+    def get(self, query_string=None):
+        with (
+            patch.object(
+                server,
+                "get_current_user",
+                return_value={
+                    "id": "user-1",
+                    "org_id": ORG_ID,
+                    "role": "owner",
+                    "is_active": True,
+                },
+            ),
+            patch.object(
+                server,
+                "get_current_org_id",
+                return_value=ORG_ID,
+            ),
+            patch.object(server, "supabase", self.standin),
+        ):
+            return self.client.get(
+                "/api/visits",
+                query_string=query_string,
+            )
+
+    def test_without_page_params_full_list_is_returned(self):
+        data = self.get().get_json()["data"]
+
+        self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 20)
+        self.assertEqual(len(data[0]["services"]), 1)
+
+    def test_pages_walk_newest_first_within_date_range(self):
+        seen = []
+        cursor = None
+        pages = 0
+
+        while True:
+            params = {
+                "from": "2026-09-05",
+                "to": "2026-09-16",
+                "limit": 5,
+            }
+
+            if cursor:
+                params["cursor"] = cursor
+
+            data = self.get(params).get_json()["data"]
+            seen.extend(row["id"] for row in data["rows"])
+            pages += 1
+
+            if pages == 1:
+                self.assertEqual(data["total"], 12)
+
+            cursor = data["next_cursor"]
+
+            if not cursor:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            seen,
+            [f"visit-{index:03d}" for index in range(15, 3, -1)],
+        )
+
+    def test_staff_status_and_pet_filters_combine(self):
+        data = self.get({
+            "staff_id": "staff-2",
+            "status": "completed",
+            "pet_id": "pet-0",
+        }).get_json()["data"]
+
+        self.assertEqual(
+            [row["id"] for row in data["rows"]],
+            ["visit-012", "visit-000"],
+        )
+
+    def test_search_reaches_pet_owner_and_visit_text(self):
+        def search(text):
+            data = self.get({
+                "view": "summary",
+                "limit": 100,
+                "q": text,
+            }).get_json()["data"]
+
+            return {row["id"] for row in data["rows"]}
+
+        by_pet = search("мурк")
+        by_owner_phone = search("67 002")
+
+        self.assertEqual(len(by_pet), 7)
+        self.assertTrue(
+            all(
+                int(visit_id[-3:]) % 3 == 1
+                for visit_id in by_pet
+            )
+        )
+        self.assertEqual(len(by_owner_phone), 6)
+        self.assertEqual(len(search("огляд")), 20)
+        self.assertEqual(search("нема такого"), set())
+
+    def test_summary_returns_totals_without_line_arrays(self):
+        data = self.get({
+            "view": "summary",
+            "from": "2026-09-10",
+            "to": "2026-09-10",
+        }).get_json()["data"]
+
+        row = data["rows"][0]
+
+        self.assertNotIn("services", row)
+        self.assertNotIn("stock", row)
+        self.assertEqual(row["services_total"], 300)
+        self.assertEqual(row["stock_total"], 40)
+        self.assertEqual(row["lines_count"], 2)
+        self.assertEqual(row["total"], 290)
+
+        full_list = self.get({"view": "summary"}).get_json()["data"]
+
+        self.assertIsInstance(full_list, list)
+        self.assertTrue(
+            all("services" not in row for row in full_list)
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in (
+            {"view": "lines"},
+            {"from": "10.09.2026"},
+            {"from": "2026-09-10", "to": "2026-09-01"},
+            {"sort": "pet_id"},
+            {"limit": 5, "since": "0"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(
+                    self.get(params).status_code,
+                    400,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()